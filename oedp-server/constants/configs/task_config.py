@@ -28,6 +28,7 @@ DEFAULT_MAX_REPO_NUMBER = 50
 DEFAULT_MAX_USER_TASK_NUMBER = 50
 DEFAULT_MAX_TASK_NODE = 1000
 DEFAULT_THREAD_TIMEOUT = 30
+DEFAULT_MAX_ASYNC_TASK_NUMBER = 1000
 
 
 class TaskConfig:
@@ -36,6 +37,7 @@ class TaskConfig:
     MAX_USER_TASK_NUMBER = DEFAULT_MAX_USER_TASK_NUMBER
     MAX_TASK_NODE = DEFAULT_MAX_TASK_NODE
     THREAD_TIMEOUT = DEFAULT_THREAD_TIMEOUT
+    MAX_ASYNC_TASK_NUMBER = DEFAULT_MAX_ASYNC_TASK_NUMBER
 
 
 try:
@@ -53,8 +55,11 @@ else:
             'scheduler', 'max_repo_number', default=DEFAULT_MAX_REPO_NUMBER)
     except ValueError:
         pass
+    try:
         TaskConfig.MAX_USER_TASK_NUMBER = conf_handler.getint(
             'scheduler', 'max_user_task_number', default=DEFAULT_MAX_USER_TASK_NUMBER)
+    except ValueError:
+        pass
     try:
         TaskConfig.MAX_TASK_NODE = conf_handler.getint('scheduler', 'max_task_node', default=DEFAULT_MAX_TASK_NODE)
     except ValueError:
@@ -63,3 +68,8 @@ else:
         TaskConfig.THREAD_TIMEOUT = conf_handler.getint('scheduler', 'thread_timeout', default=DEFAULT_THREAD_TIMEOUT)
     except ValueError:
         pass
+    try:
+        TaskConfig.MAX_ASYNC_TASK_NUMBER = conf_handler.getint(
+            'scheduler', 'max_async_task_number', default=DEFAULT_MAX_ASYNC_TASK_NUMBER)
+    except ValueError:
+        pass
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-07
+# ======================================================================================================================
+
+import asyncio
+import threading
+
+__all__ = ["AsyncTaskRuntime"]
+
+
+class AsyncTaskRuntime:
+    """
+    异步任务运行环境，每个子进程一个，在单独的线程中运行事件循环
+    提交的协程返回 concurrent.futures.Future，与线程池中运行的任务使用相同的回调与超时处理
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+        self.loop = None
+        self._semaphore = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        启动事件循环线程，等待事件循环就绪
+        :return: None
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def submit(self, coroutine):
+        """
+        提交协程到事件循环，同时运行的协程数超过 max_concurrency 时排队等待
+        :param coroutine: 协程对象
+        :return: concurrent.futures.Future
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._run_limited(coroutine), self.loop)
+
+    async def _run_limited(self, coroutine):
+        async with self._semaphore:
+            return await coroutine
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        # 信号量需要在事件循环所在线程中创建
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._ready.set()
+        self.loop.run_forever()
@@ -12,6 +12,8 @@
 # Create: 2025-01-14
 # ======================================================================================================================
 
+from django.db import transaction
+
 from utils.logger import init_log
 
 task_logger = init_log("taskmanager.log")
@@ -44,3 +46,16 @@ def schedule_model_service(message):
     :return:
     """
     pass
+
+
+def schedule_model_service_batch(messages):
+    """
+    批量更新任务调度过程中对应的数据库表，同一批消息在一个事务中写入，避免每条进度消息单独提交
+    :param messages: 已按任务与阶段合并的消息
+    :return:
+    """
+    if not messages:
+        return
+    with transaction.atomic():
+        for message in messages:
+            schedule_model_service(message)
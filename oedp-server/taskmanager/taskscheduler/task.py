@@ -36,13 +36,39 @@ class TaskStatus:
         return status in (TaskStatus.SUCCESS, TaskStatus.FAILED)
 
 
+class TaskPriority:
+    """
+    任务的优先级，数值越小越优先
+    """
+    HIGH = 0  # 交互式的任务，如节点检查
+    NORMAL = 1
+    LOW = 2  # 耗时较长的批量任务，如部署
+
+    # 加权轮询时各优先级每轮可以分发的任务数，低优先级的任务不会被完全饿死
+    WEIGHTS = {HIGH: 4, NORMAL: 2, LOW: 1}
+
+    @staticmethod
+    def normalize(priority):
+        """
+        将未知的优先级视为普通优先级
+        :param priority:
+        :return:
+        """
+        return priority if priority in TaskPriority.WEIGHTS else TaskPriority.NORMAL
+
+
 class BaseTask(ABC):
     """
     定义任务类的基类，每个节点为一个独立的任务
     """
+    # 任务的默认优先级，子类可以覆盖，也可以在node中通过priority指定
+    PRIORITY = TaskPriority.NORMAL
 
     def __init__(self, node: Dict):
         self.node = node  # node保存节点基本信息，用于调度进程与子进程通信及调度进程对数据库状态的更新
+        self.id = node.get("id", "")  # 与任务消息中的id一致，用于在运行中的任务中查找该任务
+        self.user_id = node.get("user_id", 0)  # 提交任务的用户，用于按用户公平调度以及限制用户的任务数
+        self.priority = TaskPriority.normalize(node.get("priority", self.PRIORITY))
         self.return_message = {
             "id": "",
             "current_step": "",
@@ -75,3 +101,27 @@ class BaseTask(ABC):
             self.return_message["step_status"] = step_status
 
         message_queue.put(deepcopy(self.return_message))
+
+
+class AsyncBaseTask(BaseTask):
+    """
+    异步任务的基类，start 与 clear 为协程，在子进程的事件循环中运行，不占用线程池中的线程
+    适用于主要时间在等待 SSH、ansible 等子进程的任务，单个进程可以同时运行大量节点任务
+    任务中不能调用阻塞的函数，执行命令使用 AsyncCommandExecutor，SSH 使用 SSHConnector 的异步接口
+    """
+
+    @abstractmethod
+    async def start(self, *args, **kwargs):
+        """
+        作为各个任务的入口协程，子类必须实现
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    async def clear(self, *args, **kwargs):
+        """
+        作为各个任务的失败清理协程，子类必须实现
+        :return:
+        """
+        pass
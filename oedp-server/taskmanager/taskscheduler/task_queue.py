@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-04
+# ======================================================================================================================
+
+import queue
+from collections import OrderedDict, deque
+
+from taskmanager.taskscheduler.task import TaskPriority
+
+__all__ = ["FairTaskQueue"]
+
+
+class FairTaskQueue:
+    """
+    按优先级与用户公平调度的任务队列，替代先进先出的 queue.Queue，避免一个用户提交的大量任务阻塞其他用户
+    优先级之间按 TaskPriority.WEIGHTS 加权轮询，同一优先级内各用户轮流出队
+    非线程安全，调用方需要持有任务队列的条件变量
+    """
+
+    def __init__(self, weights=None):
+        self.weights = dict(weights or TaskPriority.WEIGHTS)
+        # {优先级: OrderedDict{用户: deque[任务]}}，OrderedDict 的顺序即用户的轮询顺序
+        self._queues = {priority: OrderedDict() for priority in self.weights}
+        # 本轮各优先级剩余可以分发的任务数
+        self._credits = dict(self.weights)
+        self._size = 0
+
+    def put(self, task):
+        """
+        任务入队
+        :param task: 任务actor
+        :return: None
+        """
+        priority = TaskPriority.normalize(getattr(task, "priority", TaskPriority.NORMAL))
+        user_queues = self._queues[priority]
+        user_queues.setdefault(getattr(task, "user_id", 0), deque()).append(task)
+        self._size += 1
+
+    def get(self):
+        """
+        任务出队
+        :return: 任务actor
+        """
+        if self._size == 0:
+            raise queue.Empty
+        priority = self._select_priority()
+        user_queues = self._queues[priority]
+        user_id, tasks = next(iter(user_queues.items()))
+        task = tasks.popleft()
+        # 已出队的用户排到队尾，没有任务时移除
+        if tasks:
+            user_queues.move_to_end(user_id)
+        else:
+            del user_queues[user_id]
+        self._credits[priority] -= 1
+        self._size -= 1
+        return task
+
+    def empty(self):
+        return self._size == 0
+
+    def qsize(self):
+        return self._size
+
+    def _select_priority(self):
+        """
+        选择有任务且本轮还有剩余额度的最高优先级，都没有剩余额度时开始新一轮
+        :return: 优先级
+        """
+        ready = [priority for priority in sorted(self._queues) if self._queues[priority]]
+        for priority in ready:
+            if self._credits[priority] > 0:
+                return priority
+        self._credits = dict(self.weights)
+        return ready[0]
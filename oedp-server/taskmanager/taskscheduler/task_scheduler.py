@@ -13,6 +13,8 @@
 # ======================================================================================================================
 
 import functools
+import heapq
+import itertools
 import multiprocessing
 import os
 import queue
@@ -24,9 +26,11 @@ from concurrent.futures import ThreadPoolExecutor
 from django.db import connections
 from utils.record_time.record_time import RecordTime
 
-from constants.configs.task_config import task_config
+from constants.configs.task_config import TaskConfig
 from taskmanager.taskscheduler import service
-from taskmanager.taskscheduler.task import TaskStatus
+from taskmanager.taskscheduler.async_runtime import AsyncTaskRuntime
+from taskmanager.taskscheduler.task import AsyncBaseTask, TaskStatus
+from taskmanager.taskscheduler.task_queue import FairTaskQueue
 from utils.logger import init_log
 
 task_logger = init_log("taskmanager.log")
@@ -60,15 +64,12 @@ def keep_while_true(func):
     return wrapper
 
 
-def task_thread_handler(task_manager):
+def log_task_start(task_manager):
     """
-    开启任务进程
+    记录任务开始运行的节点信息
     :param task_manager:
     :return:
     """
-    reopen_logger_file()
-    connections.close_all()
-    task_manager.thread_id = threading.get_ident()
     ip_address = "127.0.0.1"
     port = '22'
     if task_manager.task.node.get("node_alias_name", ""):
@@ -80,11 +81,36 @@ def task_thread_handler(task_manager):
     actor_name = task_manager.task.__class__.__name__
     task_logger.info("Task start successfully,thread[%s]|ip[%s]|port[%s]|actor_name[%s].", task_manager.thread_id,
                 ip_address, port, actor_name)
+
+
+def task_thread_handler(task_manager):
+    """
+    开启任务进程
+    :param task_manager:
+    :return:
+    """
+    reopen_logger_file()
+    connections.close_all()
+    task_manager.thread_id = threading.get_ident()
+    log_task_start(task_manager)
     task = task_manager.task
     message_queue = task_manager.message_queue
     task.start(message_queue)
 
 
+async def async_task_handler(task_manager):
+    """
+    在事件循环中运行异步任务，thread_id 为事件循环所在线程
+    :param task_manager:
+    :return:
+    """
+    task_manager.thread_id = threading.get_ident()
+    log_task_start(task_manager)
+    task = task_manager.task
+    message_queue = task_manager.message_queue
+    await task.start(message_queue)
+
+
 def capture_thread_exception(future_obj):
     """
     捕获线程池运行异常
@@ -108,7 +134,7 @@ class TaskManager:
         self.message_queue = message_queue
         self.thread = None
         self.thread_id = 0
-        self.thread_timeout = 0
+        self.thread_timeout_deadline = None  # 任务线程结束后等待完成消息的截止时间（time.monotonic）
         self.thread_start_time = None  # timezone实例
 
 
@@ -118,13 +144,20 @@ class ThreadManager:
     """
 
     def __init__(self, task_thread_pool, message_queue, pending_queue, pending_queue_condition,
-                 running_task_queue, running_task_condition):
+                 running_tasks, running_task_condition, process_manager=None, async_runtime=None):
+        self.process_manager = process_manager
         self.task_thread_pool = task_thread_pool
+        # 运行异步任务的事件循环
+        self.async_runtime = async_runtime
         self.message_queue = message_queue
         self.pending_queue = pending_queue
         self.pending_queue_condition = pending_queue_condition
-        self.running_task_queue = running_task_queue
+        # 运行中的任务，{任务id: TaskManager}
+        self.running_tasks = running_tasks
         self.running_task_condition = running_task_condition
+        # 任务超时的定时器堆，[(截止时间, 序号, 任务id)]，任务完成后不从堆中删除，到期时再忽略
+        self.timeout_heap = []
+        self.timeout_sequence = itertools.count()
 
 
 class ProcessManager:
@@ -132,33 +165,128 @@ class ProcessManager:
     进程管理类，封装需要的各种信息
     """
 
-    def __init__(self, thread_pool_number, pending_queue, pending_queue_condition):
+    def __init__(self, thread_pool_number, pending_queue, pending_queue_condition, finished_queue=None):
         self.process = None
         self.thread_pool_number = thread_pool_number
         self.pending_queue = pending_queue
         self.pending_queue_condition = pending_queue_condition
+        # 子进程通知主进程任务已结束的队列，主进程据此统计各用户未结束的任务数
+        self.finished_queue = finished_queue
+        # 已分发给该进程但尚未结束的任务数（包括等待中与运行中），主进程分发时加一，子进程任务线程结束时减一
+        self.running_count = multiprocessing.Value('i', 0)
+
+    def get_load(self):
+        """
+        获取进程负载
+        :return: 已分发但尚未结束的任务数
+        """
+        return self.running_count.value
+
+    def increase_load(self):
+        """
+        分发任务时增加进程负载
+        :return: None
+        """
+        with self.running_count.get_lock():
+            self.running_count.value += 1
+
+    def finish_task(self, user_id, *_):
+        """
+        任务线程结束时减少进程负载，并通知主进程，可以作为线程的回调函数
+        :param user_id: 提交任务的用户
+        :return: None
+        """
+        with self.running_count.get_lock():
+            if self.running_count.value > 0:
+                self.running_count.value -= 1
+        if self.finished_queue is not None:
+            self.finished_queue.put(user_id)
+
+
+def close_unusable_connections():
+    """
+    关闭已不可用的数据库连接，可用的连接继续保留，避免每次刷新任务状态都重新建立连接
+    :return: None
+    """
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+
+
+def collect_task_messages(message_queue):
+    """
+    阻塞等待第一条消息，之后在刷新间隔内继续读取，同一任务同一阶段的进度消息只保留最新的一条
+    :param message_queue: 任务间通信的消息队列
+    :return: [(消息, 任务是否完成的标志)]
+    """
+    message = message_queue.get(True)
+    deadline = time.monotonic() + TaskScheduler.STATUS_FLUSH_INTERVAL
+    coalesced_messages = dict()
+    message_number = 0
+    while True:
+        is_completed = message.pop("is_completed")
+        key = (message.get("id"), message.get("current_step"))
+        previous = coalesced_messages.pop(key, None)
+        # 任务完成的标志不能被之后的进度消息覆盖
+        if previous and TaskStatus.task_is_completed(previous[1]) and not TaskStatus.task_is_completed(is_completed):
+            is_completed = previous[1]
+        coalesced_messages[key] = (message, is_completed)
+        message_number += 1
+        remaining_time = deadline - time.monotonic()
+        if message_number >= TaskScheduler.STATUS_FLUSH_BATCH_SIZE or remaining_time <= 0:
+            break
+        try:
+            message = message_queue.get(True, remaining_time)
+        except queue.Empty:
+            break
+    return list(coalesced_messages.values())
 
 
 @keep_while_true
 def update_task(thread_obj):
     """
-    任务状态刷新
+    任务状态刷新，合并刷新间隔内的进度消息，在一个事务中批量写入数据库
     :param thread_obj: 线程管理类对象
     :return: None
     """
     reopen_logger_file()
     try:
-        message = thread_obj.message_queue.get(True)
-        connections.close_all()
-        # 更新数据库
-        is_completed = message.pop("is_completed")
-        service.schedule_model_service(message)
-        # 更新时间节点
-        RecordTime.update_end_time(message)
-        # 判断任务是否结束，结束则从运行队列剔除该任务
-        check_task_complete(thread_obj, message, is_completed)
+        messages = collect_task_messages(thread_obj.message_queue)
     except Exception as ex:
         task_logger.error(ex)
+        return
+    # 更新数据库
+    write_task_messages([message for message, _ in messages])
+    # 数据库写入失败时也需要处理任务完成的消息，否则任务会一直留在运行队列中
+    for message, is_completed in messages:
+        try:
+            # 更新时间节点
+            RecordTime.update_end_time(message)
+            # 判断任务是否结束，结束则从运行队列剔除该任务
+            check_task_complete(thread_obj, message, is_completed)
+        except Exception as ex:
+            task_logger.error(ex)
+
+
+def write_task_messages(messages):
+    """
+    在一个事务中批量写入任务消息，批量写入失败时逐条重新写入，一条消息写入失败不影响同一批的其他消息
+    :param messages: 已按任务与阶段合并的消息
+    :return: None
+    """
+    try:
+        close_unusable_connections()
+        service.schedule_model_service_batch(messages)
+        return
+    except Exception as ex:
+        task_logger.error("Failed to write %s task messages in batch, retry one by one: %s", len(messages), ex)
+    for message in messages:
+        try:
+            close_unusable_connections()
+            service.schedule_model_service(message)
+        except Exception as ex:
+            task_logger.error("Failed to write message of node[%s] step[%s]: %s", message.get("id"),
+                              message.get("current_step"), ex)
 
 
 @keep_while_true
@@ -178,11 +306,18 @@ def schedule_task(thread_obj):
         task = thread_obj.pending_queue.get()
         with thread_obj.running_task_condition:
             task_manager = TaskManager(task, thread_obj.message_queue)
-            task_thread = thread_obj.task_thread_pool.submit(task_thread_handler, task_manager)
-            task_thread.add_done_callback(capture_thread_exception)
+            thread_obj.running_tasks[task.id] = task_manager
+            # 异步任务在事件循环中运行，返回的 Future 与线程池相同，之后的回调与超时处理一致
+            if isinstance(task, AsyncBaseTask) and thread_obj.async_runtime:
+                task_thread = thread_obj.async_runtime.submit(async_task_handler(task_manager))
+            else:
+                task_thread = thread_obj.task_thread_pool.submit(task_thread_handler, task_manager)
             task_manager.thread = task_thread
-            thread_obj.running_task_queue.put(task_manager)
-            thread_obj.running_task_condition.notify()
+            task_thread.add_done_callback(capture_thread_exception)
+            task_thread.add_done_callback(functools.partial(start_task_timer, thread_obj, task_manager))
+            if thread_obj.process_manager:
+                task_thread.add_done_callback(
+                    functools.partial(thread_obj.process_manager.finish_task, getattr(task, "user_id", 0)))
         task_logger.info("schedule task finish")
     except Exception as ex:
         task_logger.error(ex)
@@ -200,33 +335,55 @@ def monitor_task(thread_obj):
         check_task_timeout(thread_obj)
     except Exception as ex:
         task_logger.error(ex)
-    time.sleep(TaskScheduler.THREAD_MONITORING_DURATION_INTERVAL)
+
+
+def start_task_timer(thread_obj, task_manager, *_):
+    """
+    任务线程结束时，如果还没有收到任务完成的消息，开始超时计时，作为任务线程的回调函数
+    :param thread_obj: 线程管理类对象
+    :param task_manager: 任务管理类对象
+    :return: None
+    """
+    with thread_obj.running_task_condition:
+        if thread_obj.running_tasks.get(task_manager.task.id) is not task_manager:
+            return
+        task_manager.thread_timeout_deadline = time.monotonic() + TaskConfig.THREAD_TIMEOUT
+        heapq.heappush(thread_obj.timeout_heap,
+                       (task_manager.thread_timeout_deadline, next(thread_obj.timeout_sequence), task_manager.task.id))
+        thread_obj.running_task_condition.notify()
 
 
 def check_task_timeout(thread_obj):
     """
-    检查任务是否超时，如果超时，将任务置为任务异常
+    等待最早到期的定时器，任务线程结束后超时仍未收到完成消息时，将任务置为任务异常
     :param thread_obj: 线程管理类对象
     :return: None
     """
+    timeout_tasks = []
     with thread_obj.running_task_condition:
-        if thread_obj.running_task_queue.empty():
+        heap = thread_obj.timeout_heap
+        if not heap:
             thread_obj.running_task_condition.wait()
-
-        for _ in range(thread_obj.running_task_queue.qsize()):
-            task_manager = thread_obj.running_task_queue.get()
-            if not task_manager.thread.done():
-                thread_obj.running_task_queue.put(task_manager)
+            return
+        wait_time = heap[0][0] - time.monotonic()
+        if wait_time > 0:
+            thread_obj.running_task_condition.wait(wait_time)
+            return
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            deadline, _, task_id = heapq.heappop(heap)
+            task_manager = thread_obj.running_tasks.get(task_id)
+            # 已完成的任务或者同一id的新任务，忽略过期的定时器
+            if task_manager is None or task_manager.thread_timeout_deadline != deadline:
                 continue
-            if task_manager.thread_timeout >= task_config.thread_timeout:
-                # 进程异常退出，将数据库任务状态置成任务异常
-                connections.close_all()
-                message = service.generate_process_timeout_message(task_manager.task.node)
-                service.schedule_model_service(message)
-                task_logger.error("Task[%s] thread[%s] timeout.", task_manager.task.node.get('id'), task_manager.thread_id)
-            else:
-                task_manager.thread_timeout += TaskScheduler.THREAD_MONITORING_DURATION_INTERVAL
-                thread_obj.running_task_queue.put(task_manager)
+            del thread_obj.running_tasks[task_id]
+            timeout_tasks.append(task_manager)
+    for task_manager in timeout_tasks:
+        # 进程异常退出，将数据库任务状态置成任务异常
+        connections.close_all()
+        message = service.generate_process_timeout_message(task_manager.task.node)
+        service.schedule_model_service(message)
+        task_logger.error("Task[%s] thread[%s] timeout.", task_manager.task.node.get('id'), task_manager.thread_id)
 
 
 def check_task_complete(thread_obj, message, complete_status):
@@ -243,12 +400,7 @@ def check_task_complete(thread_obj, message, complete_status):
         task_logger.info("Node[%s] current step[%s] result is: %s.", message.get('id'), message.get('current_step'),
                     message.get('current_step_status'))
         service.update_task_completed(message)
-        for _ in range(thread_obj.running_task_queue.qsize()):
-            task_manager = thread_obj.running_task_queue.get()
-            if task_manager.task.id == message.get("id"):
-                break
-            else:
-                thread_obj.running_task_queue.put(task_manager)
+        thread_obj.running_tasks.pop(message.get("id"), None)
 
 
 def manage_process(process_id):
@@ -262,19 +414,23 @@ def manage_process(process_id):
     process_manager = None
     while not process_manager:
         process_manager = TaskScheduler.process_dict.get(process_id)
-    running_task_queue = queue.Queue()
+    running_tasks = dict()
     # 创建通信用的消息队列
     message_queue = queue.Queue()
     # 控制运行队列存放和取出的条件变量
     running_task_condition = threading.Condition()
     # 创建用来运行任务的线程池
     task_thread_pool = ThreadPoolExecutor(process_manager.thread_pool_number)
+    # 创建用来运行异步任务的事件循环，异步任务不占用线程池中的线程
+    async_runtime = AsyncTaskRuntime(TaskConfig.MAX_ASYNC_TASK_NUMBER)
     # 初始时，子进程中的任务数为0
     thread_obj = ThreadManager(task_thread_pool, message_queue,
                                process_manager.pending_queue,
                                process_manager.pending_queue_condition,
-                               running_task_queue,
-                               running_task_condition)
+                               running_tasks,
+                               running_task_condition,
+                               process_manager,
+                               async_runtime)
     update_task_thread = threading.Thread(target=update_task, args=(thread_obj,), daemon=True)
     update_task_thread.start()
     monitor_task_thread = threading.Thread(target=monitor_task, args=(thread_obj,), daemon=True)
@@ -291,22 +447,28 @@ class TaskScheduler:
     """
     单例实现任务调度模块
     """
-    # 线程监控间隔
-    THREAD_MONITORING_DURATION_INTERVAL = 2
     # 任务监控间隔
     RUNNING_TASK_DURATION_INTERVAL = 2
+    # 任务状态刷新间隔（秒），间隔内同一任务同一阶段的进度消息合并后批量写入数据库
+    STATUS_FLUSH_INTERVAL = 0.5
+    # 每次批量写入数据库的最大消息数
+    STATUS_FLUSH_BATCH_SIZE = 500
     # 最大任务数
-    MAX_RUNNING_TASK = task_config.max_task_number
+    MAX_RUNNING_TASK = TaskConfig.MAX_TASK_NUMBER
     # 单例
     _instance = None
     # 机器核数
     cpu_number = multiprocessing.cpu_count()
     # 存储子进程的字典
     process_dict = dict()
-    # 主进程存放任务的队列
-    task_save_queue = queue.Queue()
+    # 主进程存放任务的队列，按优先级与用户公平出队
+    task_save_queue = FairTaskQueue()
     # 控制主线程任务队列的条件变量
     task_save_queue_condition = threading.Condition()
+    # 子进程通知主进程任务已结束的队列
+    finished_task_queue = multiprocessing.Queue()
+    # 各用户已添加但尚未结束的任务数
+    user_task_count = dict()
     process_num = 0
 
     def __new__(cls, *args, **kw):
@@ -342,6 +504,9 @@ class TaskScheduler:
         distribute_task_thread = threading.Thread(target=self.distribute_task, args=())
         distribute_task_thread.daemon = True
         distribute_task_thread.start()
+        finished_task_thread = threading.Thread(target=self.watch_finished_task, args=())
+        finished_task_thread.daemon = True
+        finished_task_thread.start()
         self.start_subprocess(thread_pool_number)
         task_logger.info("start finish")
 
@@ -356,7 +521,8 @@ class TaskScheduler:
                 # 生成和子进程通信的等待队列，用来存放需要执行的任务，当主进程有任务添加时，通过此队列将任务分发给子进程
                 pending_queue = multiprocessing.Queue()
                 pending_queue_condition = multiprocessing.Condition()
-                process_manager = ProcessManager(thread_pool_number, pending_queue, pending_queue_condition)
+                process_manager = ProcessManager(thread_pool_number, pending_queue, pending_queue_condition,
+                                                 self.finished_task_queue)
                 self.process_dict[i] = process_manager
                 process_obj = multiprocessing.Process(target=manage_process, args=(i,), daemon=True)
                 process_manager.process = process_obj
@@ -368,39 +534,140 @@ class TaskScheduler:
     @keep_while_true
     def distribute_task(self):
         """
-        任务分发，将添加到等待队列中的任务分发给子进程
+        任务分发，子进程有空闲线程时才从等待队列中取出任务分发给子进程
+        子进程的等待队列先进先出，未分发的任务留在主进程的等待队列中，按优先级与用户公平出队
         :return: None
         """
         task_logger.info("distribute task start")
         try:
             with self.task_save_queue_condition:
-                if self.task_save_queue.empty():
-                    self.task_save_queue_condition.wait()
-            task = self.task_save_queue.get()
-            # 选择需要分发任务的子进程
-            process_manager = self.process_dict.get(self.process_num)
-            self.process_num = self.process_num + 1
-            if self.process_num == self.cpu_number:
-                self.process_num = 0
+                process_id = self.wait_idle_process()
+                task = self.task_save_queue.get()
+            process_manager = self.process_dict.get(process_id)
+            process_manager.increase_load()
             # 将任务分发个选定的子进程
             with process_manager.pending_queue_condition:
                 process_manager.pending_queue.put(task)
                 process_manager.pending_queue_condition.notify()
-            task_logger.info("distribute task finish")
+            task_logger.info("distribute task to process[%s] finish, occupancy is %s", process_id,
+                             self.format_occupancy())
+        except Exception as ex:
+            task_logger.error(ex)
+
+    def wait_idle_process(self):
+        """
+        等待有任务需要分发且负载最低的子进程有空闲线程，调用方需要持有任务队列的条件变量
+        :return: 子进程编号
+        """
+        while True:
+            if not self.task_save_queue.empty():
+                process_id = self.select_process()
+                process_manager = self.process_dict[process_id]
+                if process_manager.get_load() < process_manager.thread_pool_number:
+                    return process_id
+            self.task_save_queue_condition.wait()
+
+    @keep_while_true
+    def watch_finished_task(self):
+        """
+        等待子进程通知任务结束，更新各用户未结束的任务数，并唤醒等待空闲子进程的任务分发线程
+        :return: None
+        """
+        try:
+            user_id = self.finished_task_queue.get()
+            with self.task_save_queue_condition:
+                self.count_finished_task(user_id)
+                self.collect_finished_task()
+                self.task_save_queue_condition.notify_all()
         except Exception as ex:
             task_logger.error(ex)
 
+    def select_process(self):
+        """
+        选择已分发任务数占线程数比例最低的子进程，负载相同时从上次选择的下一个进程开始轮询，避免总是分发给同一个进程
+        :return: 子进程编号
+        """
+        process_number = len(self.process_dict)
+        selected_id = None
+        selected_load = None
+        for offset in range(process_number):
+            process_id = (self.process_num + offset) % process_number
+            process_manager = self.process_dict[process_id]
+            load = process_manager.get_load() / max(process_manager.thread_pool_number, 1)
+            if selected_load is None or load < selected_load:
+                selected_id, selected_load = process_id, load
+        self.process_num = (selected_id + 1) % process_number
+        return selected_id
+
+    def get_occupancy(self):
+        """
+        获取各子进程的占用情况
+        :return: [{'process_id', 'pid', 'running', 'capacity', 'occupancy'}]
+        """
+        occupancy = []
+        for process_id, process_manager in sorted(self.process_dict.items()):
+            running = process_manager.get_load()
+            capacity = process_manager.thread_pool_number
+            occupancy.append({
+                'process_id': process_id,
+                'pid': process_manager.process.pid if process_manager.process else None,
+                'running': running,
+                'capacity': capacity,
+                'occupancy': round(running / max(capacity, 1), 2)
+            })
+        return occupancy
+
+    def format_occupancy(self):
+        """
+        将各子进程的占用情况转换为便于日志输出的字符串
+        :return: 如 0:3/4,1:1/4
+        """
+        return ",".join(f"{item['process_id']}:{item['running']}/{item['capacity']}" for item in self.get_occupancy())
+
     def add_task(self, task):
         """
         添加任务，唤醒任务分发线程
         :param task: 任务actor
-        :return: None
+        :return: 是否添加成功，用户未结束的任务数达到 max_user_task_number 时拒绝添加
         """
         task_logger.info("add task start")
+        user_id = getattr(task, "user_id", 0)
         with self.task_save_queue_condition:
+            self.collect_finished_task()
+            user_task_number = self.user_task_count.get(user_id, 0)
+            if user_task_number >= TaskConfig.MAX_USER_TASK_NUMBER:
+                task_logger.warning("User[%s] already has %s unfinished tasks, reject new task.", user_id,
+                                    user_task_number)
+                return False
+            self.user_task_count[user_id] = user_task_number + 1
             self.task_save_queue.put(task)
             self.task_save_queue_condition.notify()
         task_logger.info("add task finish")
+        return True
+
+    def collect_finished_task(self):
+        """
+        读取子进程通知的已结束任务，更新各用户未结束的任务数，调用方需要持有任务队列的条件变量
+        :return: None
+        """
+        while True:
+            try:
+                user_id = self.finished_task_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.count_finished_task(user_id)
+
+    def count_finished_task(self, user_id):
+        """
+        用户的一个任务已结束，减少该用户未结束的任务数，调用方需要持有任务队列的条件变量
+        :param user_id: 提交任务的用户
+        :return: None
+        """
+        user_task_number = self.user_task_count.get(user_id, 0) - 1
+        if user_task_number > 0:
+            self.user_task_count[user_id] = user_task_number
+        else:
+            self.user_task_count.pop(user_id, None)
 
 
 TASK_SCHEDULER = TaskScheduler()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import CancelledError, Future
+
+from taskmanager.taskscheduler.async_runtime import AsyncTaskRuntime
+from utils.cmd_executor import AsyncCommandExecutor, TIMEOUT_CODE
+
+# 在后台启动子进程并记录其pid，之后一直等待，用于检查超时后整个进程组都被结束
+BACKGROUND_SLEEP_SCRIPT = 'sleep 30 & echo $! > "$0"; wait'
+
+
+def process_exists(pid):
+    """
+    进程是否仍在运行，已结束但未被回收的僵尸进程视为不存在
+    :param pid: 进程号
+    :return: bool
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return False
+
+
+class AsyncTaskRuntimeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.runtime = AsyncTaskRuntime(2)
+
+    def tearDown(self):
+        if self.runtime.loop:
+            self.runtime.loop.call_soon_threadsafe(self.runtime.loop.stop)
+
+    def test_submit_returns_future(self):
+        """提交的协程返回 concurrent.futures.Future，可以获取协程的返回值"""
+        async def add(first, second):
+            await asyncio.sleep(0)
+            return first + second
+
+        future = self.runtime.submit(add(1, 2))
+
+        self.assertIsInstance(future, Future)
+        self.assertEqual(future.result(timeout=5), 3)
+
+    def test_limit_concurrency(self):
+        """同时运行的协程数不超过 max_concurrency，超过时排队等待"""
+        running = []
+        max_running = []
+
+        async def task():
+            running.append(1)
+            max_running.append(len(running))
+            await asyncio.sleep(0.05)
+            running.pop()
+
+        futures = [self.runtime.submit(task()) for _ in range(6)]
+        for future in futures:
+            future.result(timeout=5)
+
+        self.assertEqual(max(max_running), 2)
+
+
+class AsyncCommandExecutorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pid_file = os.path.join(self.temp_dir, "pid")
+        self.runtime = AsyncTaskRuntime(10)
+
+    def tearDown(self):
+        if self.runtime.loop:
+            self.runtime.loop.call_soon_threadsafe(self.runtime.loop.stop)
+        shutil.rmtree(self.temp_dir)
+
+    def _read_background_pid(self):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(self.pid_file):
+                with open(self.pid_file, "r") as f:
+                    content = f.read().strip()
+                if content:
+                    return int(content)
+            time.sleep(0.01)
+        self.fail("background process not started")
+
+    def _assert_process_killed(self, pid):
+        deadline = time.monotonic() + 5
+        while process_exists(pid) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(process_exists(pid))
+
+    def test_run_command(self):
+        """返回命令的输出与返回码"""
+        executor = AsyncCommandExecutor(["sh", "-c", "echo out; echo err >&2; exit 3"])
+
+        stdout, stderr, code = asyncio.run(executor.run())
+
+        self.assertEqual((stdout, stderr, code), ("out\n", "err\n", 3))
+
+    def test_timeout_kills_process_group(self):
+        """命令超时时结束整个进程组，包括命令启动的子进程"""
+        executor = AsyncCommandExecutor(["sh", "-c", BACKGROUND_SLEEP_SCRIPT, self.pid_file], timeout=1)
+        start = time.monotonic()
+
+        result = asyncio.run(executor.run())
+
+        self.assertEqual(result, ("", "", TIMEOUT_CODE))
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertIsNotNone(executor.process.returncode)
+        self._assert_process_killed(self._read_background_pid())
+
+    def test_cancel_kills_process_group(self):
+        """在异步运行环境中取消任务时结束整个进程组"""
+        executor = AsyncCommandExecutor(["sh", "-c", BACKGROUND_SLEEP_SCRIPT, self.pid_file])
+        future = self.runtime.submit(executor.run())
+        background_pid = self._read_background_pid()
+
+        future.cancel()
+
+        with self.assertRaises(CancelledError):
+            future.result(timeout=5)
+        self._assert_process_killed(background_pid)
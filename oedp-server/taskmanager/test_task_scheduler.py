@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import importlib
+import importlib.util
+import queue
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from taskmanager.taskscheduler.task import TaskPriority
+from taskmanager.taskscheduler.task_queue import FairTaskQueue
+
+
+def import_task_scheduler():
+    """
+    导入任务调度模块，导入时创建的调度单例不启动分发线程与子进程，只测试调度逻辑
+    :return: task_scheduler 模块
+    """
+    stub_modules = []
+    if importlib.util.find_spec("utils.record_time") is None:
+        record_time = MagicMock()
+        stub_modules = [("utils.record_time", record_time), ("utils.record_time.record_time", record_time.record_time)]
+    for name, module in stub_modules:
+        sys.modules[name] = module
+    try:
+        with patch("threading.Thread"), patch("multiprocessing.Process"):
+            return importlib.import_module("taskmanager.taskscheduler.task_scheduler")
+    finally:
+        for name, _ in stub_modules:
+            sys.modules.pop(name, None)
+
+
+task_scheduler = import_task_scheduler()
+
+
+def create_scheduler(loads, thread_pool_number=4):
+    """
+    创建不启动子进程的调度器，各子进程已分发的任务数为 loads
+    :param loads: 各子进程已分发但尚未结束的任务数
+    :param thread_pool_number: 各子进程的线程数
+    :return: TaskScheduler
+    """
+    scheduler = object.__new__(task_scheduler.TaskScheduler)
+    scheduler.process_dict = dict()
+    scheduler.process_num = 0
+    for process_id, load in enumerate(loads):
+        process_manager = task_scheduler.ProcessManager(thread_pool_number, None, None)
+        process_manager.running_count.value = load
+        scheduler.process_dict[process_id] = process_manager
+    return scheduler
+
+
+def create_task(task_id, user_id=0, priority=TaskPriority.NORMAL):
+    return SimpleNamespace(id=task_id, user_id=user_id, priority=priority)
+
+
+class FairTaskQueueTestCase(unittest.TestCase):
+
+    def test_get_from_empty_queue(self):
+        """队列为空时抛出 queue.Empty"""
+        task_queue = FairTaskQueue()
+        self.assertTrue(task_queue.empty())
+        with self.assertRaises(queue.Empty):
+            task_queue.get()
+
+    def test_alternate_between_users(self):
+        """同一优先级内各用户轮流出队，先提交大量任务的用户不会阻塞其他用户"""
+        task_queue = FairTaskQueue()
+        for index in range(3):
+            task_queue.put(create_task(f"a{index}", user_id=1))
+        task_queue.put(create_task("b0", user_id=2))
+        task_queue.put(create_task("b1", user_id=2))
+        self.assertEqual([task_queue.get().id for _ in range(5)], ["a0", "b0", "a1", "b1", "a2"])
+        self.assertEqual(task_queue.qsize(), 0)
+
+    def test_low_priority_not_starved(self):
+        """高优先级任务持续存在时，低优先级任务每轮仍可以按权重出队"""
+        task_queue = FairTaskQueue()
+        for index in range(10):
+            task_queue.put(create_task(f"high{index}", priority=TaskPriority.HIGH))
+        task_queue.put(create_task("low", priority=TaskPriority.LOW))
+        order = [task_queue.get().id for _ in range(5)]
+        self.assertEqual(order, ["high0", "high1", "high2", "high3", "low"])
+
+    def test_unknown_priority_as_normal(self):
+        """未知的优先级按普通优先级处理"""
+        task_queue = FairTaskQueue({TaskPriority.HIGH: 1, TaskPriority.NORMAL: 1, TaskPriority.LOW: 1})
+        task_queue.put(create_task("unknown", priority=99))
+        task_queue.put(create_task("high", priority=TaskPriority.HIGH))
+        self.assertEqual([task_queue.get().id for _ in range(2)], ["high", "unknown"])
+
+
+class AddTaskTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = object.__new__(task_scheduler.TaskScheduler)
+        self.scheduler.task_save_queue = FairTaskQueue()
+        self.scheduler.task_save_queue_condition = threading.Condition()
+        self.scheduler.finished_task_queue = queue.Queue()
+        self.scheduler.user_task_count = dict()
+
+    @patch.object(task_scheduler.TaskConfig, "MAX_USER_TASK_NUMBER", 2)
+    def test_reject_when_user_task_number_reached(self):
+        """用户未结束的任务数达到上限时拒绝添加，不影响其他用户"""
+        self.assertTrue(self.scheduler.add_task(create_task("a0", user_id=1)))
+        self.assertTrue(self.scheduler.add_task(create_task("a1", user_id=1)))
+        self.assertFalse(self.scheduler.add_task(create_task("a2", user_id=1)))
+        self.assertTrue(self.scheduler.add_task(create_task("b0", user_id=2)))
+        self.assertEqual(self.scheduler.task_save_queue.qsize(), 3)
+        self.assertEqual(self.scheduler.user_task_count, {1: 2, 2: 1})
+
+    @patch.object(task_scheduler.TaskConfig, "MAX_USER_TASK_NUMBER", 2)
+    def test_admit_again_after_task_finished(self):
+        """子进程通知任务结束后，用户可以再次添加任务"""
+        self.scheduler.add_task(create_task("a0", user_id=1))
+        self.scheduler.add_task(create_task("a1", user_id=1))
+        self.scheduler.finished_task_queue.put(1)
+        self.assertTrue(self.scheduler.add_task(create_task("a2", user_id=1)))
+        self.assertEqual(self.scheduler.user_task_count, {1: 2})
+
+    def test_collect_finished_task_removes_idle_user(self):
+        """用户的任务全部结束后不再记录该用户"""
+        self.scheduler.add_task(create_task("a0", user_id=1))
+        self.scheduler.finished_task_queue.put(1)
+        with self.scheduler.task_save_queue_condition:
+            self.scheduler.collect_finished_task()
+        self.assertEqual(self.scheduler.user_task_count, {})
+
+
+class DistributeTaskTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = create_scheduler([0], thread_pool_number=2)
+        self.scheduler.task_save_queue = FairTaskQueue()
+        self.scheduler.task_save_queue_condition = threading.Condition()
+        self.scheduler.finished_task_queue = queue.Queue()
+        self.scheduler.user_task_count = dict()
+        self.process_manager = self.scheduler.process_dict[0]
+        self.process_manager.pending_queue = queue.Queue()
+        self.process_manager.pending_queue_condition = threading.Condition()
+        self.process_manager.finished_queue = self.scheduler.finished_task_queue
+
+    def _distribute(self):
+        """
+        在线程中分发一个任务
+        :return: 分发线程
+        """
+        distribute_thread = threading.Thread(target=task_scheduler.TaskScheduler.distribute_task.__wrapped__,
+                                             args=(self.scheduler,), daemon=True)
+        distribute_thread.start()
+        return distribute_thread
+
+    def _dispatched(self):
+        tasks = []
+        while not self.process_manager.pending_queue.empty():
+            tasks.append(self.process_manager.pending_queue.get().id)
+        return tasks
+
+    @patch.object(task_scheduler.TaskConfig, "MAX_USER_TASK_NUMBER", 100)
+    def test_backlog_stays_in_fair_queue(self):
+        """子进程没有空闲线程时不分发，其他用户之后提交的任务先于已提交大量任务的用户的积压任务分发"""
+        for index in range(50):
+            self.scheduler.add_task(create_task(f"a{index}", user_id=1))
+        for _ in range(2):
+            self._distribute().join(5)
+        self.assertEqual(self._dispatched(), ["a0", "a1"])
+
+        self.scheduler.add_task(create_task("b0", user_id=2))
+        distribute_thread = self._distribute()
+        distribute_thread.join(0.1)
+        self.assertTrue(distribute_thread.is_alive())
+        self.assertEqual(self.scheduler.task_save_queue.qsize(), 49)
+
+        for _ in range(2):
+            self.process_manager.finish_task(1)
+            task_scheduler.TaskScheduler.watch_finished_task.__wrapped__(self.scheduler)
+            distribute_thread.join(5)
+            self.assertFalse(distribute_thread.is_alive())
+            distribute_thread = self._distribute()
+        self.assertEqual(self._dispatched(), ["a2", "b0"])
+        self.assertEqual(self.process_manager.get_load(), 2)
+        self.assertEqual(self.scheduler.task_save_queue.qsize(), 47)
+        self.assertEqual(self.scheduler.user_task_count, {1: 48, 2: 1})
+        # 结束最后一个等待空闲线程的分发线程
+        self.process_manager.finish_task(1)
+        task_scheduler.TaskScheduler.watch_finished_task.__wrapped__(self.scheduler)
+        distribute_thread.join(5)
+
+
+class SelectProcessTestCase(unittest.TestCase):
+
+    def test_select_least_loaded_process(self):
+        """选择已分发任务数占线程数比例最低的子进程"""
+        scheduler = create_scheduler([2, 1, 3])
+        self.assertEqual(scheduler.select_process(), 1)
+
+    def test_rotate_between_processes_with_same_load(self):
+        """负载相同时轮流选择，不总是分发给编号最小的子进程"""
+        scheduler = create_scheduler([0, 0, 0])
+        self.assertEqual([scheduler.select_process() for _ in range(4)], [0, 1, 2, 0])
+
+    def test_rotate_skips_busier_process(self):
+        """轮询时跳过负载更高的子进程"""
+        scheduler = create_scheduler([0, 3, 0])
+        self.assertEqual([scheduler.select_process() for _ in range(3)], [0, 2, 0])
+
+    def test_load_relative_to_thread_number(self):
+        """按已分发任务数占线程数的比例比较负载"""
+        scheduler = create_scheduler([2, 1])
+        scheduler.process_dict[0].thread_pool_number = 8
+        self.assertEqual(scheduler.select_process(), 0)
+
+
+class CheckTaskTimeoutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.thread_obj = task_scheduler.ThreadManager(None, None, None, None, dict(), threading.Condition())
+        connections_patcher = patch.object(task_scheduler, "connections")
+        connections_patcher.start()
+        self.addCleanup(connections_patcher.stop)
+        service_patcher = patch.object(task_scheduler, "service")
+        self.service = service_patcher.start()
+        self.addCleanup(service_patcher.stop)
+
+    def _start_task(self, task_id):
+        task_manager = task_scheduler.TaskManager(SimpleNamespace(id=task_id, node={"id": task_id}), None)
+        self.thread_obj.running_tasks[task_id] = task_manager
+        return task_manager
+
+    def _expire(self, task_manager):
+        """任务线程结束后开始计时，并将截止时间提前到当前时间之前"""
+        with patch.object(task_scheduler.TaskConfig, "THREAD_TIMEOUT", -1):
+            task_scheduler.start_task_timer(self.thread_obj, task_manager)
+
+    def test_timeout_task_without_complete_message(self):
+        """任务线程结束后超时仍未收到完成消息时，将任务置为任务异常"""
+        self._expire(self._start_task("node1"))
+
+        task_scheduler.check_task_timeout(self.thread_obj)
+
+        self.assertEqual(self.thread_obj.running_tasks, {})
+        self.assertEqual(self.thread_obj.timeout_heap, [])
+        self.service.generate_process_timeout_message.assert_called_once_with({"id": "node1"})
+        self.service.schedule_model_service.assert_called_once_with(
+            self.service.generate_process_timeout_message.return_value)
+
+    def test_ignore_stale_timers(self):
+        """已完成的任务以及同一id的新任务，忽略过期的定时器"""
+        self._expire(self._start_task("completed"))
+        self.thread_obj.running_tasks.pop("completed")
+        self._expire(self._start_task("restarted"))
+        restarted = self._start_task("restarted")
+
+        task_scheduler.check_task_timeout(self.thread_obj)
+
+        self.assertEqual(self.thread_obj.running_tasks, {"restarted": restarted})
+        self.assertEqual(self.thread_obj.timeout_heap, [])
+        self.service.schedule_model_service.assert_not_called()
+
+    def test_timer_not_started_for_finished_task(self):
+        """任务已经完成或者被新任务替换时，任务线程结束后不开始计时"""
+        task_manager = self._start_task("node1")
+        self._start_task("node1")
+
+        task_scheduler.start_task_timer(self.thread_obj, task_manager)
+
+        self.assertEqual(self.thread_obj.timeout_heap, [])
+
+    def test_wait_until_earliest_deadline(self):
+        """最早的定时器还未到期时，等待到期后再检查"""
+        task_scheduler.start_task_timer(self.thread_obj, self._start_task("node1"))
+        self.thread_obj.running_task_condition = MagicMock()
+
+        task_scheduler.check_task_timeout(self.thread_obj)
+
+        wait_time = self.thread_obj.running_task_condition.wait.call_args.args[0]
+        self.assertTrue(0 < wait_time <= task_scheduler.TaskConfig.THREAD_TIMEOUT)
+        self.assertIn("node1", self.thread_obj.running_tasks)
+        self.assertEqual(len(self.thread_obj.timeout_heap), 1)
+        self.assertLess(time.monotonic(), self.thread_obj.timeout_heap[0][0])
+
+
+class UpdateTaskTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.thread_obj = task_scheduler.ThreadManager(None, queue.Queue(), None, None, dict(), threading.Condition())
+        for name in ("connections", "RecordTime"):
+            patcher = patch.object(task_scheduler, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        service_patcher = patch.object(task_scheduler, "service")
+        self.service = service_patcher.start()
+        self.addCleanup(service_patcher.stop)
+        interval_patcher = patch.object(task_scheduler.TaskScheduler, "STATUS_FLUSH_INTERVAL", 0.05)
+        interval_patcher.start()
+        self.addCleanup(interval_patcher.stop)
+
+    def _put_message(self, node_id, is_completed):
+        self.thread_obj.running_tasks[node_id] = MagicMock()
+        self.thread_obj.message_queue.put({"id": node_id, "current_step": "install", "is_completed": is_completed})
+
+    def test_complete_tasks_when_batch_write_failed(self):
+        """批量写入失败时逐条重新写入，并且仍然处理任务完成的消息"""
+        self.service.schedule_model_service_batch.side_effect = RuntimeError("database is locked")
+        self.service.schedule_model_service.side_effect = [RuntimeError("database is locked"), None]
+        self._put_message("node1", task_scheduler.TaskStatus.SUCCESS)
+        self._put_message("node2", task_scheduler.TaskStatus.RUNNING)
+
+        with self.assertLogs(task_scheduler.task_logger, level="ERROR") as log:
+            task_scheduler.update_task.__wrapped__(self.thread_obj)
+
+        self.assertEqual([call.args[0]["id"] for call in self.service.schedule_model_service.call_args_list],
+                         ["node1", "node2"])
+        self.assertIn("node[node1]", log.output[-1])
+        self.service.update_task_completed.assert_called_once()
+        self.assertEqual(list(self.thread_obj.running_tasks), ["node2"])
+
+    def test_write_messages_in_batch(self):
+        """批量写入成功时不再逐条写入"""
+        self._put_message("node1", task_scheduler.TaskStatus.SUCCESS)
+
+        task_scheduler.update_task.__wrapped__(self.thread_obj)
+
+        self.service.schedule_model_service_batch.assert_called_once_with([{"id": "node1", "current_step": "install"}])
+        self.service.schedule_model_service.assert_not_called()
+        self.assertEqual(self.thread_obj.running_tasks, {})
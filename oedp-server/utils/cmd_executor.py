@@ -12,6 +12,7 @@
 # Create: 2025-02-05
 # ======================================================================================================================
 
+import asyncio
 import os
 import signal
 import subprocess
@@ -47,3 +48,46 @@ class CommandExecutor:
             os.killpg(self.process.pid, signal.SIGTERM)
             return "", "", ERROR_CODE
         return stdout, stderr, self.process.returncode
+
+
+class AsyncCommandExecutor:
+    """
+    CommandExecutor 的 asyncio 版本，在事件循环中等待子进程结束，不占用线程，供异步任务使用
+    """
+
+    def __init__(self, cmd, encoding=sys.getdefaultencoding(), timeout=300):
+        self.cmd = cmd
+        self.encoding = encoding
+        self.timeout = timeout
+        self.process = None
+
+    async def run(self):
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, start_new_session=True
+            )
+        except OSError:
+            return "", "", ERROR_CODE
+        try:
+            stdout, stderr = await asyncio.wait_for(self.process.communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # 终止超时进程
+            await self._kill()
+            return "", "", TIMEOUT_CODE
+        except asyncio.CancelledError:
+            # 任务被取消时终止子进程
+            await self._kill()
+            raise
+        except Exception:
+            # 终止异常进程
+            await self._kill()
+            return "", "", ERROR_CODE
+        return stdout.decode(self.encoding, errors="replace"), stderr.decode(self.encoding, errors="replace"), \
+            self.process.returncode
+
+    async def _kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            return
+        await self.process.wait()
@@ -12,6 +12,9 @@
 # Create: 2025-02-13
 # ======================================================================================================================
 
+import asyncio
+import functools
+
 import pexpect
 
 from constants.configs.ssh_conf import SSHConfig
@@ -143,22 +146,83 @@ class SSHConnector(BaseConnector):
             self.connection.setwinsize(window_height, window_width)
 
     def execute_cmd(self, cmd, timeout=SSHConfig.EXECUTE_CMD_TIMEOUT):
+        expect_prompt = self._send_cmd(cmd)
+        try:
+            self.connection.expect(expect_prompt, timeout=timeout)
+        except (pexpect.TIMEOUT, pexpect.EOF) as ex:
+            self._raise_expect_error(cmd, ex)
+        return self._parse_cmd_result()
+
+    @classmethod
+    async def create_async(cls, **kwargs):
+        """
+        供异步任务使用，在默认线程池中建立 SSH 连接，避免登录过程阻塞事件循环
+        :return: SSHConnector 对象
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(cls, **kwargs))
+
+    async def execute_cmd_async(self, cmd, timeout=SSHConfig.EXECUTE_CMD_TIMEOUT):
+        """
+        供异步任务使用，在事件循环中等待命令执行结果，不占用线程
+        """
+        # pexpect 发送前的等待使用 time.sleep，改为在事件循环中等待
+        delay_before_send = self.connection.delaybeforesend
+        if delay_before_send:
+            await asyncio.sleep(delay_before_send)
+        self.connection.delaybeforesend = None
+        try:
+            expect_prompt = self._send_cmd(cmd)
+        finally:
+            self.connection.delaybeforesend = delay_before_send
+        try:
+            await self._expect_async(expect_prompt, timeout)
+        except (pexpect.TIMEOUT, pexpect.EOF) as ex:
+            self._raise_expect_error(cmd, ex)
+        return self._parse_cmd_result()
+
+    async def _expect_async(self, pattern, timeout):
+        """
+        子进程输出可读时再进行非阻塞匹配，不依赖 pexpect 自身的 async_ 接口（旧版本在新版 Python 中不可用）
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        fd = self.connection.child_fd
+        while True:
+            try:
+                return self.connection.expect(pattern, timeout=0)
+            except pexpect.TIMEOUT:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise
+            readable = loop.create_future()
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+            try:
+                await asyncio.wait_for(readable, remaining)
+            except asyncio.TimeoutError as ex:
+                raise pexpect.TIMEOUT(f"Timeout exceeded after {timeout}s") from ex
+            finally:
+                loop.remove_reader(fd)
+
+    def _send_cmd(self, cmd):
         run_logger.info(f"==== Start to execute command [{cmd}] ====")
 
         cmd_ = f'res=$({cmd}); echo "$res{self.DELIMITER}$?"'
         expect_prompt = f'\r\n.*{self.DELIMITER}[0-9]+'
         self._set_window_size(cmd_)
         self.connection.sendline(cmd_)
-        try:
-            self.connection.expect(expect_prompt, timeout=timeout)
-        except pexpect.TIMEOUT:
+        return expect_prompt
+
+    @staticmethod
+    def _raise_expect_error(cmd, ex):
+        if isinstance(ex, pexpect.TIMEOUT):
             msg = f"Command [{cmd}] timed out"
-            run_logger.error(msg)
-            raise SSHCmdTimeoutError(msg)
-        except pexpect.EOF:
+        else:
             msg = "SSH subprocess exited abnormally during command execution"
-            run_logger.error(msg)
-            raise SSHCmdTimeoutError(msg)
+        run_logger.error(msg)
+        raise SSHCmdTimeoutError(msg)
+
+    def _parse_cmd_result(self):
         res = str(self.connection.after).split(self.DELIMITER)
         return_code = res[-1]
         std = res[-2].strip('$?"').strip()
@@ -25,6 +25,15 @@ openEuler deploy tool
 %install
 mkdir -p -m 700 %{buildroot}%{_var}/oedp/log
 mkdir -p -m 700 %{buildroot}%{_var}/oedp/plugin
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/plugin/store
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/plugin/partial
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/report
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/cache
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/cache/facts
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/cache/digest
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/cache/inventory
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/journal
+mkdir -p -m 700 %{buildroot}%{_var}/oedp/ssh
 mkdir -p -m 700 %{buildroot}%{_var}/oedp/python
 mkdir -p -m 700 %{buildroot}%{_var}/oedp/python/venv
 mkdir -p -m 700 %{buildroot}%{_usr}/lib/oedp
@@ -53,6 +62,15 @@ fi
 %attr(0555,root,root) %dir %{_var}/oedp
 %attr(0777,root,root) %dir %{_var}/oedp/log
 %attr(0777,root,root) %dir %{_var}/oedp/plugin
+%attr(0777,root,root) %dir %{_var}/oedp/plugin/store
+%attr(0777,root,root) %dir %{_var}/oedp/plugin/partial
+%attr(0777,root,root) %dir %{_var}/oedp/report
+%attr(0777,root,root) %dir %{_var}/oedp/cache
+%attr(0777,root,root) %dir %{_var}/oedp/cache/facts
+%attr(0777,root,root) %dir %{_var}/oedp/cache/digest
+%attr(0777,root,root) %dir %{_var}/oedp/cache/inventory
+%attr(0777,root,root) %dir %{_var}/oedp/journal
+%attr(0777,root,root) %dir %{_var}/oedp/ssh
 %attr(0555,root,root) %dir %{_var}/oedp/python
 %attr(0555,root,root) %dir %{_var}/oedp/python/venv
 %attr(0555,root,root) %dir %{_usr}/lib/oedp
@@ -63,6 +81,7 @@ fi
 %attr(0666,root,root) %{_var}/oedp/log/oedp.log
 %attr(0555,root,root) %{_usr}/lib/oedp/src/*
 %attr(0666,root,root) %config(noreplace) %{_sysconfdir}/oedp/config/log.conf
+%attr(0666,root,root) %config(noreplace) %{_sysconfdir}/oedp/config/cache.conf
 %attr(0666,root,root) %config(noreplace) %{_sysconfdir}/oedp/config/repo/repo.conf
 %attr(0644,root,root) %{_usr}/share/applications/*
 %attr(0555,root,root) %{_bindir}/oedp
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-18
+# ======================================================================================================================
+
+import time
+
+from prettytable import PrettyTable
+
+from src.utils.fact_cache import FactCache
+from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.plugin_store import PluginStore, format_size, parse_size
+
+
+class CacheCmd:
+    """缓存管理命令处理器"""
+
+    def __init__(self, args):
+        """初始化CacheCmd
+
+        Args:
+            args: 命令行参数对象
+        """
+        self.args = args
+        self.log = LoggerGenerator().get_logger('cache_cmd')
+
+    def run(self) -> bool:
+        """执行cache子命令
+
+        Returns:
+            bool: 命令执行结果，成功返回True，失败返回False
+        """
+        command_map = {
+            'facts': self.run_facts,
+            'list': self.run_list,
+            'prune': self.run_prune,
+            'stats': self.run_stats
+        }
+        handler = command_map.get(self.args.subcommand)
+        return handler() if handler else False
+
+    def run_facts(self) -> bool:
+        """列出或清除项目的ansible facts缓存
+
+        Returns:
+            bool: 执行结果
+        """
+        fact_cache = FactCache(self.args.project)
+        if self.args.clear:
+            try:
+                count = fact_cache.clear()
+            except OSError as e:
+                self.log.error(f"failed to clear fact cache: {str(e)}")
+                return False
+            self.log.info(f"cleared cached facts of {count} host(s)")
+            return True
+
+        table = PrettyTable()
+        table.field_names = ["host", "updated", "expired"]
+        table.align["host"] = "l"
+        for host, mtime, expired in fact_cache.list_hosts():
+            updated = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
+            table.add_row([host, updated, str(expired).lower()])
+        self.log.info("\n" + str(table))
+        return True
+
+    def run_list(self) -> bool:
+        """列出缓存的插件，按最近使用时间从新到旧排列
+
+        Returns:
+            bool: 执行结果
+        """
+        try:
+            entries = PluginStore().list()
+        except OSError as e:
+            self.log.error(f"failed to read plugin cache: {str(e)}")
+            return False
+
+        table = PrettyTable()
+        table.field_names = ["name", "sha256", "size", "last used"]
+        table.align["name"] = "l"
+        table.align["size"] = "r"
+        for entry in entries:
+            last_used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.get('last_used', 0)))
+            table.add_row([entry.get('name', ''), entry['sha256'][:12], format_size(entry.get('size', 0)), last_used])
+        self.log.info("\n" + str(table))
+        return True
+
+    def run_prune(self) -> bool:
+        """按最近使用时间淘汰缓存的插件
+
+        Returns:
+            bool: 执行结果
+        """
+        max_size = None
+        if self.args.all:
+            max_size = 0
+        elif self.args.max_size is not None:
+            try:
+                max_size = parse_size(self.args.max_size)
+            except ValueError as e:
+                self.log.error(str(e))
+                return False
+        try:
+            count, freed = PluginStore().prune(max_size)
+        except OSError as e:
+            self.log.error(f"failed to prune plugin cache: {str(e)}")
+            return False
+        self.log.info(f"pruned {count} plugin(s), freed {format_size(freed)}")
+        return True
+
+    def run_stats(self) -> bool:
+        """统计缓存的插件数量与占用空间
+
+        Returns:
+            bool: 执行结果
+        """
+        try:
+            stats = PluginStore().stats()
+        except OSError as e:
+            self.log.error(f"failed to read plugin cache: {str(e)}")
+            return False
+
+        quota = format_size(stats['quota']) if stats['quota'] > 0 else 'unlimited'
+        usage = f"{stats['size'] * 100 / stats['quota']:.1f}%" if stats['quota'] > 0 else '-'
+        table = PrettyTable()
+        table.field_names = ["plugins", "size", "quota", "usage", "cached facts"]
+        table.add_row([stats['count'], format_size(stats['size']), quota, usage, FactCache.count_hosts()])
+        self.log.info("\n" + str(table))
+        return True
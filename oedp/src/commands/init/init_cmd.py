@@ -12,18 +12,15 @@
 # ======================================================================================================================
 
 import os
-import glob
-import yaml
-import hashlib
 from typing import List, Dict, Optional
-from datetime import datetime
 
-from src.constants.paths import PLUGIN_DIR, REPO_CACHE_DIR
+from src.commands.init.plugin_downloader import PluginDownloader, get_file_digest
+from src.constants.paths import PLUGIN_DIR
+from src.utils.archive_extractor import ArchiveExtractor
 from src.utils.command.command_executor import CommandExecutor
 from src.utils.log.logger_generator import LoggerGenerator
-
-DOWNLOAD_TIMEOUT = 600
-DOWNLOAD_RETRY_TIME = 3
+from src.utils.plugin_index import PluginIndex
+from src.utils.plugin_store import PluginStore
 
 """
 所有路径都需要变成绝对路径后再进行实际操作
@@ -33,18 +30,20 @@ DOWNLOAD_RETRY_TIME = 3
 """
 
 class InitCmd:
-    def __init__(self, plugin: str, project: str, parent_dir: str = "", force: bool = False):
+    def __init__(self, plugin: str, project: str, parent_dir: str = "", force: bool = False, segments: int = 1):
         """
         在指定的目录下初始化一个项目。
 
         :param plugin: 插件名称，也可以是插件压缩包路径、插件下载地址
         :param project: 项目初始化路径
         :param force: 是否强制初始化
+        :param segments: 从多个插件下载地址并发分段下载的分段数量，为1时不分段
         """
         self.plugin = plugin
         self.project = project
         self.parent_dir = parent_dir
         self.force = force
+        self.segments = segments
         self.log = LoggerGenerator().get_logger('init_cmd')
 
     def run(self):
@@ -75,8 +74,9 @@ class InitCmd:
                     # 5. 处理下载URL
                     filename = os.path.basename(self.plugin)
                     cache_path = os.path.join(PLUGIN_DIR, filename)
-                    if not self._download_with_retry(self.plugin, cache_path, "plugin"):
+                    if not PluginDownloader([self.plugin]).download(cache_path):
                         return False
+                    PluginStore().add(cache_path, get_file_digest(cache_path), filename)
                     return self._extract_archive(cache_path, target_path)
                 else:
                     # 4. 处理本地压缩包
@@ -134,13 +134,9 @@ class InitCmd:
         return True
 
     def _extract_archive(self, archive_path: str, target_path: str) -> bool:
-        """解压压缩包到目标路径"""
+        """解压压缩包到目标路径，支持 gzip、zstd 等压缩格式，拒绝路径穿越等不安全的成员"""
         try:
-            cmd = ['tar', '-xzf', archive_path, '-C', target_path, '--strip-components=1']
-            _, stderr, return_code = CommandExecutor.run_single_cmd(cmd)
-            if return_code != 0:
-                self.log.error(f"failed to extract archive: {stderr}")
-                return False
+            ArchiveExtractor(archive_path, target_path).extract()
             self.log.info(f"successfully extracted archive to {target_path}")
             return True
         except Exception as e:
@@ -156,27 +152,33 @@ class InitCmd:
                 self.log.error(f"plugin {self.plugin} not found in any repo")
                 return False
                 
-            # 检查本地缓存
+            # 检查按sha256保存的插件缓存，缓存目录所有用户均可写入，命中时对实际解压的文件再次校验
             filename = os.path.basename(plugin_info['urls'][0])
             cache_path = os.path.join(PLUGIN_DIR, filename)
-            
-            if os.path.exists(cache_path) and self._verify_checksum(cache_path, plugin_info['sha256sum']):
+            sha256sum = plugin_info['sha256sum']
+            store = PluginStore()
+            store_path = store.get(sha256sum)
+            if store_path:
+                if store.materialize(sha256sum, cache_path):
+                    store_path = cache_path
+                if self._verify_checksum(store_path, sha256sum):
+                    self.log.info(f"using cached plugin file {filename} (sha256 {sha256sum[:12]})")
+                    return self._extract_archive(store_path, target_path)
+                self.log.warning(f"cached plugin file {filename} does not match sha256 {sha256sum[:12]}, "
+                                 f"downloading it again")
+                store.discard(sha256sum)
+
+            # 兼容仅按文件名缓存的插件
+            if os.path.exists(cache_path) and self._verify_checksum(cache_path, sha256sum):
                 self.log.info(f"using cached plugin file {filename} (checksum verified)")
+                store.add(cache_path, sha256sum, filename)
                 return self._extract_archive(cache_path, target_path)
                 
-            # 尝试从URL下载
-            for url in plugin_info['urls']:
-                filename = os.path.basename(url)
-                cache_path = os.path.join(PLUGIN_DIR, filename)
-                
-                if self._download_with_retry(url, cache_path, "plugin"):
-                    if not self._verify_checksum(cache_path, plugin_info['sha256sum']):
-                        self.log.error(f"checksum verification failed for {filename}")
-                        continue
-                        
-                    return self._extract_archive(cache_path, target_path)
-                else:
-                    self.log.warning(f"failed to download from {url}")
+            # 从响应最快的URL下载，下载时同时校验
+            downloader = PluginDownloader(plugin_info['urls'], sha256sum, plugin_info.get('size', 0), self.segments)
+            if downloader.download(cache_path):
+                store.add(cache_path, sha256sum, filename)
+                return self._extract_archive(cache_path, target_path)
                         
             self.log.error(f"failed to download plugin {self.plugin} from all available urls")
             return False
@@ -185,95 +187,17 @@ class InitCmd:
             return False
 
     def _find_plugin_in_repos(self) -> Optional[Dict]:
-        """在仓库中查找插件"""
-        # 遍历所有索引文件
-        for index_file in glob.glob(os.path.join(REPO_CACHE_DIR, '*.yaml')):
-            try:
-                with open(index_file, 'r') as f:
-                    data = yaml.safe_load(f)
-                    
-                if 'plugins' not in data:
-                    continue
-                    
-                # 查找匹配的插件
-                for plugin_entry in data['plugins']:
-                    if not isinstance(plugin_entry, dict):
-                        continue
-                        
-                    for plugin_name, versions in plugin_entry.items():
-                        if plugin_name == self.plugin and versions:
-                            # 找到最新版本
-                            latest_version = max(
-                                versions,
-                                key=lambda v: (v['version'], datetime.strptime(v['updated'], "%Y-%m-%dT%H:%M:%S%z") if v.get('updated') else '')
-                            )
-                            return latest_version
-            except Exception as e:
-                self.log.warning(f"failed to parse index file {index_file}: {str(e)}")
-                continue
-                
-        return None
+        """在仓库中查找插件，通过插件查询索引获取最新版本"""
+        try:
+            return PluginIndex().find_latest(self.plugin)
+        except Exception as e:
+            self.log.warning(f"failed to query plugin index: {str(e)}")
+            return None
 
     def _verify_checksum(self, file_path: str, expected_checksum: str) -> bool:
-        """验证文件sha256校验和"""
+        """验证文件sha256校验和，文件未变化时使用下载或上次校验时记录的sha256"""
         try:
-            sha256_hash = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            actual_checksum = sha256_hash.hexdigest()
-            
-            if actual_checksum == expected_checksum:
-                return True
-            else:
-                return False
+            return get_file_digest(file_path) == (expected_checksum or '').lower()
         except Exception as e:
             self.log.error(f"failed to verify checksum: {str(e)}")
             return False
-
-    def _download_with_retry(self, url: str, output_file: str, repo_name: str, max_retries: int = DOWNLOAD_RETRY_TIME, timeout: int = DOWNLOAD_TIMEOUT) -> bool:
-        """带重试机制的下载方法
-        
-        Args:
-            url: 下载URL
-            output_file: 输出文件路径
-            repo_name: 仓库名称
-            max_retries: 最大重试次数
-            timeout: 下载超时时间(秒)
-            
-        Returns:
-            bool: 下载是否成功
-        """
-        # 下载前先删除，否则可能出现因权限不足导致非root用户下载失败
-        if os.path.exists(output_file):
-            try:
-                os.remove(output_file)
-                self.log.debug(f"removed existing file before download: {output_file}")
-            except Exception as e:
-                self.log.warning(f"failed to remove existing file {output_file}: {str(e)}")
-        
-        self.log.info(f"starting download from {url}")
-        cmd = [
-            'curl', '-fL',
-            '--max-time', str(timeout),
-            '--connect-timeout', '3',
-            '-o', output_file,
-            url
-        ]
-        
-        for attempt in range(max_retries):
-            _, stderr, return_code = CommandExecutor.run_single_cmd(cmd)
-            
-            if return_code == 0:
-                try:
-                    self.log.info(f"successfully downloaded to {output_file}")
-                    return True
-                except Exception as e:
-                    self.log.error(f"failed to set permissions for {output_file}: {str(e)}")
-                    return False
-            
-            if attempt < max_retries - 1:
-                self.log.warning(f"retrying download for repo {repo_name} (attempt {attempt + 1}/{max_retries})")
-                
-        self.log.error(f"failed to download index for repo {repo_name} after {max_retries} attempts:\n{stderr}")
-        return False
\ No newline at end of file
@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-28
+# ======================================================================================================================
+
+import errno
+import glob
+import hashlib
+import json
+import os
+import stat
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, List, Optional, Tuple
+
+from src.constants.const import DOWNLOAD_PROBE_TIMEOUT, DOWNLOAD_RETRY_TIME, DOWNLOAD_SEGMENT_MIN_SIZE, \
+    DOWNLOAD_TIMEOUT
+from src.constants.paths import DIGEST_CACHE_DIR, PLUGIN_PARTIAL_DIR
+from src.utils.command.command_executor import CommandExecutor
+from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.tools import get_private_dir, is_private, write_private_file
+
+# 流式下载时每次读取的字节数
+CHUNK_SIZE = 1024 * 1024
+# curl 续传时服务端不支持按范围下载的错误码
+CURL_RANGE_ERROR = 33
+# curl 超时的错误码
+CURL_TIMEOUT_ERROR = 28
+# curl 响应超过 --max-filesize 的错误码
+CURL_FILESIZE_ERROR = 63
+
+
+def get_digest_record_file(path: str) -> str:
+    """
+    获取插件文件的 sha256 记录文件路径。
+
+    插件缓存目录所有用户都可以写入，记录保存在当前用户独立的目录中，以插件文件绝对路径的 sha256 命名。
+
+    :param path: 插件文件路径
+    :return: 记录文件路径
+    """
+    path_digest = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(DIGEST_CACHE_DIR, str(os.getuid()), f'{path_digest}.json')
+
+
+def get_part_file(output_file: str) -> str:
+    """
+    获取保存未下载完成内容的 .part 文件路径。
+
+    插件缓存目录所有用户都可以写入，.part 文件保存在当前用户独立的目录中，以输出文件绝对路径的 sha256 命名，
+    其他用户无法预先创建同名文件或符号链接。
+
+    :param output_file: 输出文件路径
+    :return: .part 文件路径
+    """
+    path_digest = hashlib.sha256(os.path.abspath(output_file).encode('utf-8')).hexdigest()
+    return os.path.join(get_private_dir(PLUGIN_PARTIAL_DIR), f'{path_digest}.part')
+
+
+def get_part_record_file(part_file: str) -> str:
+    """
+    获取未下载完成的 .part 文件的记录文件路径，记录下载时的 sha256 与大小。
+
+    :param part_file: .part 文件路径
+    :return: 记录文件路径
+    """
+    return f'{part_file}.json'
+
+
+def _is_private(stat_result: os.stat_result, writable_only: bool = False) -> bool:
+    """
+    检查文件属于当前用户，且其他用户无法修改（writable_only 为 False 时还要求其他用户无法读取）。
+    """
+    if stat.S_ISLNK(stat_result.st_mode) or stat_result.st_uid != os.getuid():
+        return False
+    mask = stat.S_IWGRP | stat.S_IWOTH if writable_only else stat.S_IRWXG | stat.S_IRWXO
+    return stat_result.st_mode & mask == 0
+
+
+def _open_part_file(part_file: str) -> BinaryIO:
+    """
+    以追加方式打开保存下载内容的文件，不存在时创建，不跟随符号链接。
+
+    :param part_file: 保存下载内容的文件
+    :return: 可读写的文件对象
+    :raises OSError: 文件是符号链接、不属于当前用户或者其他用户可以访问
+    """
+    fd = os.open(part_file, os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_NOFOLLOW, stat.S_IRUSR | stat.S_IWUSR)
+    if not _is_private(os.fstat(fd)):
+        os.close(fd)
+        raise PermissionError(errno.EACCES, 'file is not private to current user', part_file)
+    return os.fdopen(fd, 'a+b')
+
+
+def save_digest_record(path: str, digest: str):
+    """
+    记录插件文件的大小、修改时间以及 sha256，文件未变化时无需重新计算。
+
+    仅记录属于当前用户且其他用户无法修改的插件文件。
+
+    :param path: 插件文件路径
+    :param digest: 插件文件的 sha256
+    """
+    stat_result = os.stat(path)
+    if not _is_private(stat_result, writable_only=True):
+        return
+    record = {
+        'path': os.path.abspath(path),
+        'dev': stat_result.st_dev,
+        'ino': stat_result.st_ino,
+        'size': stat_result.st_size,
+        'mtime_ns': stat_result.st_mtime_ns,
+        'sha256': digest
+    }
+    record_file = get_digest_record_file(path)
+    temp_file = f'{record_file}.{os.getpid()}.tmp'
+    try:
+        for record_dir in (os.path.dirname(os.path.dirname(record_file)), os.path.dirname(record_file)):
+            os.makedirs(record_dir, mode=stat.S_IRWXU, exist_ok=True)
+        if not _is_private(os.lstat(os.path.dirname(record_file))):
+            return
+        with open(temp_file, 'w') as f:
+            json.dump(record, f)
+        os.replace(temp_file, record_file)
+    except OSError:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def _load_digest_record(path: str, stat_result: os.stat_result) -> Optional[str]:
+    """
+    读取插件文件的 sha256 记录。插件文件与记录都属于当前用户、其他用户无法修改，且文件未变化时记录才可信。
+
+    :return: sha256，记录不可信时返回None
+    """
+    if not _is_private(stat_result, writable_only=True):
+        return None
+    record_file = get_digest_record_file(path)
+    try:
+        if not _is_private(os.lstat(os.path.dirname(record_file))) or not _is_private(os.lstat(record_file), True):
+            return None
+        with open(record_file, 'r') as f:
+            record = json.load(f)
+        current = {
+            'path': os.path.abspath(path),
+            'dev': stat_result.st_dev,
+            'ino': stat_result.st_ino,
+            'size': stat_result.st_size,
+            'mtime_ns': stat_result.st_mtime_ns
+        }
+        if any(record.get(key) != value for key, value in current.items()):
+            return None
+    except (OSError, ValueError, AttributeError):
+        return None
+    return record.get('sha256') or None
+
+
+def get_file_digest(path: str) -> str:
+    """
+    获取插件文件的 sha256。记录可信且文件大小、修改时间与记录一致时直接使用记录，否则重新计算并更新记录。
+
+    :param path: 插件文件路径
+    :return: sha256
+    """
+    stat_result = os.stat(path)
+    digest = _load_digest_record(path, stat_result)
+    if digest:
+        return digest
+    sha256_hash = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha256_hash.update(chunk)
+    digest = sha256_hash.hexdigest()
+    save_digest_record(path, digest)
+    return digest
+
+
+class PluginDownloader:
+    def __init__(self, urls: List[str], sha256sum: str = '', size: int = 0, segments: int = 1,
+                 max_retries: int = DOWNLOAD_RETRY_TIME, timeout: int = DOWNLOAD_TIMEOUT):
+        """
+        从多个镜像地址下载插件。
+
+        下载前并发探测所有地址，按首字节响应时间从快到慢依次尝试；下载过程中同时计算 sha256，无需再次读取文件校验。
+        指定分段数量且插件大小已知时，从多个支持断点续传的地址并发分段下载。
+
+        :param urls: 插件下载地址
+        :param sha256sum: 插件文件的 sha256，为空时不校验
+        :param size: 插件文件大小，单位 Bytes，为0时表示未知
+        :param segments: 分段下载的分段数量，为1时不分段
+        :param max_retries: 每个地址的最大重试次数
+        :param timeout: 每次下载的超时时间（秒）
+        """
+        self.urls = list(urls)
+        self.sha256sum = (sha256sum or '').lower()
+        self.size = size if isinstance(size, int) and size > 0 else 0
+        self.segments = max(1, segments)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.log = LoggerGenerator().get_logger('plugin_downloader')
+
+    def download(self, output_file: str) -> bool:
+        """
+        下载插件到指定路径，校验失败的文件不会保留。
+
+        下载内容先写入当前用户私有目录中的 .part 文件，校验通过后才替换为输出文件；已知 sha256 时下载中断后保留
+        .part 文件，重试以及再次执行时从中断的位置继续下载。未知 sha256 时无法校验续传后的内容，每次都从头下载。
+
+        :param output_file: 输出文件路径
+        :return: 是否下载成功
+        """
+        mirrors = self.rank_mirrors()
+        if not mirrors:
+            self.log.error(f"no reachable download url among: {', '.join(self.urls)}")
+            return False
+
+        try:
+            part_file = get_part_file(output_file)
+        except OSError as e:
+            self.log.error(f"failed to prepare partial download directory: {str(e)}")
+            return False
+        self._prepare_part_file(part_file)
+        segments = self._get_segment_count()
+        range_mirrors = [url for url, supports_range in mirrors if supports_range]
+        if segments > 1 and range_mirrors and not os.path.exists(part_file):
+            digest = self._download_segments(range_mirrors, segments, part_file)
+            if digest is not None:
+                return self._commit(part_file, output_file, digest)
+            self.log.warning("segmented download failed, fall back to single stream download")
+
+        for url, _ in mirrors:
+            attempt = 0
+            while attempt < self.max_retries:
+                attempt += 1
+                if not self.sha256sum:
+                    self._remove_part_files(part_file)
+                resumed = os.path.exists(part_file) and os.path.getsize(part_file) > 0
+                self.log.info(f"{'resuming' if resumed else 'starting'} download from {url}")
+                digest = self._download_stream(url, part_file)
+                if digest is None:
+                    if attempt < self.max_retries:
+                        self.log.warning(f"retrying download from {url} (attempt {attempt}/{self.max_retries})")
+                    continue
+                if self._check_digest(digest, part_file):
+                    return self._commit(part_file, output_file, digest)
+                if not resumed:
+                    break
+                # 续传的内容可能来自其他版本的插件，校验失败后从头下载，不计入重试次数
+                self.log.warning(f"discarded partial download, restarting from {url}")
+                attempt -= 1
+            self.log.warning(f"failed to download from {url}")
+        return False
+
+    def _prepare_part_file(self, part_file: str):
+        """
+        检查上次中断的下载内容是否可以续传。
+
+        .part 文件旁的记录文件保存下载时的 sha256 与大小，只有与本次下载一致时才续传，否则删除已下载的内容，
+        避免将其他地址或其他版本的插件内容拼接到一起。未知 sha256，或者文件是符号链接、其他用户可以访问时不续传。
+
+        :param part_file: 保存下载内容的文件
+        """
+        record_file = get_part_record_file(part_file)
+        record = {'sha256': self.sha256sum, 'size': self.size}
+        if self.sha256sum:
+            try:
+                if is_private(record_file) and (not os.path.lexists(part_file) or is_private(part_file)):
+                    with open(record_file, 'r') as f:
+                        if json.load(f) == record:
+                            return
+            except (OSError, ValueError):
+                pass
+        self._remove_part_files(part_file)
+        if not self.sha256sum:
+            return
+        try:
+            write_private_file(record_file, json.dumps(record))
+        except OSError as e:
+            self.log.warning(f"failed to write {record_file}: {str(e)}")
+
+    @staticmethod
+    def _remove_part_files(part_file: str):
+        """
+        删除已下载的内容、分段以及记录文件。
+
+        :param part_file: 保存下载内容的文件
+        """
+        paths = [part_file, get_part_record_file(part_file)] + glob.glob(f'{glob.escape(part_file)}.seg*')
+        for path in paths:
+            if os.path.lexists(path):
+                os.remove(path)
+
+    def _commit(self, part_file: str, output_file: str, digest: str) -> bool:
+        """
+        将校验通过的 .part 文件替换为输出文件，并记录输出文件的 sha256。
+        替换而不是覆盖写入，避免非root用户因权限不足导致失败。.part 文件仅当前用户可以读写，替换前按 umask
+        恢复为普通文件的权限，其他用户同样可以使用缓存的插件。
+
+        :return: 是否替换成功
+        """
+        umask = os.umask(0)
+        os.umask(umask)
+        try:
+            os.chmod(part_file, 0o666 & ~umask)
+            os.replace(part_file, output_file)
+            save_digest_record(output_file, digest)
+            self._remove_part_files(part_file)
+        except OSError as e:
+            self.log.error(f"failed to move {part_file} to {output_file}: {str(e)}")
+            return False
+        self.log.info(f"successfully downloaded to {output_file}")
+        return True
+
+    def rank_mirrors(self) -> List[Tuple[str, bool]]:
+        """
+        并发探测所有下载地址，按首字节响应时间从快到慢排列，不可达的地址被排除。
+
+        :return: [(下载地址, 是否支持分段下载)]
+        """
+        if len(self.urls) == 1 and self.segments == 1:
+            return [(self.urls[0], False)]
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(self.urls)) as executor:
+            futures = {executor.submit(self._probe, url): url for url in self.urls}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        mirrors = []
+        for url in self.urls:
+            if results[url] is None:
+                self.log.warning(f"download url is not reachable: {url}")
+                continue
+            latency, supports_range = results[url]
+            self.log.debug(f"probed {url}: {latency * 1000:.0f}ms, range supported: {supports_range}")
+            mirrors.append((latency, url, supports_range))
+        if not mirrors:
+            self.log.warning("all download urls failed the probe, try them in the given order")
+            return [(url, False) for url in self.urls]
+        mirrors.sort(key=lambda mirror: mirror[0])
+        return [(url, supports_range) for _, url, supports_range in mirrors]
+
+    @staticmethod
+    def _probe(url: str) -> Optional[Tuple[float, bool]]:
+        """
+        请求下载地址的第一个字节，获取首字节响应时间以及是否支持按范围下载。
+
+        不支持按范围下载的服务端会返回 200 与完整文件，已收到响应后因文件过大或超时中止的视为可达，
+        只有连接失败或 HTTP 错误时视为不可达。
+
+        :param url: 下载地址
+        :return: (首字节响应时间, 是否支持按范围下载)，不可达时返回None
+        """
+        cmd = [
+            'curl', '-sSfL',
+            '--max-time', str(DOWNLOAD_PROBE_TIMEOUT),
+            '--connect-timeout', '3',
+            '-r', '0-0',
+            '--max-filesize', '1',
+            '-o', os.devnull,
+            '-w', '%{time_starttransfer} %{http_code}',
+            url
+        ]
+        stdout, _, return_code = CommandExecutor.run_single_cmd(cmd, timeout=DOWNLOAD_PROBE_TIMEOUT + 5)
+        try:
+            latency, http_code = stdout.split()
+            latency = float(latency)
+        except ValueError:
+            return None
+        if url.startswith('file://'):
+            return (latency, True) if return_code == 0 else None
+        if http_code not in ('200', '206'):
+            return None
+        if return_code != 0 and not (return_code in (CURL_TIMEOUT_ERROR, CURL_FILESIZE_ERROR) and latency > 0):
+            return None
+        return latency, http_code == '206'
+
+    def _get_segment_count(self) -> int:
+        if self.segments <= 1 or not self.size:
+            return 1
+        return max(1, min(self.segments, self.size // DOWNLOAD_SEGMENT_MIN_SIZE))
+
+    def _download_stream(self, url: str, part_file: str, byte_range: Tuple[int, int] = None) -> Optional[str]:
+        """
+        通过 curl 流式下载并追加到 part_file，已下载的部分不再重复下载。
+
+        下载整个文件时同时计算 sha256；下载指定字节范围时不计算，由合并分段时计算。
+
+        :param url: 下载地址
+        :param part_file: 保存下载内容的文件
+        :param byte_range: 下载的字节范围 (起始位置, 结束位置)，为None时下载整个文件
+        :return: 文件内容的 sha256（下载字节范围时为空字符串），下载失败时返回None
+        """
+        try:
+            part = _open_part_file(part_file)
+        except OSError as e:
+            self.log.error(f"failed to open {part_file}: {str(e)}")
+            return None
+        with part:
+            offset = os.fstat(part.fileno()).st_size
+            expected = self.size if byte_range is None else byte_range[1] - byte_range[0] + 1
+            if expected and offset > expected:
+                part.truncate(0)
+                offset = 0
+
+            sha256_hash = hashlib.sha256()
+            if byte_range is None and offset:
+                # 续传时先计算已下载部分的 sha256，读取本地文件远快于重新下载
+                part.seek(0)
+                for chunk in iter(lambda: part.read(CHUNK_SIZE), b''):
+                    sha256_hash.update(chunk)
+            if expected and offset == expected:
+                return sha256_hash.hexdigest() if byte_range is None else ''
+
+            cmd = ['curl', '-sSfL', '--max-time', str(self.timeout), '--connect-timeout', '3']
+            if byte_range is not None:
+                cmd += ['-r', f'{byte_range[0] + offset}-{byte_range[1]}']
+            elif offset:
+                cmd += ['-C', str(offset)]
+            cmd.append(url)
+            try:
+                pipe = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+            except (ValueError, OSError) as e:
+                self.log.error(f"failed to start download from {url}: {str(e)}")
+                return None
+            size = offset
+            try:
+                for chunk in iter(lambda: pipe.stdout.read(CHUNK_SIZE), b''):
+                    part.write(chunk)
+                    sha256_hash.update(chunk)
+                    size += len(chunk)
+                part.flush()
+                stderr = pipe.stderr.read().decode(errors='replace').strip()
+                return_code = pipe.wait()
+            except OSError as e:
+                pipe.kill()
+                pipe.wait()
+                self.log.error(f"failed to write {part_file}: {str(e)}")
+                return None
+            finally:
+                pipe.stdout.close()
+                pipe.stderr.close()
+            if return_code != 0:
+                self.log.warning(f"download from {url} failed [code:{return_code}]: {stderr}")
+                if return_code == CURL_RANGE_ERROR or size == 0:
+                    # 服务端不支持断点续传时，下次从头下载
+                    os.remove(part_file)
+                return None
+            if byte_range is not None:
+                return ''
+            return sha256_hash.hexdigest()
+
+    def _download_segments(self, mirrors: List[str], segments: int, part_file: str) -> Optional[str]:
+        """
+        将文件按字节范围分段，从多个地址并发下载后合并到 part_file，合并时计算 sha256。
+
+        各分段保存在独立的文件中，下载中断时保留，再次执行时继续下载。
+
+        :param mirrors: 支持按范围下载的地址，按响应时间从快到慢排列
+        :param segments: 分段数量
+        :param part_file: 合并后的文件
+        :return: 校验通过的 sha256，失败时返回None
+        """
+        segment_size = -(-self.size // segments)
+        ranges = [(start, min(start + segment_size, self.size) - 1) for start in range(0, self.size, segment_size)]
+        segment_files = [f'{part_file}.seg{start}-{end}' for start, end in ranges]
+        self.log.info(f"starting segmented download of {len(ranges)} segments from {len(mirrors)} url(s)")
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(self._download_segment, mirrors, index, byte_range, segment_files[index])
+                for index, byte_range in enumerate(ranges)
+            ]
+            if not all([future.result() for future in futures]):
+                return None
+        try:
+            sha256_hash = hashlib.sha256()
+            with _open_part_file(part_file) as f:
+                f.truncate(0)
+                for segment_file in segment_files:
+                    with open(segment_file, 'rb') as segment:
+                        for chunk in iter(lambda: segment.read(CHUNK_SIZE), b''):
+                            f.write(chunk)
+                            sha256_hash.update(chunk)
+        except OSError as e:
+            self.log.error(f"failed to merge segments into {part_file}: {str(e)}")
+            if os.path.exists(part_file):
+                os.remove(part_file)
+            return None
+        finally:
+            for segment_file in glob.glob(f'{glob.escape(part_file)}.seg*'):
+                os.remove(segment_file)
+        digest = sha256_hash.hexdigest()
+        return digest if self._check_digest(digest, part_file) else None
+
+    def _download_segment(self, mirrors: List[str], index: int, byte_range: Tuple[int, int],
+                          segment_file: str) -> bool:
+        """
+        下载一个分段，各分段优先使用不同的地址，失败后依次尝试其他地址。
+
+        :return: 是否下载成功
+        """
+        for offset in range(len(mirrors) * self.max_retries):
+            url = mirrors[(index + offset) % len(mirrors)]
+            if self._download_stream(url, segment_file, byte_range) is not None \
+                    and os.path.getsize(segment_file) == byte_range[1] - byte_range[0] + 1:
+                return True
+            self.log.debug(f"failed to download segment {index} from {url}")
+        return False
+
+    def _check_digest(self, digest: str, output_file: str) -> bool:
+        if not self.sha256sum or digest == self.sha256sum:
+            return True
+        self.log.error(f"checksum verification failed for {os.path.basename(output_file)}")
+        os.remove(output_file)
+        return False
@@ -12,12 +12,16 @@
 # ======================================================================================================================
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from prettytable import PrettyTable
 
+from src.constants.const import LIST_SCAN_WORKERS
 from src.exceptions.config_exception import ConfigException
 from src.utils.log.logger_generator import LoggerGenerator
 from src.utils.main_reader import MainReader
+from src.utils.plugin_meta_cache import PluginMetaCache
 
 
 class ListCmd:
@@ -28,6 +32,7 @@ class ListCmd:
         :param source: 源路径
         """
         self.source = source
+        self.meta_cache = PluginMetaCache()
         self.log = LoggerGenerator().get_logger('list_cmd')
 
     def run(self):
@@ -40,21 +45,39 @@ class ListCmd:
         if not os.path.isdir(self.source):
             self.log.error(f'{self.source} is not a directory')
             return False
+        paths = [os.path.join(self.source, item) for item in os.listdir(self.source) if item.endswith('.tar.gz')]
+        metas = {path: self.meta_cache.get(path) for path in paths}
+        missing = [path for path, meta in metas.items() if meta is None]
+        if missing:
+            # 未缓存或已变化的插件并发读取，读取时需要解压压缩包
+            with ThreadPoolExecutor(max_workers=min(LIST_SCAN_WORKERS, len(missing))) as executor:
+                for path, meta in zip(missing, executor.map(self._read_meta, missing)):
+                    metas[path] = meta
+                    if meta is not None:
+                        self.meta_cache.set(path, meta)
+            self.meta_cache.save()
         plugin_list = []
-        for item in os.listdir(self.source):
-            path = os.path.join(self.source, item)
-            if not item.endswith('.tar.gz'):
+        for path in paths:
+            meta = metas[path]
+            if meta is None:
                 continue
-            try:
-                main = MainReader(path)
-                name = main.get_name()
-                version = main.get_version()
-                description = main.get_description()
-            except ConfigException:
-                continue
-            plugin_list.append([len(plugin_list) + 1, name, version, description])
+            plugin_list.append([len(plugin_list) + 1, meta['name'], meta['version'], meta['description']])
         headers = ['#', 'Plugin', 'Version', 'Description']
         table = PrettyTable(headers)
         table.add_rows(plugin_list)
         self.log.info(table.get_string())
         return True
+
+    @staticmethod
+    def _read_meta(path: str) -> Optional[dict]:
+        """
+        读取插件压缩包中 main.yaml 的名称、版本与说明。
+
+        :param path: 插件压缩包路径
+        :return: {'name', 'version', 'description'}，不是有效的插件时返回None
+        """
+        try:
+            main = MainReader(path)
+            return {'name': main.get_name(), 'version': main.get_version(), 'description': main.get_description()}
+        except ConfigException:
+            return None
@@ -12,11 +12,17 @@
 # ======================================================================================================================
 
 import os
+import json
+import time
+import hashlib
 import configparser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from prettytable import PrettyTable
-from typing import Set
+from typing import List, Set, Tuple
 from src.utils.command.command_executor import CommandExecutor
 from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.plugin_index import PluginIndex
+from src.constants.const import REPO_INDEX_DEADLINE, REPO_UPDATE_WORKERS
 from src.constants.paths import REPO_CONFIG_PATH, REPO_CACHE_DIR
 
 class RepoCmd:
@@ -46,7 +52,14 @@ class RepoCmd:
             'disable': self.run_disable
         }
         handler = command_map.get(self.args.subcommand)
-        return handler() if handler else False
+        if not handler:
+            return False
+        cache_state = self._get_cache_state()
+        result = handler()
+        if result and self._get_cache_state() != cache_state:
+            # 插件源索引缓存变化后重新生成插件查询索引
+            PluginIndex().build()
+        return result
     
     def run_list(self) -> bool:
         """列出所有已配置的插件源
@@ -99,7 +112,9 @@ class RepoCmd:
             return False
             
         downloaded_files = self._process_repositories(config)
-        self._cleanup_old_cache_files(downloaded_files)
+        # 下载失败的插件源保留原有缓存
+        keep_files = {os.path.join(REPO_CACHE_DIR, f"{section}.yaml") for section in self._get_enabled_repos(config)}
+        self._cleanup_old_cache_files(downloaded_files | keep_files)
         
         return len(downloaded_files) > 0
     
@@ -213,6 +228,28 @@ class RepoCmd:
             self.log.error(f"failed to disable repo {name}: {str(e)}")
             return False
     
+    @staticmethod
+    def _get_cache_state() -> dict:
+        """获取插件源配置与索引缓存的大小和修改时间，用于判断插件查询索引是否需要重新生成
+        
+        Returns:
+            dict: 文件路径到(大小, 修改时间)的映射
+        """
+        paths = [REPO_CONFIG_PATH]
+        try:
+            paths += [os.path.join(REPO_CACHE_DIR, filename) for filename in os.listdir(REPO_CACHE_DIR)
+                      if filename.endswith('.yaml')]
+        except OSError:
+            pass
+        state = {}
+        for path in paths:
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (stat_result.st_size, stat_result.st_mtime_ns)
+        return state
+
     def _check_config_and_cache_dir(self) -> bool:
         """检查配置文件和缓存目录是否存在
         
@@ -245,7 +282,7 @@ class RepoCmd:
             return None
     
     def _process_repositories(self, config: configparser.ConfigParser) -> Set[str]:
-        """处理所有启用的仓库，下载索引文件
+        """并发处理所有启用的仓库，下载索引文件
         
         Args:
             config: 解析后的配置对象
@@ -254,22 +291,65 @@ class RepoCmd:
             Set[str]: 成功下载的文件路径集合
         """
         downloaded_files = set()
+        repos = self._get_enabled_repos(config)
+        if not repos:
+            self.log.warning("no enabled repo found")
+            return downloaded_files
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(len(repos), REPO_UPDATE_WORKERS)) as executor:
+            futures = {executor.submit(self._timed_download, config, section): section for section in repos}
+            for future in as_completed(futures):
+                section = futures[future]
+                results[section] = future.result()
+                if results[section][0]:
+                    downloaded_files.add(os.path.join(REPO_CACHE_DIR, f"{section}.yaml"))
+
+        table = PrettyTable()
+        table.field_names = ["name", "status", "latency"]
+        table.align["name"] = "l"
+        table.align["latency"] = "r"
+        for section in repos:
+            success, elapsed = results[section]
+            table.add_row([section, 'updated' if success else 'failed', f"{elapsed:.2f}s"])
+        self.log.info("\n" + str(table))
+        return downloaded_files
+
+    @staticmethod
+    def _get_enabled_repos(config: configparser.ConfigParser) -> List[str]:
+        """获取所有启用的仓库
         
+        Args:
+            config: 解析后的配置对象
+            
+        Returns:
+            List[str]: 启用的仓库名称列表
+        """
+        repos = []
         for section in config.sections():
             # 检查仓库是否启用
             if not (config.has_option(section, 'enabled') and 
                    config.has_option(section, 'url') and
                    config.getboolean(section, 'enabled')):
                 continue
-                
-            url = config.get(section, 'url').rstrip('/') + '/index.yaml'
-            output_file = os.path.join(REPO_CACHE_DIR, f"{section}.yaml")
+            repos.append(section)
+        return repos
+
+    def _timed_download(self, config: configparser.ConfigParser, name: str) -> Tuple[bool, float]:
+        """下载指定repo的索引文件并统计耗时
+        
+        Args:
+            config: 配置对象
+            name: repo名称
             
-            success = self._download_with_retry(url, output_file, section)
-            if success:
-                downloaded_files.add(output_file)
-                
-        return downloaded_files
+        Returns:
+            Tuple[bool, float]: 下载是否成功，以及耗时（秒）
+        """
+        start = time.monotonic()
+        url = config.get(name, 'url').rstrip('/') + '/index.yaml'
+        output_file = os.path.join(REPO_CACHE_DIR, f"{name}.yaml")
+        success = self._download_with_retry(url, output_file, name, deadline=REPO_INDEX_DEADLINE)
+        return success, time.monotonic() - start
     
     def _cleanup_old_cache_files(self, downloaded_files: Set[str]):
         """清理旧的缓存文件
@@ -286,6 +366,7 @@ class RepoCmd:
                 if filepath not in downloaded_files:
                     try:
                         os.remove(filepath)
+                        self._remove_file(self._get_meta_file(filepath))
                     except Exception as e:
                         self.log.error(f"failed to remove old cache file {filename}: {str(e)}")
         except Exception as e:
@@ -322,6 +403,7 @@ class RepoCmd:
         if os.path.exists(cache_file):
             try:
                 os.remove(cache_file)
+                self._remove_file(self._get_meta_file(cache_file))
                 self.log.info(f"removed cache file for repo: {name}")
                 return True
             except Exception as e:
@@ -329,47 +411,181 @@ class RepoCmd:
                 return False
         return True
 
-    def _download_with_retry(self, url: str, output_file: str, repo_name: str, max_retries: int = 3) -> bool:
-        """带重试机制的下载方法
+    @staticmethod
+    def _get_meta_file(output_file: str) -> str:
+        """获取索引缓存对应的元数据文件路径，记录ETag、Last-Modified以及sha256
+        
+        Args:
+            output_file: 索引缓存文件路径
+            
+        Returns:
+            str: 元数据文件路径
+        """
+        return os.path.splitext(output_file)[0] + '.meta.json'
+
+    @staticmethod
+    def _remove_file(path: str):
+        """删除文件，文件不存在时忽略
+        
+        Args:
+            path: 文件路径
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _calculate_sha256(path: str) -> str:
+        """计算文件的sha256
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            str: sha256摘要
+        """
+        sha256_hash = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for byte_block in iter(lambda: f.read(1024 * 1024), b''):
+                sha256_hash.update(byte_block)
+        return sha256_hash.hexdigest()
+
+    def _get_conditional_headers(self, url: str, output_file: str) -> List[str]:
+        """根据缓存的元数据生成条件请求头，缓存不存在、已损坏或者url变化时不使用条件请求
+        
+        Args:
+            url: 下载URL
+            output_file: 索引缓存文件路径
+            
+        Returns:
+            List[str]: curl请求头参数
+        """
+        try:
+            with open(self._get_meta_file(output_file), 'r') as f:
+                meta = json.load(f)
+            if meta.get('url') != url or meta.get('sha256') != self._calculate_sha256(output_file):
+                return []
+        except (OSError, ValueError, AttributeError):
+            return []
+        headers = []
+        if meta.get('etag'):
+            headers += ['-H', f"If-None-Match: {meta['etag']}"]
+        if meta.get('last_modified'):
+            headers += ['-H', f"If-Modified-Since: {meta['last_modified']}"]
+        return headers
+
+    @staticmethod
+    def _parse_response_headers(header_file: str) -> dict:
+        """解析最后一次响应（跟随重定向后）的ETag与Last-Modified
+        
+        Args:
+            header_file: curl保存的响应头文件
+            
+        Returns:
+            dict: 响应头，键为小写
+        """
+        headers = {}
+        try:
+            with open(header_file, 'r', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return headers
+        for line in lines:
+            if line.startswith('HTTP/'):
+                headers = {}
+            elif ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        return headers
+
+    def _save_downloaded_index(self, url: str, temp_file: str, header_file: str, output_file: str):
+        """将下载完成的临时文件替换为索引缓存，并更新元数据
+        
+        Args:
+            url: 下载URL
+            temp_file: 下载的临时文件
+            header_file: curl保存的响应头文件
+            output_file: 索引缓存文件路径
+        """
+        headers = self._parse_response_headers(header_file)
+        meta = {
+            'url': url,
+            'etag': headers.get('etag', ''),
+            'last_modified': headers.get('last-modified', ''),
+            'sha256': self._calculate_sha256(temp_file)
+        }
+        # 先删除旧的元数据，避免替换过程中中断导致元数据与缓存不一致
+        meta_file = self._get_meta_file(output_file)
+        self._remove_file(meta_file)
+        # 通过替换而不是覆盖写入，避免非root用户因权限不足导致更新失败
+        os.replace(temp_file, output_file)
+        with open(f'{meta_file}.{os.getpid()}.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(f'{meta_file}.{os.getpid()}.tmp', meta_file)
+
+    def _download_with_retry(self, url: str, output_file: str, repo_name: str, max_retries: int = 3,
+                             deadline: float = None) -> bool:
+        """带重试机制的条件下载方法
+        
+        缓存的索引未变化时服务端返回304，直接使用原有缓存；下载失败时原有缓存保持不变。
         
         Args:
             url: 下载URL
             output_file: 输出文件路径
             repo_name: 仓库名称
             max_retries: 最大重试次数
+            deadline: 包含重试在内的最长下载时间（秒），为None时不限制
             
         Returns:
             bool: 下载是否成功
         """
-        # 下载前先删除，否则可能出现因权限不足导致非root用户下载失败
-        if os.path.exists(output_file):
-            try:
-                os.remove(output_file)
-                self.log.debug(f"removed existing file before download: {output_file}")
-            except Exception as e:
-                self.log.warning(f"failed to remove existing file {output_file}: {str(e)}")
-        
-        cmd = [
-            'curl', '-fL',
-            '--max-time', '10',
-            '--connect-timeout', '3',
-            '-o', output_file,
-            url
-        ]
-        
-        for attempt in range(max_retries):
-            _, stderr, return_code = CommandExecutor.run_single_cmd(cmd)
-            
-            if return_code == 0:
-                try:
-                    self.log.info(f"updated index for repo: {repo_name}")
-                    return True
-                except Exception as e:
-                    self.log.error(f"failed to set permissions for {output_file}: {str(e)}")
-                    return False
-            
-            if attempt < max_retries - 1:
-                self.log.warning(f"retrying download for repo {repo_name} (attempt {attempt + 1}/{max_retries})")
+        temp_file = f'{output_file}.{os.getpid()}.tmp'
+        header_file = f'{output_file}.{os.getpid()}.headers'
+        headers = self._get_conditional_headers(url, output_file)
+        
+        end_time = None if deadline is None else time.monotonic() + deadline
+        stderr = ''
+        attempts = 0
+        try:
+            for attempt in range(max_retries):
+                max_time = 10
+                if end_time is not None:
+                    max_time = min(max_time, int(end_time - time.monotonic()))
+                    if max_time <= 0:
+                        self.log.warning(f"download for repo {repo_name} exceeded the deadline of {deadline}s")
+                        break
+                self._remove_file(temp_file)
+                cmd = [
+                    'curl', '-fL',
+                    '--max-time', str(max_time),
+                    '--connect-timeout', '3',
+                    '-D', header_file,
+                    '-w', '%{http_code}',
+                    '-o', temp_file,
+                    *headers,
+                    url
+                ]
+                stdout, stderr, return_code = CommandExecutor.run_single_cmd(cmd)
+                attempts += 1
+                
+                if return_code == 0:
+                    try:
+                        if stdout.strip() == '304':
+                            self.log.info(f"index for repo {repo_name} is not modified")
+                        else:
+                            self._save_downloaded_index(url, temp_file, header_file, output_file)
+                            self.log.info(f"updated index for repo: {repo_name}")
+                        return True
+                    except Exception as e:
+                        self.log.error(f"failed to save index for repo {repo_name}: {str(e)}")
+                        return False
+                
+                if attempt < max_retries - 1:
+                    self.log.warning(f"retrying download for repo {repo_name} (attempt {attempt + 1}/{max_retries})")
+        finally:
+            self._remove_file(temp_file)
+            self._remove_file(header_file)
                 
-        self.log.error(f"failed to download index for repo {repo_name} after {max_retries} attempts:\n{stderr}")
+        self.log.error(f"failed to download index for repo {repo_name} after {attempts} attempts:\n{stderr}")
         return False
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-23
+# ======================================================================================================================
+
+import json
+import os
+import time
+from collections import defaultdict
+
+from prettytable import PrettyTable
+
+from src.commands.run.run_profiler import get_report_file
+from src.utils.log.logger_generator import LoggerGenerator
+
+
+class ReportCmd:
+    def __init__(self, action: str, project: str, top: int):
+        """
+        查看项目中指定方法最近一次执行的耗时报告。
+
+        :param action: 方法名称
+        :param project: 项目目录路径
+        :param top: 每张表中展示的最大条数
+        """
+        self.action = action
+        self.project = project
+        self.top = top
+        self.log = LoggerGenerator().get_logger('report_cmd')
+
+    def run(self):
+        """
+        查看项目中指定方法最近一次执行的耗时报告。
+
+        :return: 是否执行成功
+        """
+        self.log.debug(f'Running cmd report: action={self.action}, project={self.project}')
+        report_file = get_report_file(self.project, self.action)
+        if not os.path.exists(report_file):
+            self.log.error(f'No timing report found for action {self.action}, run "oedp run {self.action} --timing" '
+                           f'first')
+            return False
+        try:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log.error(f'Failed to read timing report {report_file}: {e}')
+            return False
+
+        start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report.get('start', 0)))
+        self.log.info(f'action: {report.get("action", "")}\n'
+                      f'project: {report.get("project", "")}\n'
+                      f'start time: {start}\n'
+                      f'elapsed: {self._format_seconds(report.get("elapsed", 0))}\n'
+                      f'succeeded: {str(report.get("succeeded", False)).lower()}\n'
+                      f'slowest tasks:\n{self._get_task_table(report.get("tasks", []))}\n'
+                      f'slowest hosts:\n{self._get_host_table(report.get("events", []))}\n'
+                      f'slowest modules:\n{self._get_module_table(report.get("events", []))}')
+        return True
+
+    def _get_task_table(self, tasks: list) -> str:
+        rows = sorted(tasks, key=lambda t: t.get('elapsed', 0), reverse=True)[:self.top]
+        table = PrettyTable(['#', 'Task', 'Playbook', 'Elapsed', 'Succeeded'])
+        table.align['Task'] = 'l'
+        for index, task in enumerate(rows, 1):
+            table.add_row([index, task.get('name', ''), task.get('playbook', ''),
+                           self._format_seconds(task.get('elapsed', 0)), str(task.get('succeeded', False)).lower()])
+        return table.get_string()
+
+    def _get_host_table(self, events: list) -> str:
+        """
+        每个主机上所有 ansible 任务的累计耗时。
+        """
+        durations = defaultdict(float)
+        counts = defaultdict(int)
+        failures = defaultdict(int)
+        for event in events:
+            host = event.get('host', '')
+            durations[host] += event.get('duration', 0)
+            counts[host] += 1
+            if event.get('status') in ('failed', 'unreachable'):
+                failures[host] += 1
+        rows = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:self.top]
+        table = PrettyTable(['#', 'Host', 'Total', 'Tasks', 'Failed'])
+        table.align['Host'] = 'l'
+        for index, (host, duration) in enumerate(rows, 1):
+            table.add_row([index, host, self._format_seconds(duration), counts[host], failures[host]])
+        return table.get_string()
+
+    def _get_module_table(self, events: list) -> str:
+        """
+        每个 ansible 模块在所有主机上的累计耗时。
+        """
+        durations = defaultdict(float)
+        counts = defaultdict(int)
+        slowest = defaultdict(float)
+        for event in events:
+            module = event.get('module', '')
+            duration = event.get('duration', 0)
+            durations[module] += duration
+            counts[module] += 1
+            slowest[module] = max(slowest[module], duration)
+        rows = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:self.top]
+        table = PrettyTable(['#', 'Module', 'Total', 'Calls', 'Average', 'Max'])
+        table.align['Module'] = 'l'
+        for index, (module, duration) in enumerate(rows, 1):
+            table.add_row([index, module, self._format_seconds(duration), counts[module],
+                           self._format_seconds(duration / counts[module]), self._format_seconds(slowest[module])])
+        return table.get_string()
+
+    @staticmethod
+    def _format_seconds(seconds: float) -> str:
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(int(minutes), 60)
+        return f'{hours:02d}:{minutes:02d}:{seconds:04.1f}'
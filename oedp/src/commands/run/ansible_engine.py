@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-12
+# ======================================================================================================================
+
+import threading
+
+
+class AnsibleEngine:
+    def __init__(self, inventory: str):
+        """
+        在当前进程中通过 ansible Python API 执行 playbook。
+
+        同一方法的所有任务共享一次加载的 ansible 模块、插件以及解析后的 inventory，
+        避免每个任务都启动一个新的 ansible-playbook 进程。
+
+        :param inventory: inventory 文件路径
+        :raises ImportError: 当前环境中没有可用的 ansible
+        """
+        from ansible import context
+        from ansible.executor.playbook_executor import PlaybookExecutor
+        from ansible.inventory.manager import InventoryManager
+        from ansible.module_utils.common.collections import ImmutableDict
+        from ansible.parsing.dataloader import DataLoader
+        from ansible.utils import vars as ansible_vars
+        from ansible.vars.manager import VariableManager
+        try:
+            from ansible.plugins.loader import init_plugin_loader
+            init_plugin_loader()
+        except ImportError:
+            # 低版本 ansible 在导入时即完成插件加载
+            pass
+
+        self._context = context
+        self._immutable_dict = ImmutableDict
+        self._playbook_executor = PlaybookExecutor
+        self._variable_manager = VariableManager
+        self._ansible_vars = ansible_vars
+        self._loader = DataLoader()
+        self._inventory = InventoryManager(loader=self._loader, sources=[inventory])
+        # ansible 的命令行参数保存在全局上下文中，同一时间只能执行一个 playbook
+        self._lock = threading.Lock()
+
+    def run_playbook(self, playbook: str, variables: str = None, scope: str = None) -> int:
+        """
+        执行 playbook，等价于 ansible-playbook <playbook> -i <inventory> [-e @<variables>] [--limit <scope>]
+
+        :param playbook: playbook 文件路径
+        :param variables: 变量文件路径
+        :param scope: 执行的主机范围
+        :return: 执行结果，0 表示成功
+        """
+        with self._lock:
+            self._context.CLIARGS = self._immutable_dict(
+                forks=None, become=None, become_method=None, become_user=None, check=False,
+                diff=False, verbosity=0, syntax=False, listhosts=False, listtasks=False, listtags=False,
+                start_at_task=None, tags=('all',), skip_tags=(), subset=scope,
+                extra_vars=(f'@{variables}',) if variables else ()
+            )
+            # ansible 会缓存第一次解析的 extra vars，切换任务时需要清除
+            self._ansible_vars.load_extra_vars.extra_vars = None
+            self._inventory.subset(scope)
+            self._inventory.clear_pattern_cache()
+            variable_manager = self._variable_manager(loader=self._loader, inventory=self._inventory)
+            executor = self._playbook_executor(
+                playbooks=[playbook], inventory=self._inventory, variable_manager=variable_manager,
+                loader=self._loader, passwords={}
+            )
+            try:
+                return executor.run()
+            finally:
+                self._loader.cleanup_all_tmp_files()
+
+    def list_hosts(self, pattern: str) -> list:
+        """
+        获取匹配指定范围的主机列表，等价于 ansible <pattern> -i <inventory> --list-hosts
+
+        :param pattern: 主机范围
+        :return: 主机名称列表
+        """
+        with self._lock:
+            self._inventory.subset(None)
+            self._inventory.clear_pattern_cache()
+            return [host.name for host in self._inventory.list_hosts(pattern)]
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-16
+# ======================================================================================================================
+
+import configparser
+import os
+import stat
+
+from src.constants.const import ANSIBLE_PROFILE_FAST, ANSIBLE_PROFILE_SAFE
+from src.utils.fact_cache import FactCache
+
+# 每个 CPU 核心对应的最大并发数，以及并发数上限
+FORKS_PER_CPU = {
+    ANSIBLE_PROFILE_FAST: 10,
+    ANSIBLE_PROFILE_SAFE: 4
+}
+MAX_FORKS = {
+    ANSIBLE_PROFILE_FAST: 200,
+    ANSIBLE_PROFILE_SAFE: 50
+}
+# ansible 配置项对应的环境变量
+ANSIBLE_ENVIRONMENT = {
+    'forks': 'ANSIBLE_FORKS',
+    'gathering': 'ANSIBLE_GATHERING',
+    'fact_caching': 'ANSIBLE_CACHE_PLUGIN',
+    'fact_caching_connection': 'ANSIBLE_CACHE_PLUGIN_CONNECTION',
+    'fact_caching_timeout': 'ANSIBLE_CACHE_PLUGIN_TIMEOUT',
+    'pipelining': 'ANSIBLE_PIPELINING'
+}
+# ansible 配置项在 ansible.cfg 中的位置 [(section, key)]
+ANSIBLE_INI = {
+    'forks': [('defaults', 'forks')],
+    'gathering': [('defaults', 'gathering')],
+    'fact_caching': [('defaults', 'fact_caching')],
+    'fact_caching_connection': [('defaults', 'fact_caching_connection')],
+    'fact_caching_timeout': [('defaults', 'fact_caching_timeout')],
+    'pipelining': [('defaults', 'pipelining'), ('connection', 'pipelining'), ('ssh_connection', 'pipelining')]
+}
+# 需要一起调整的 facts 缓存配置项，ansible.cfg 中配置了其中任意一项时都不调整
+FACT_CACHING_SETTINGS = ('fact_caching', 'fact_caching_connection', 'fact_caching_timeout')
+
+
+def find_ansible_config():
+    """
+    按 ansible 的查找顺序获取生效的 ansible.cfg：ANSIBLE_CONFIG、当前目录（其他用户可写时忽略）、~/.ansible.cfg、
+    /etc/ansible/ansible.cfg，只使用第一个存在的文件。
+
+    :return: 配置文件路径，不存在时返回None
+    """
+    paths = []
+    if 'ANSIBLE_CONFIG' in os.environ:
+        path = os.path.abspath(os.path.expanduser(os.environ['ANSIBLE_CONFIG']))
+        paths.append(os.path.join(path, 'ansible.cfg') if os.path.isdir(path) else path)
+    try:
+        cwd = os.getcwd()
+        if not os.stat(cwd).st_mode & stat.S_IWOTH:
+            paths.append(os.path.join(cwd, 'ansible.cfg'))
+    except OSError:
+        pass
+    paths.append(os.path.expanduser('~/.ansible.cfg'))
+    paths.append('/etc/ansible/ansible.cfg')
+    for path in paths:
+        if os.path.exists(path) and os.access(path, os.R_OK):
+            return path
+    return None
+
+
+def get_configured_settings(config_file: str) -> set:
+    """
+    获取 ansible.cfg 中已经配置的性能相关配置项。
+
+    :param config_file: ansible.cfg 路径
+    :return: 已配置的配置项名称
+    """
+    if not config_file:
+        return set()
+    config = configparser.ConfigParser(inline_comment_prefixes=(';',), interpolation=None)
+    try:
+        config.read(config_file, encoding='utf-8')
+    except (configparser.Error, UnicodeDecodeError):
+        return set()
+    return {key for key, options in ANSIBLE_INI.items()
+            if any(config.has_option(section, option) for section, option in options)}
+
+
+class AnsibleProfile:
+    def __init__(self, profile: str, host_count: int, fact_cache: FactCache = None):
+        """
+        根据节点数量与本机 CPU 数量，生成 ansible 性能配置。
+
+        :param profile: 性能配置，fast 或 safe
+        :param host_count: inventory 中的节点数量
+        :param fact_cache: 在任务之间以及多次执行之间共享的 facts 缓存，为空时不持久化 facts
+        """
+        self.profile = profile
+        self.host_count = host_count
+        self.fact_cache = fact_cache
+
+    def get_forks(self) -> int:
+        """
+        计算 ansible 的并发数，不超过节点数量。
+
+        :return: 并发数
+        """
+        cpu_forks = (os.cpu_count() or 1) * FORKS_PER_CPU[self.profile]
+        return max(1, min(self.host_count, cpu_forks, MAX_FORKS[self.profile]))
+
+    def get_settings(self) -> dict:
+        """
+        获取需要调整的配置项。
+
+        safe 仅调整并发数，不改变 playbook 的执行行为；fast 额外开启 pipelining（要求远端 sudo 未配置 requiretty），
+        并在同一个 playbook 内缓存 facts。两种配置都不修改执行策略，避免改变跨节点任务的执行顺序。
+        指定了 facts 缓存时，两种配置都使用持久化的 facts 缓存。
+
+        :return: ansible 配置项
+        """
+        settings = {'forks': str(self.get_forks())}
+        if self.profile == ANSIBLE_PROFILE_FAST:
+            settings.update({
+                'gathering': 'smart',
+                'fact_caching': 'memory',
+                'pipelining': 'True'
+            })
+        if self.fact_cache is not None:
+            settings.update(self.fact_cache.get_settings())
+        return settings
+
+    def environment(self) -> dict:
+        """
+        获取使配置项生效的环境变量。
+
+        环境变量的优先级高于 ansible.cfg，生效的 ansible.cfg 中已经配置的配置项不再调整，以用户的配置为准。
+
+        :return: 环境变量
+        """
+        configured = get_configured_settings(find_ansible_config())
+        if configured & set(FACT_CACHING_SETTINGS):
+            configured.update(FACT_CACHING_SETTINGS)
+        return {ANSIBLE_ENVIRONMENT[key]: value for key, value in self.get_settings().items() if key not in configured}
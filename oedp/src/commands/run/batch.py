@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-20
+# ======================================================================================================================
+
+"""
+分批执行任务相关的工具函数
+"""
+import math
+import re
+
+# PLAY RECAP 中每个主机的统计行，例如：
+# 172.27.76.114 : ok=3 changed=1 unreachable=0 failed=0 skipped=0 rescued=0 ignored=0
+_RECAP_PATTERN = re.compile(r'^(\S+)\s+:\s+ok=\d+\s+changed=\d+\s+unreachable=(\d+)\s+failed=(\d+)', re.MULTILINE)
+
+
+def parse_batch_size(batch, host_count: int) -> int:
+    """
+    解析任务的 batch 字段，支持主机数量（例如 20）或百分比（例如 "10%"）。
+
+    :param batch: batch 字段的值
+    :param host_count: 任务范围内的主机数量
+    :return: 每批的主机数量，至少为 1
+    :raises ValueError: batch 字段不合法
+    """
+    value = str(batch).strip()
+    try:
+        if value.endswith('%'):
+            percentage = float(value[:-1])
+            if not 0 < percentage <= 100:
+                raise ValueError
+            return max(1, math.ceil(host_count * percentage / 100))
+        size = int(value)
+    except ValueError:
+        raise ValueError(f'Invalid batch "{batch}", expected a host number or a percentage such as "10%"')
+    if size < 1:
+        raise ValueError(f'Invalid batch "{batch}", batch size must be positive')
+    return size
+
+
+def parse_max_fail_percentage(max_fail_percentage) -> float:
+    """
+    解析任务的 max_fail_percentage 字段，允许失败的主机占比，默认为 0，即任一主机失败即终止。
+
+    :param max_fail_percentage: max_fail_percentage 字段的值
+    :return: 百分比
+    :raises ValueError: max_fail_percentage 字段不合法
+    """
+    value = str(max_fail_percentage).strip().rstrip('%')
+    try:
+        percentage = float(value)
+    except ValueError:
+        raise ValueError(f'Invalid max_fail_percentage "{max_fail_percentage}"')
+    if not 0 <= percentage <= 100:
+        raise ValueError(f'Invalid max_fail_percentage "{max_fail_percentage}", expected 0 to 100')
+    return percentage
+
+
+def split_batches(hosts: list, batch_size: int) -> list:
+    """
+    将主机列表按顺序切分为多批。
+
+    :param hosts: 主机列表
+    :param batch_size: 每批的主机数量
+    :return: 每批的主机列表
+    """
+    return [hosts[i:i + batch_size] for i in range(0, len(hosts), batch_size)]
+
+
+def parse_failed_hosts(output: str) -> set:
+    """
+    从 ansible-playbook 输出的 PLAY RECAP 中获取失败或不可达的主机。
+
+    :param output: ansible-playbook 的标准输出
+    :return: 失败的主机集合
+    """
+    failed_hosts = set()
+    for host, unreachable, failed in _RECAP_PATTERN.findall(output or ''):
+        if int(unreachable) or int(failed):
+            failed_hosts.add(host)
+    return failed_hosts
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-23
+# ======================================================================================================================
+
+"""
+ansible 回调插件，由 oedp run --timing 启用，记录每个主机上每个 ansible 任务的耗时
+"""
+import json
+import os
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+DOCUMENTATION = '''
+    name: oedp_timing
+    type: aggregate
+    short_description: record per host task timings for oedp run --timing
+    description:
+      - Append one json line per host and task to the file given by OEDP_TIMING_FILE.
+    requirements:
+      - enable in configuration
+'''
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'oedp_timing'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self._output_file = os.environ.get('OEDP_TIMING_FILE')
+        self._playbook = ''
+        self._starts = {}
+
+    def v2_playbook_on_start(self, playbook):
+        self._playbook = os.path.abspath(playbook._file_name)
+
+    def v2_runner_on_start(self, host, task):
+        self._starts[(host.get_name(), task._uuid)] = time.time()
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, 'ok')
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, 'ignored' if ignore_errors else 'failed')
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, 'unreachable')
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, 'skipped')
+
+    def _record(self, result, status):
+        host = result._host.get_name()
+        task = result._task
+        start = self._starts.pop((host, task._uuid), None)
+        if start is None or not self._output_file:
+            return
+        record = {
+            'playbook': self._playbook,
+            'task': task.get_name(),
+            'module': task.action,
+            'host': host,
+            'status': status,
+            'start': start,
+            'duration': time.time() - start
+        }
+        with open(self._output_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
@@ -12,13 +12,28 @@
 # ======================================================================================================================
 
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+from src.commands.run.ansible_engine import AnsibleEngine
+from src.commands.run.ansible_profile import AnsibleProfile
+from src.commands.run.batch import parse_batch_size, parse_failed_hosts, parse_max_fail_percentage, split_batches
+from src.commands.run.run_profiler import RunProfiler
+from src.commands.run.ssh_control import SshControlPool
+from src.constants.const import ANSIBLE_PROFILE_SAFE, FACT_CACHE_TTL, RUN_ENGINE_API, RUN_ENGINE_CLI, \
+    SSH_CONTROL_PERSIST
+from src.exceptions.config_exception import ConfigException
 from src.utils.command.command_executor import CommandExecutor
+from src.utils.config_reader import ConfigReader
+from src.utils.fact_cache import FactCache
 from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.run_journal import RunJournal
 
 
 class RunAction:
-    def __init__(self, action: str, tasks: list, project: str, debug: bool):
+    def __init__(self, action: str, tasks: list, project: str, debug: bool, jobs: int = 1, resume: bool = False,
+                 engine: str = RUN_ENGINE_CLI, ssh_persist: int = SSH_CONTROL_PERSIST,
+                 profile: str = ANSIBLE_PROFILE_SAFE, fact_ttl: int = FACT_CACHE_TTL, timing: bool = False):
         """
         执行指定项目的指定方法。
 
@@ -26,64 +41,371 @@ class RunAction:
         :param action: 方法名称
         :param tasks: 方法代码路径
         :param debug: 是否启用调试模式
+        :param jobs: 可同时执行的最大任务数
+        :param resume: 是否跳过上次已执行成功且输入未变化的任务
+        :param engine: 执行引擎，cli 为每个任务启动进程，api 在当前进程中调用 ansible
+        :param ssh_persist: ssh 复用连接空闲后保持的时间（秒），为 0 时不复用连接
+        :param profile: ansible 性能配置，fast 或 safe
+        :param fact_ttl: facts 缓存的有效时间（秒），为 0 时不缓存 facts
+        :param timing: 是否记录每个任务以及每个主机的耗时
         """
         self.action = action
         self.tasks = tasks
         self.project = project
         self.debug = debug
+        self.jobs = max(1, jobs)
+        self.resume = resume
+        self.engine = engine
+        self.ssh_persist = ssh_persist
+        self.profile = profile
+        self.fact_ttl = fact_ttl
+        self.profiler = RunProfiler(project, action) if timing else None
+        self.ansible_engine = None
+        self.config_reader = None
+        self.inventory = os.path.join(project, 'config.yaml')
         self.log = LoggerGenerator().get_logger('run_action')
+        self.journal = RunJournal(project, action)
 
     def run(self) -> bool:
         """
         执行指定项目的指定方法。
 
+        任务之间按照 depends_on 构建依赖图，没有依赖关系的任务可以并发执行；
+        未声明 depends_on 的任务依赖于前一个任务，与按顺序执行的行为保持一致。
+
         :return: 是否执行成功
         """
         self.log.debug(f'Running {self.action} action for {self.project}')
         for task in self.tasks:
-            if not isinstance(task, dict):
+            if not isinstance(task, dict) or 'playbook' not in task:
                 self.log.error(f'Unrecognized task: {task}')
                 return False
-            if 'name' in task:
-                self.log.debug(f'Running task: {task["name"]}')
-            else:
-                self.log.debug(f'Running task: No Name Task')
-            if 'playbook' in task:
-                if not self._run_playbook(task, self.project):
-                    return False
+        dependencies = self._build_dependencies()
+        if dependencies is None:
+            return False
+        if not self.resume:
+            self.journal.reset()
+        self._init_inventory()
+        self._init_ansible_environment()
+        if self.engine == RUN_ENGINE_API:
+            self._init_ansible_engine()
+        if self.ansible_engine is not None and self.jobs > 1:
+            self.log.warning('Tasks are executed one by one with the api engine, ignore option --jobs')
+            self.jobs = 1
+        success = self._run_tasks(dependencies)
+        if self.profiler is not None:
+            self._save_timing_report(success)
+        if not success:
+            return False
+        self.journal.reset()
+        return True
+
+    def _save_timing_report(self, success: bool):
+        try:
+            report_file = self.profiler.save(success)
+        except OSError as e:
+            self.log.warning(f'Failed to save timing report: {e}')
+            return
+        self.log.info(f'Timing report saved to {report_file}, run "oedp report {self.action}" to view it')
+
+    def _init_inventory(self):
+        """
+        读取项目配置文件，优先使用其解析缓存作为 inventory。
+        """
+        try:
+            self.config_reader = ConfigReader(self.project)
+            self.inventory = self.config_reader.get_inventory_file()
+        except Exception as e:
+            self.log.warning(f'Failed to read config file of {self.project}: {e}')
+        self.log.debug(f'Using inventory: {self.inventory}')
+
+    def _init_ansible_environment(self):
+        """
+        设置 ansible 的环境变量，同时对 ansible-playbook 进程与 ansible python api 生效。
+
+        用户已经设置的环境变量优先。
+        """
+        environment = {}
+        try:
+            if self.config_reader is None:
+                raise ConfigException('config file is not available')
+            host_count = len(self.config_reader.get_hosts())
+            fact_cache = FactCache(self.project, self.fact_ttl) if self.fact_ttl > 0 else None
+            profile = AnsibleProfile(self.profile, host_count, fact_cache=fact_cache)
+            environment.update(profile.environment())
+        except (ConfigException, OSError) as e:
+            self.log.warning(f'Failed to generate ansible {self.profile} profile: {e}')
+        if self.ssh_persist > 0:
+            try:
+                environment.update(SshControlPool(self.ssh_persist).environment())
+            except OSError as e:
+                self.log.warning(f'Failed to prepare ssh control path directory: {e}')
+        for key, value in environment.items():
+            os.environ.setdefault(key, value)
+            self.log.debug(f'Ansible environment: {key}={os.environ[key]}')
+        if self.profiler is not None:
+            try:
+                # 耗时回调插件与用户已配置的回调插件合并，直接覆盖环境变量
+                os.environ.update(self.profiler.environment())
+            except OSError as e:
+                self.log.warning(f'Failed to enable timing callback: {e}')
+
+    def _init_ansible_engine(self):
+        try:
+            self.ansible_engine = AnsibleEngine(self.inventory)
+        except ImportError as e:
+            self.log.warning(f'Ansible python api is not available, fall back to ansible-playbook: {e}')
+        except Exception as e:
+            self.log.warning(f'Failed to load inventory {self.inventory}, fall back to ansible-playbook: {e}')
+
+    def _build_dependencies(self):
+        """
+        根据任务的 depends_on 字段构建依赖关系。
+
+        :return: 每个任务所依赖的任务下标集合，依赖关系非法时返回None
+        """
+        name_index = {}
+        for index, task in enumerate(self.tasks):
+            name = task.get('name')
+            if name is None:
+                continue
+            if name in name_index:
+                name_index[name] = None
             else:
-                self.log.error(f'Unrecognized task: {task}')
+                name_index[name] = index
+
+        dependencies = []
+        for index, task in enumerate(self.tasks):
+            if 'depends_on' not in task:
+                dependencies.append({index - 1} if index > 0 else set())
+                continue
+            depends_on = task['depends_on'] or []
+            if isinstance(depends_on, str):
+                depends_on = [depends_on]
+            if not isinstance(depends_on, list) or not all(isinstance(name, str) for name in depends_on):
+                self.log.error(f'Invalid depends_on of task "{task.get("name", "unamed task")}": {depends_on}, '
+                               f'expected a task name or a list of task names')
+                return None
+            required = set()
+            for name in depends_on:
+                if name not in name_index:
+                    self.log.error(f'Task "{task.get("name", "unamed task")}" depends on unknown task "{name}"')
+                    return None
+                if name_index[name] is None:
+                    self.log.error(f'Task name "{name}" is ambiguous, task names must be unique')
+                    return None
+                required.add(name_index[name])
+            dependencies.append(required)
+
+        if not self._is_acyclic(dependencies):
+            self.log.error(f'Circular dependency found in tasks of action {self.action}')
+            return None
+        return dependencies
+
+    @staticmethod
+    def _is_acyclic(dependencies: list) -> bool:
+        remaining = {index: set(required) for index, required in enumerate(dependencies)}
+        while remaining:
+            ready = [index for index, required in remaining.items() if not required]
+            if not ready:
                 return False
+            for index in ready:
+                del remaining[index]
+            for required in remaining.values():
+                required.difference_update(ready)
         return True
 
-    def _run_playbook(self, task: dict, project: str) -> bool:
+    def _run_tasks(self, dependencies: list) -> bool:
+        """
+        按照依赖关系调度任务，最多同时执行 jobs 个任务。
+
+        任一任务失败后不再启动新的任务，等待已启动的任务结束后返回。
+
+        :param dependencies: 每个任务所依赖的任务下标集合
+        :return: 是否全部执行成功
+        """
+        if self.jobs == 1:
+            return self._run_tasks_serially(dependencies)
+        pending = list(range(len(self.tasks)))
+        finished = set()
+        running = {}
+        success = True
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while pending or running:
+                if success:
+                    for index in [i for i in pending if dependencies[i] <= finished]:
+                        if len(running) >= self.jobs:
+                            break
+                        pending.remove(index)
+                        future = executor.submit(self._run_task, index)
+                        running[future] = index
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    if future.result():
+                        finished.add(index)
+                    else:
+                        success = False
+        return success
+
+    def _run_tasks_serially(self, dependencies: list) -> bool:
+        """
+        在当前线程中按照依赖关系逐个执行任务，ansible python api 只能在主线程中调用。
+
+        :param dependencies: 每个任务所依赖的任务下标集合
+        :return: 是否全部执行成功
+        """
+        pending = list(range(len(self.tasks)))
+        finished = set()
+        while pending:
+            index = next(i for i in pending if dependencies[i] <= finished)
+            pending.remove(index)
+            if not self._run_task(index):
+                return False
+            finished.add(index)
+        return True
+
+    def _run_task(self, index: int) -> bool:
+        task = self.tasks[index]
+        # 调试模式跳过的任务并未执行，不写入执行记录，避免不带 --debug 继续执行时被误跳过
         if self.debug and task.get('disabled_in_debug', False):
             self.log.info(f'Skipping task "{task.get("name", "unamed task")}"')
             return True
+        key = RunJournal.task_key(index, task)
+        digest = self.journal.task_digest(task)
+        if self.resume and self.journal.is_succeeded(key, digest):
+            self.log.info(f'Skipping task "{task.get("name", "unamed task")}" (succeeded in previous run)')
+            return True
+        if 'name' in task:
+            self.log.debug(f'Running task: {task["name"]}')
+        else:
+            self.log.debug(f'Running task: No Name Task')
+        start = time.time()
+        result = self._run_playbook(task, self.project)
+        if self.profiler is not None:
+            self.profiler.record_task(task, start, result)
+        self.journal.record(key, digest, result)
+        return result
+
+    def _run_playbook(self, task: dict, project: str) -> bool:
         self.log.info(f'Running task {task.get("name", "")}')
         workspace = os.path.join(project, 'workspace')
         playbook = os.path.join(workspace, task['playbook'])
         if not os.path.exists(playbook):
             self.log.error(f'Playbook does not exist: {os.path.abspath(playbook)}')
             return False
-        inventory = os.path.join(project, 'config.yaml')
-        cmd = ['ansible-playbook', playbook, '-i', inventory]
+        variables = None
         if 'vars' in task:
             variables = os.path.join(workspace, task['vars'])
             if not os.path.exists(variables):
                 self.log.error(f'Vars {variables} does not exist')
                 return False
-            cmd.extend(['-e', f'@{variables}'])
-        if 'scope' in task and task['scope'] != 'all':
-            cmd.extend(['--limit', task['scope']])
-        self.log.debug(f'Executing cmd: {cmd}')
+        scope = task['scope'] if 'scope' in task and task['scope'] != 'all' else None
+        if 'batch' in task:
+            return self._run_playbook_in_batches(task, playbook, variables, scope)
+        ret, _ = self._execute_playbook(playbook, variables, scope)
+        if ret != 0:
+            return False
+        self.log.info(f'Execute succeeded: {task.get("name", "unamed task")}')
+        return True
+
+    def _run_playbook_in_batches(self, task: dict, playbook: str, variables: str, scope: str) -> bool:
+        """
+        将任务范围内的主机分批执行 playbook，失败主机占比超过 max_fail_percentage 时不再执行后续批次。
+
+        :return: 是否执行成功
+        """
+        name = task.get("name", "unamed task")
+        hosts = self._list_hosts(scope or 'all')
+        if hosts is None:
+            return False
+        if not hosts:
+            self.log.warning(f'No hosts matched for task "{name}"')
+            return True
         try:
-            out, err, ret = CommandExecutor.run_single_cmd(cmd, print_on_console=True)
+            batch_size = parse_batch_size(task['batch'], len(hosts))
+            max_fail_percentage = parse_max_fail_percentage(task.get('max_fail_percentage', 0))
+        except ValueError as e:
+            self.log.error(f'Invalid task "{name}": {e}')
+            return False
+
+        batches = split_batches(hosts, batch_size)
+        failed_hosts = set()
+        for number, batch in enumerate(batches, 1):
+            self.log.info(f'Running batch {number}/{len(batches)} of task "{name}" on {len(batch)} host(s)')
+            ret, out = self._execute_playbook(playbook, variables, ','.join(batch))
             if ret != 0:
-                self.log.error(f'Execute cmd failed [code:{ret}]:\nSTDOUT: {out}\nSTDERR: {err}')
+                # 无法从输出中识别失败的主机时，认为整批主机都失败
+                failed = (parse_failed_hosts(out) & set(batch)) or set(batch)
+                failed_hosts.update(failed)
+                self.log.warning(f'{len(failed)} host(s) failed in batch {number}: {", ".join(sorted(failed))}')
+            if len(failed_hosts) * 100 > max_fail_percentage * len(hosts):
+                self.log.error(f'{len(failed_hosts)} of {len(hosts)} host(s) failed, exceeding '
+                               f'max_fail_percentage {max_fail_percentage:g}%, abort task "{name}"')
                 return False
+        self.log.info(f'Execute succeeded: {name}')
+        return True
+
+    def _list_hosts(self, pattern: str):
+        """
+        获取匹配指定范围的主机列表。
+
+        :param pattern: 主机范围
+        :return: 主机列表，获取失败时返回None
+        """
+        if self.ansible_engine is not None:
+            try:
+                return self.ansible_engine.list_hosts(pattern)
+            except Exception as e:
+                self.log.error(f'Failed to list hosts of {pattern}: {str(e)}')
+                return None
+        cmd = ['ansible', pattern, '-i', self.inventory, '--list-hosts']
+        out, err, ret = CommandExecutor.run_single_cmd(cmd)
+        if ret != 0:
+            self.log.error(f'Failed to list hosts of {pattern} [code:{ret}]: {err}')
+            return None
+        # 第一行为 "hosts (N):"，其余每行一个主机
+        return [line.strip() for line in out.splitlines()[1:] if line.strip()]
+
+    def _execute_playbook(self, playbook: str, variables: str, limit: str):
+        """
+        执行 playbook，启用耗时记录时记录本次调用的耗时。
+
+        :param playbook: playbook 文件路径
+        :param variables: 变量文件路径
+        :param limit: 执行的主机范围
+        :return: (返回码, 标准输出)，执行异常时返回码为None
+        """
+        start = time.time()
+        ret, out = self._execute_playbook_once(playbook, variables, limit)
+        if self.profiler is not None:
+            self.profiler.record_command(playbook, limit, start, ret)
+        return ret, out
+
+    def _execute_playbook_once(self, playbook: str, variables: str, limit: str):
+        if self.ansible_engine is not None:
+            self.log.debug(f'Executing playbook in process: playbook={playbook}, vars={variables}, limit={limit}')
+            try:
+                ret = self.ansible_engine.run_playbook(playbook, variables, limit)
+            except Exception as e:
+                self.log.error(f'Exception occurred: {str(e)}')
+                return None, ''
+            if ret != 0:
+                self.log.error(f'Execute playbook failed [code:{ret}]: {playbook}')
+            return ret, ''
+        cmd = ['ansible-playbook', playbook, '-i', self.inventory]
+        if variables:
+            cmd.extend(['-e', f'@{variables}'])
+        if limit:
+            cmd.extend(['--limit', limit])
+        self.log.debug(f'Executing cmd: {cmd}')
+        try:
+            out, err, ret = CommandExecutor.run_single_cmd(cmd, timeout=None, print_on_console=True)
         except Exception as e:
             self.log.error(f'Exception occurred: {str(e)}')
-            return False
-        self.log.info(f'Execute succeeded: {task.get("name", "unamed task")}')
-        return True
+            return None, ''
+        if ret != 0:
+            self.log.error(f'Execute cmd failed [code:{ret}]:\nSTDOUT: {out}\nSTDERR: {err}')
+        return ret, out
@@ -14,6 +14,7 @@
 import time
 
 from src.commands.run.run_action import RunAction
+from src.constants.const import ANSIBLE_PROFILE_SAFE, FACT_CACHE_TTL, RUN_ENGINE_CLI, SSH_CONTROL_PERSIST
 from src.exceptions.config_exception import ConfigException
 from src.utils.log.logger_generator import LoggerGenerator
 from src.utils.main_reader import MainReader
@@ -21,17 +22,33 @@ from decimal import Decimal
 
 
 class RunCmd:
-    def __init__(self, action: str, project: str, debug: bool):
+    def __init__(self, action: str, project: str, debug: bool, jobs: int = 1, resume: bool = False,
+                 engine: str = RUN_ENGINE_CLI, ssh_persist: int = SSH_CONTROL_PERSIST,
+                 profile: str = ANSIBLE_PROFILE_SAFE, fact_ttl: int = FACT_CACHE_TTL, timing: bool = False):
         """
         执行一个项目中的方法。
 
         :param action: 方法名称
         :param project: 项目目录路径
         :param debug: 是否启用调试模式
+        :param jobs: 可同时执行的最大任务数
+        :param resume: 是否从上次失败的任务处继续执行
+        :param engine: ansible 执行引擎
+        :param ssh_persist: ssh 复用连接空闲后保持的时间（秒）
+        :param profile: ansible 性能配置
+        :param fact_ttl: facts 缓存的有效时间（秒）
+        :param timing: 是否记录耗时报告
         """
         self.action = action
         self.project = project
         self.debug = debug
+        self.jobs = jobs
+        self.resume = resume
+        self.engine = engine
+        self.ssh_persist = ssh_persist
+        self.profile = profile
+        self.fact_ttl = fact_ttl
+        self.timing = timing
         self.log = LoggerGenerator().get_logger('run_cmd')
 
     def run(self):
@@ -54,7 +71,8 @@ class RunCmd:
                 self.log.error(f'Failed to get tasks info: {action}')
                 return False
             tasks = action['tasks']
-            return RunAction(self.action, tasks, self.project, self.debug).run()
+            return RunAction(self.action, tasks, self.project, self.debug, self.jobs, self.resume,
+                             self.engine, self.ssh_persist, self.profile, self.fact_ttl, self.timing).run()
         finally:
             end_time = time.time()
             seconds = Decimal(f"{format(end_time - start_time, '.1f')}")
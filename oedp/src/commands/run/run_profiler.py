@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-23
+# ======================================================================================================================
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from src.constants.paths import REPORT_DIR
+from src.utils.tools import get_private_dir, get_project_id, write_private_file
+
+CALLBACK_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'callback_plugins')
+CALLBACK_PLUGIN_NAME = 'oedp_timing'
+
+
+def get_report_file(project: str, action: str, report_dir: str = REPORT_DIR) -> str:
+    """
+    获取项目中指定方法的耗时报告路径，每个用户的报告保存在仅自己可以访问的目录中。
+
+    :param project: 项目目录路径
+    :param action: 方法名称
+    :param report_dir: 报告所在目录
+    :return: 报告路径
+    """
+    return os.path.join(report_dir, str(os.getuid()), f'{get_project_id(project)}-{action}.json')
+
+
+class RunProfiler:
+    def __init__(self, project: str, action: str, report_dir: str = REPORT_DIR):
+        """
+        记录一次方法执行中每个任务、每次 ansible 调用以及每个主机上每个 ansible 任务的耗时。
+
+        :param project: 项目目录路径
+        :param action: 方法名称
+        :param report_dir: 报告所在目录
+        """
+        self.project = os.path.abspath(project)
+        self.action = action
+        self.report_dir = report_dir
+        self.report_file = get_report_file(project, action, report_dir)
+        # 回调插件记录事件的临时文件，启用回调插件时创建
+        self.events_file = None
+        self.start = time.time()
+        self.tasks = []
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def environment(self) -> dict:
+        """
+        返回启用耗时回调插件的环境变量，保留用户已经配置的回调插件。
+
+        回调插件记录事件的文件在报告目录中以随机名称创建，其他用户无法预先创建同名文件或符号链接。
+
+        :return: 环境变量
+        """
+        if self.events_file is None:
+            fd, self.events_file = tempfile.mkstemp(dir=get_private_dir(self.report_dir),
+                                                    prefix=f'.{os.path.basename(self.report_file)}.',
+                                                    suffix='.events')
+            os.close(fd)
+        plugin_dirs = [CALLBACK_PLUGIN_DIR]
+        for plugin_dir in os.environ.get('ANSIBLE_CALLBACK_PLUGINS', '').split(os.pathsep):
+            if plugin_dir and plugin_dir not in plugin_dirs:
+                plugin_dirs.append(plugin_dir)
+        callbacks = [CALLBACK_PLUGIN_NAME]
+        for callback in os.environ.get('ANSIBLE_CALLBACKS_ENABLED', '').split(','):
+            if callback.strip() and callback.strip() not in callbacks:
+                callbacks.append(callback.strip())
+        return {
+            'ANSIBLE_CALLBACK_PLUGINS': os.pathsep.join(plugin_dirs),
+            'ANSIBLE_CALLBACKS_ENABLED': ','.join(callbacks),
+            'OEDP_TIMING_FILE': self.events_file
+        }
+
+    def record_task(self, task: dict, start: float, succeeded: bool):
+        """
+        记录任务耗时。
+
+        :param task: 任务详情
+        :param start: 开始时间
+        :param succeeded: 是否执行成功
+        """
+        with self._lock:
+            self.tasks.append({
+                'name': task.get('name', ''),
+                'playbook': task.get('playbook', ''),
+                'start': start,
+                'elapsed': time.time() - start,
+                'succeeded': succeeded
+            })
+
+    def record_command(self, playbook: str, limit: str, start: float, return_code):
+        """
+        记录一次 ansible-playbook 调用的耗时。
+
+        :param playbook: playbook 文件路径
+        :param limit: 执行的主机范围
+        :param start: 开始时间
+        :param return_code: 返回码
+        """
+        with self._lock:
+            self.commands.append({
+                'playbook': playbook,
+                'limit': limit,
+                'start': start,
+                'elapsed': time.time() - start,
+                'return_code': return_code
+            })
+
+    def save(self, succeeded: bool) -> str:
+        """
+        汇总耗时数据并保存为 json 格式的报告。
+
+        :param succeeded: 方法是否执行成功
+        :return: 报告路径
+        """
+        events = []
+        if self.events_file and os.path.exists(self.events_file):
+            with open(self.events_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue
+            os.remove(self.events_file)
+        report = {
+            'project': self.project,
+            'action': self.action,
+            'start': self.start,
+            'elapsed': time.time() - self.start,
+            'succeeded': succeeded,
+            'tasks': self.tasks,
+            'commands': self.commands,
+            'events': events
+        }
+        get_private_dir(self.report_dir)
+        write_private_file(self.report_file, json.dumps(report, indent=2))
+        return self.report_file
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-13
+# ======================================================================================================================
+
+import os
+import stat
+
+from src.constants.const import SSH_CONTROL_PERSIST
+from src.constants.paths import SSH_CONTROL_DIR
+
+
+class SshControlPool:
+    def __init__(self, persist: int = SSH_CONTROL_PERSIST, control_dir: str = SSH_CONTROL_DIR):
+        """
+        管理 ssh 复用连接（ControlMaster）的 socket 目录。
+
+        同一用户执行的所有任务，以及保持时间内再次执行的方法，都复用已认证的 ssh 连接。
+
+        :param persist: 连接空闲后保持的时间（秒）
+        :param control_dir: socket 所在的父目录
+        """
+        self.persist = persist
+        # 每个用户使用独立的目录，避免 socket 被其他用户访问
+        self.control_path_dir = os.path.join(control_dir, str(os.getuid()))
+
+    def environment(self) -> dict:
+        """
+        创建 socket 目录，并返回 ansible ssh 连接插件所需的环境变量。
+
+        复用连接的参数通过 ssh_common_args 追加在 ssh_args 之后，不覆盖用户在 ansible.cfg 中配置的 ssh_args；
+        ssh 对同一选项只使用第一次出现的值，用户已配置的 ControlPersist 等选项仍然优先。
+
+        :return: 环境变量
+        """
+        os.makedirs(self.control_path_dir, mode=stat.S_IRWXU, exist_ok=True)
+        os.chmod(self.control_path_dir, stat.S_IRWXU)
+        return {
+            'ANSIBLE_SSH_COMMON_ARGS': f'-o ControlMaster=auto -o ControlPersist={self.persist}s',
+            'ANSIBLE_SSH_CONTROL_PATH_DIR': self.control_path_dir
+        }
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-26
+# ======================================================================================================================
+
+import json
+import sqlite3
+
+from prettytable import PrettyTable
+
+from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.plugin_index import PluginIndex, get_tags
+
+
+class SearchCmd:
+    def __init__(self, keyword: str, all_versions: bool = False, tag: str = None, json_output: bool = False):
+        """
+        在已配置的插件源中查找插件。
+
+        :param keyword: 关键字，匹配插件名称、标签以及描述
+        :param all_versions: 是否列出所有版本
+        :param tag: 只列出带有该标签的插件
+        :param json_output: 是否以 json 格式输出
+        """
+        self.keyword = keyword
+        self.all_versions = all_versions
+        self.tag = tag
+        self.json_output = json_output
+        self.log = LoggerGenerator().get_logger('search_cmd')
+
+    def run(self):
+        """
+        在已配置的插件源中查找插件。
+
+        :return: 是否执行成功
+        """
+        self.log.debug(f'Running cmd search: keyword={self.keyword}, all_versions={self.all_versions}, '
+                       f'tag={self.tag}')
+        try:
+            plugins = PluginIndex().search(self.keyword, self.all_versions, self.tag)
+        except (OSError, sqlite3.Error) as e:
+            self.log.error(f'Failed to query plugin index: {e}')
+            return False
+        if self.json_output:
+            # json 直接输出到标准输出，便于其他工具解析
+            print(json.dumps(plugins, ensure_ascii=False, indent=2, default=str))
+            return True
+        if not plugins:
+            self.log.info(f'No plugin matches {self.keyword}, run "oedp repo update" to refresh the repo index')
+            return True
+        table = PrettyTable(['#', 'Plugin', 'Version', 'Repo', 'Tags', 'Description'])
+        table.align['Plugin'] = 'l'
+        table.align['Tags'] = 'l'
+        table.align['Description'] = 'l'
+        for plugin in plugins:
+            table.add_row([len(table.rows) + 1, plugin.get('name', ''), plugin.get('version', ''),
+                           plugin.get('repo', ''), ', '.join(get_tags(plugin)), plugin.get('description') or ''])
+        self.log.info(table.get_string())
+        return True
@@ -20,6 +20,42 @@ VERSION = "1.1.0-1"
 OK = 0
 FAILED = 1
 
+# oedp run 执行引擎：cli 为每个任务启动 ansible-playbook 进程，api 在当前进程中调用 ansible
+RUN_ENGINE_CLI = 'cli'
+RUN_ENGINE_API = 'api'
+
+# oedp run 性能配置：fast 开启 pipelining 等优化，safe 仅根据节点数量调整并发数
+ANSIBLE_PROFILE_FAST = 'fast'
+ANSIBLE_PROFILE_SAFE = 'safe'
+
+# ansible facts 缓存的有效时间（秒）
+FACT_CACHE_TTL = 600
+
+# ssh 复用连接在空闲后保持的时间（秒）
+SSH_CONTROL_PERSIST = 300
+
+# oedp repo update 并发下载索引的最大线程数
+REPO_UPDATE_WORKERS = 8
+# 单个插件源下载索引（含重试）的最长时间（秒）
+REPO_INDEX_DEADLINE = 20
+
+# 插件下载的超时时间（秒）与每个地址的重试次数
+DOWNLOAD_TIMEOUT = 600
+DOWNLOAD_RETRY_TIME = 3
+# 探测插件下载地址响应时间的超时时间（秒）
+DOWNLOAD_PROBE_TIMEOUT = 5
+# 插件分段下载时每个分段的最小大小
+DOWNLOAD_SEGMENT_MIN_SIZE = 16 * 1024 * 1024
+
+# 插件缓存的默认空间配额，可以在 cache.conf 中修改
+PLUGIN_CACHE_QUOTA = '20G'
+
+# 解压插件时输出进度的间隔时间（秒）
+EXTRACT_PROGRESS_INTERVAL = 5
+
+# oedp list 并发读取插件元数据的最大线程数
+LIST_SCAN_WORKERS = 8
+
 # 文件夹权限 750
 DIR_MODE = stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP
 # 文件权限 640
@@ -32,8 +32,34 @@ PROJECT_WORKSPACE_DIR = 'workspace'
 /var
 `-- oedp
     |-- plugin
-    |   |-- k8s
-    |   `-- kubeflow
+    |   |-- k8s.tar.gz
+    |   |-- kubeflow.tar.gz
+    |   |-- partial
+    |   |   `-- <uid>
+    |   |       `-- xxx.part
+    |   `-- store
+    |       |-- usage.json
+    |       `-- <sha256[:2]>
+    |           `-- <sha256>.tar.gz
+    |-- cache
+    |   |-- plugins.json
+    |   |-- digest
+    |   |   `-- <uid>
+    |   |       `-- xxx.json
+    |   |-- facts
+    |   |   `-- <uid>
+    |   |       `-- <project id>
+    |   `-- inventory
+    |       `-- <uid>
+    |           `-- xxx.json
+    |-- journal
+    |   `-- <uid>
+    |       `-- xxx.json
+    |-- report
+    |   `-- <uid>
+    |       `-- xxx.json
+    |-- ssh
+    |   `-- <uid>
     `-- log
         `-- xxx.log
 """
@@ -41,8 +67,28 @@ PROJECT_WORKSPACE_DIR = 'workspace'
 OEDP_HOME = "/var/oedp"
 # 插件缓存目录
 PLUGIN_DIR = join(OEDP_HOME, 'plugin')
+# 按 sha256 保存插件的内容寻址缓存目录
+PLUGIN_STORE_DIR = join(PLUGIN_DIR, 'store')
+# 未下载完成的插件目录，与插件缓存目录在同一文件系统中，下载完成后可以直接替换
+PLUGIN_PARTIAL_DIR = join(PLUGIN_DIR, 'partial')
 # 日志文件所在目录
 LOG_DIR = join(OEDP_HOME, "log")
+# 缓存目录
+CACHE_DIR = join(OEDP_HOME, "cache")
+# ansible facts 缓存目录
+FACT_CACHE_DIR = join(CACHE_DIR, "facts")
+# 项目配置文件解析结果缓存目录
+INVENTORY_CACHE_DIR = join(CACHE_DIR, "inventory")
+# 插件文件 sha256 记录目录
+DIGEST_CACHE_DIR = join(CACHE_DIR, "digest")
+# 插件压缩包元数据缓存文件
+PLUGIN_META_CACHE_PATH = join(CACHE_DIR, "plugins.json")
+# 方法执行记录所在目录
+JOURNAL_DIR = join(OEDP_HOME, "journal")
+# 方法执行耗时报告所在目录
+REPORT_DIR = join(OEDP_HOME, "report")
+# ssh 复用连接的 socket 所在目录
+SSH_CONTROL_DIR = join(OEDP_HOME, "ssh")
 
 # oedp 配置家目录
 OEDP_CONFIG_HOME_DIR = "/etc/oedp"
@@ -50,9 +96,13 @@ OEDP_CONFIG_HOME_DIR = "/etc/oedp"
 OEDP_CONFIG_DIR = join(OEDP_CONFIG_HOME_DIR, "config")
 # /etc/oedp/config/log 日志配置文件所在目录
 LOG_CONFIG_DIR = join(OEDP_CONFIG_DIR, "log")
+# /etc/oedp/config/cache.conf 缓存配置文件
+CACHE_CONFIG_PATH = join(OEDP_CONFIG_DIR, "cache.conf")
 # /etc/oedp/config/repo 插件源相关配置所在目录
 REPO_CONFIG_DIR = join(OEDP_CONFIG_DIR, "repo")
 # /etc/oedp/config/repo/repo.conf 插件源配置文件
 REPO_CONFIG_PATH = join(REPO_CONFIG_DIR, "repo.conf")
 # /etc/oedp/config/repo/cache 插件源索引缓存目录
 REPO_CACHE_DIR = join(REPO_CONFIG_DIR, "cache")
+# /etc/oedp/config/repo/cache/plugins.db 由所有插件源索引生成的插件查询索引
+PLUGIN_INDEX_PATH = join(REPO_CACHE_DIR, "plugins.db")
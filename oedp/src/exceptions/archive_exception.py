@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-02
+# ======================================================================================================================
+
+from src.exceptions.base_custom_exception import BaseCustomException
+
+
+class ArchiveException(BaseCustomException):
+    """
+    插件压缩包解压异常
+    """
+
+    def __init__(self, message):
+        super(BaseCustomException, self).__init__(message)
+        self.message = message
+
+    def __str__(self):
+        return str(self.message)
@@ -15,13 +15,17 @@ import argparse
 import os
 import re
 
+from src.commands.cache.cache_cmd import CacheCmd
 from src.commands.check.check_cmd import CheckCmd
 from src.commands.info.info_cmd import InfoCmd
 from src.commands.init.init_cmd import InitCmd
 from src.commands.list.list_cmd import ListCmd
 from src.commands.run.run_cmd import RunCmd
 from src.commands.repo.repo_cmd import RepoCmd
-from src.constants.const import VERSION
+from src.commands.report.report_cmd import ReportCmd
+from src.commands.search.search_cmd import SearchCmd
+from src.constants.const import ANSIBLE_PROFILE_FAST, ANSIBLE_PROFILE_SAFE, FACT_CACHE_TTL, RUN_ENGINE_API, \
+    RUN_ENGINE_CLI, SSH_CONTROL_PERSIST, VERSION
 from src.constants.paths import PLUGIN_DIR
 
 from src.utils.command.command_executor import CommandExecutor
@@ -48,10 +52,13 @@ class OeDeployParser:
         )
         self._add_init_command()
         self._add_list_command()
+        self._add_search_command()
         self._add_info_command()
         self._add_run_command()
         self._add_check_command()
         self._add_repo_command()
+        self._add_cache_command()
+        self._add_report_command()
 
     def execute(self):
         """
@@ -67,7 +74,7 @@ class OeDeployParser:
 
     def _add_init_command(self):
         """
-        oedp init [plugin] [-p|--project <path>] [-d|--dir <path>] [-f|--force]
+        oedp init [plugin] [-p|--project <path>] [-d|--dir <path>] [-f|--force] [-s|--segments <num>]
 
         插件初始化到指定路径。[plugin]可以是插件压缩包路径、插件下载地址、插件名称
         """
@@ -75,7 +82,7 @@ class OeDeployParser:
             'init',
             prog='oedp init',
             help='Initialize a plugin to specified path',
-            usage='%(prog)s [plugin] [-p|--project <path>] [-d|--dir <path>] [-f|--force]'
+            usage='%(prog)s [plugin] [-p|--project <path>] [-d|--dir <path>] [-f|--force] [-s|--segments <num>]'
         )
         init_command.add_argument(
             'plugin',
@@ -97,6 +104,12 @@ class OeDeployParser:
             action='store_true',
             help='Force overwrite existing directory'
         )
+        init_command.add_argument(
+            '-s', '--segments',
+            type=int,
+            default=1,
+            help='Download plugin in parallel segments from multiple urls, only for plugins with known size'
+        )
         init_command.set_defaults(func=self._run_init_command)
 
     def _add_list_command(self):
@@ -119,6 +132,42 @@ class OeDeployParser:
         )
         drop_command.set_defaults(func=self._run_list_command)
 
+    def _add_search_command(self):
+        """
+        oedp search [keyword] [-a|--all] [-t|--tag <tag>] [--json]
+
+        在已配置的插件源中按名称、标签、描述查找插件，支持前缀、子串以及模糊匹配。
+        """
+        search_command = self.subparsers.add_parser(
+            'search',
+            prog='oedp search',
+            help='Search plugins in configured repos',
+            usage='%(prog)s [keyword] [-a|--all] [-t|--tag <tag>] [--json]'
+        )
+        search_command.add_argument(
+            'keyword',
+            type=str,
+            nargs='?',
+            default='',
+            help='Keyword to match plugin name, tags and description, list all plugins if not specified'
+        )
+        search_command.add_argument(
+            '-a', '--all',
+            action='store_true',
+            help='Show all versions instead of the latest version only'
+        )
+        search_command.add_argument(
+            '-t', '--tag',
+            type=str,
+            help='Only show plugins with the specified tag'
+        )
+        search_command.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results in json format'
+        )
+        search_command.set_defaults(func=self._run_search_command)
+
     def _add_info_command(self):
         """
         oedp info [-p|--project <path>]
@@ -143,7 +192,9 @@ class OeDeployParser:
 
     def _add_run_command(self):
         """
-        oedp run <action> [-p|--project <path>]
+        oedp run <action> [-p|--project <path>] [-j|--jobs <num>] [-r|--resume] [--engine <cli|api>]
+                   [--ssh-persist <seconds>] [--profile <fast|safe>] [--fact-ttl <seconds>]
+                   [--timing]
 
         执行一个项目中的方法。
 
@@ -153,7 +204,8 @@ class OeDeployParser:
             'run',
             prog='oedp run',
             help='run an action on a project',
-            usage='%(prog)s <action> [-p|--project <path>]'
+            usage='%(prog)s <action> [-p|--project <path>] [-j|--jobs <num>] [-r|--resume] [--engine <cli|api>] '
+                  '[--ssh-persist <seconds>] [--profile <fast|safe>] [--fact-ttl <seconds>] [--timing]'
         )
         deploy_command.add_argument(
             'action',
@@ -171,6 +223,48 @@ class OeDeployParser:
             action='store_true',
             help='Enable debug mode'
         )
+        deploy_command.add_argument(
+            '-j', '--jobs',
+            type=int,
+            default=1,
+            help='Maximum number of independent tasks to run in parallel'
+        )
+        deploy_command.add_argument(
+            '-r', '--resume',
+            action='store_true',
+            help='Skip tasks that succeeded in the previous run and whose inputs are unchanged'
+        )
+        deploy_command.add_argument(
+            '--engine',
+            type=str,
+            choices=[RUN_ENGINE_CLI, RUN_ENGINE_API],
+            default=RUN_ENGINE_CLI,
+            help='Run playbooks with ansible-playbook processes (cli) or in process with ansible python api (api)'
+        )
+        deploy_command.add_argument(
+            '--ssh-persist',
+            type=int,
+            default=SSH_CONTROL_PERSIST,
+            help='Seconds to keep idle ssh connections open for reuse, 0 to disable connection reuse'
+        )
+        deploy_command.add_argument(
+            '--profile',
+            type=str,
+            choices=[ANSIBLE_PROFILE_FAST, ANSIBLE_PROFILE_SAFE],
+            default=ANSIBLE_PROFILE_SAFE,
+            help='Ansible performance profile, fast also enables pipelining and fact caching'
+        )
+        deploy_command.add_argument(
+            '--fact-ttl',
+            type=int,
+            default=FACT_CACHE_TTL,
+            help='Seconds to reuse cached ansible facts across tasks and runs, 0 to disable fact cache'
+        )
+        deploy_command.add_argument(
+            '--timing',
+            action='store_true',
+            help='Record time spent per task and per host, view it with "oedp report <action>"'
+        )
         deploy_command.set_defaults(func=self._run_run_command)
 
     def _add_check_command(self):
@@ -285,6 +379,107 @@ class OeDeployParser:
         )
         disable_parser.set_defaults(func=self._run_repo_command)
 
+    def _add_report_command(self):
+        """
+        oedp report <action> [-p|--project <path>] [-n|--top <num>]
+
+        查看项目中指定方法最近一次通过 oedp run --timing 执行的耗时报告。
+
+        如果没有指定路径，以当前路径作为项目路径，否则以指明的路径为项目路径。
+        """
+        report_command = self.subparsers.add_parser(
+            'report',
+            prog='oedp report',
+            help='Show the timing report of an action',
+            usage='%(prog)s <action> [-p|--project <path>] [-n|--top <num>]'
+        )
+        report_command.add_argument(
+            'action',
+            type=str,
+            help='Specify the action to report'
+        )
+        report_command.add_argument(
+            '-p', '--project',
+            type=str,
+            default=os.getcwd(),
+            help='Specify the project path'
+        )
+        report_command.add_argument(
+            '-n', '--top',
+            type=int,
+            default=10,
+            help='Number of slowest items to show'
+        )
+        report_command.set_defaults(func=self._run_report_command)
+
+    def _add_cache_command(self):
+        """
+        oedp cache <subcommand> [<args>]
+
+        缓存管理
+        """
+        cache_command = self.subparsers.add_parser(
+            'cache',
+            prog='oedp cache',
+            help='Manage local caches',
+            usage='%(prog)s <subcommand> [<args>]'
+        )
+        subparsers = cache_command.add_subparsers(
+            dest='subcommand',
+            title='Available subcommands',
+            required=True,
+            metavar='<subcommand>'
+        )
+
+        # cache facts
+        facts_parser = subparsers.add_parser(
+            'facts',
+            help='List or clear cached ansible facts of a project'
+        )
+        facts_parser.add_argument(
+            '-p', '--project',
+            type=str,
+            default=os.getcwd(),
+            help='Specify the project path'
+        )
+        facts_parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Clear cached ansible facts of the project'
+        )
+        facts_parser.set_defaults(func=self._run_cache_command)
+
+        # cache list
+        list_parser = subparsers.add_parser(
+            'list',
+            help='List cached plugins'
+        )
+        list_parser.set_defaults(func=self._run_cache_command)
+
+        # cache prune
+        prune_parser = subparsers.add_parser(
+            'prune',
+            help='Evict least recently used plugins until the cache fits the quota'
+        )
+        prune_parser.add_argument(
+            '--max-size',
+            type=str,
+            help='Size to keep instead of the configured quota, e.g. 10G'
+        )
+        prune_parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Remove all cached plugins'
+        )
+        prune_parser.set_defaults(func=self._run_cache_command)
+
+        # cache stats
+        stats_parser = subparsers.add_parser(
+            'stats',
+            help='Show plugin cache usage'
+        )
+        stats_parser.set_defaults(func=self._run_cache_command)
+
     @staticmethod
     def _run_init_command(args):
         """
@@ -297,13 +492,22 @@ class OeDeployParser:
         project = args.project
         parent_dir = args.dir
         force = args.force
-        return InitCmd(plugin, project, parent_dir, force).run()
+        segments = args.segments
+        return InitCmd(plugin, project, parent_dir, force, segments).run()
 
     @staticmethod
     def _run_list_command(args):
         source = args.local
         return ListCmd(source).run()
 
+    @staticmethod
+    def _run_search_command(args):
+        keyword = args.keyword
+        all_versions = args.all
+        tag = args.tag
+        json_output = args.json
+        return SearchCmd(keyword, all_versions, tag, json_output).run()
+
     @staticmethod
     def _run_info_command(args):
         project = args.project
@@ -314,7 +518,14 @@ class OeDeployParser:
         action = args.action
         project = args.project
         debug = args.debug
-        return RunCmd(action, project, debug).run()
+        jobs = args.jobs
+        resume = args.resume
+        engine = args.engine
+        ssh_persist = args.ssh_persist
+        profile = args.profile
+        fact_ttl = args.fact_ttl
+        timing = args.timing
+        return RunCmd(action, project, debug, jobs, resume, engine, ssh_persist, profile, fact_ttl, timing).run()
 
     @staticmethod
     def _run_check_command(args):
@@ -326,6 +537,17 @@ class OeDeployParser:
     def _run_repo_command(args):
         return RepoCmd(args).run()
 
+    @staticmethod
+    def _run_report_command(args):
+        action = args.action
+        project = args.project
+        top = args.top
+        return ReportCmd(action, project, top).run()
+
+    @staticmethod
+    def _run_cache_command(args):
+        return CacheCmd(args).run()
+
     @staticmethod
     def _get_version():
         stdout, _, return_code = CommandExecutor.run_single_cmd(['rpm', '-q', 'oedp'])
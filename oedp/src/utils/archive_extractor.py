@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-02
+# ======================================================================================================================
+
+import os
+import shutil
+import subprocess
+import tarfile
+import threading
+import time
+from typing import List, Optional
+
+from src.constants.const import EXTRACT_PROGRESS_INTERVAL
+from src.exceptions.archive_exception import ArchiveException
+from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.plugin_store import format_size
+
+# 压缩格式对应的文件头
+_MAGIC_NUMBERS = [
+    (b'\x1f\x8b', 'gz'),
+    (b'\x28\xb5\x2f\xfd', 'zst'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'BZh', 'bz2'),
+]
+# 各压缩格式可用的外部解压程序，按优先级排列，均不可用时使用 tarfile 自带的解压
+_DECOMPRESSORS = {
+    'gz': [['pigz', '-dc']],
+    'zst': [['zstd', '-dcq']],
+    'xz': [['xz', '-dc', '-T0']],
+    'bz2': [['lbzip2', '-dc'], ['pbzip2', '-dc']],
+}
+# 读取解压程序输出时每次读取的字节数
+CHUNK_SIZE = 1024 * 1024
+
+
+def detect_compression(path: str) -> str:
+    """
+    根据文件头识别压缩格式，不依赖文件后缀。
+
+    :param path: 压缩包路径
+    :return: gz、zst、xz、bz2，未压缩时返回空字符串
+    """
+    with open(path, 'rb') as f:
+        header = f.read(6)
+    for magic, compression in _MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return compression
+    return ''
+
+
+def get_decompress_command(compression: str) -> Optional[List[str]]:
+    """
+    获取可用的外部解压程序。
+
+    :param compression: 压缩格式
+    :return: 解压命令，没有可用的解压程序时返回None
+    """
+    for command in _DECOMPRESSORS.get(compression, []):
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+class ArchiveStream:
+    def __init__(self, path: str):
+        """
+        以流的方式顺序读取插件压缩包，整个压缩包只读取一次。
+
+        存在 pigz、zstd 等外部解压程序时，由解压程序在单独的进程中解压，与解析、写入文件并行进行；
+        否则使用 tarfile 自带的解压。
+
+        :param path: 压缩包路径
+        """
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.tar = None
+        self._file = None
+        self._process = None
+
+    def __enter__(self):
+        try:
+            compression = detect_compression(self.path)
+            # 不使用缓冲，解压进程与当前进程共享文件偏移，可以据此计算解压进度
+            self._file = open(self.path, 'rb', buffering=0)
+            command = get_decompress_command(compression)
+            if command:
+                self._process = subprocess.Popen(command, stdin=self._file, stdout=subprocess.PIPE,
+                                                 stderr=subprocess.PIPE)
+                self.tar = tarfile.open(fileobj=self._process.stdout, mode='r|')
+            else:
+                self.tar = tarfile.open(fileobj=self._file, mode=f'r|{compression}')
+        except tarfile.CompressionError:
+            self.__exit__(None, None, None)
+            raise ArchiveException(f'unsupported compression of {self.path}, please install the decompressor')
+        except (OSError, tarfile.TarError) as e:
+            self.__exit__(None, None, None)
+            raise ArchiveException(f'failed to open {self.path}: {e}')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.tar is not None:
+            self.tar.close()
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process.stderr.close()
+        if self._file is not None:
+            self._file.close()
+
+    def position(self) -> int:
+        """
+        获取已读取的压缩数据大小。
+
+        :return: 字节数
+        """
+        try:
+            return os.lseek(self._file.fileno(), 0, os.SEEK_CUR)
+        except (OSError, ValueError):
+            return 0
+
+    def finish(self):
+        """
+        读取完全部成员后调用，等待解压程序退出并检查压缩数据是否完整。
+
+        :raises ArchiveException: 解压失败
+        """
+        if self._process is None:
+            return
+        while self._process.stdout.read(CHUNK_SIZE):
+            pass
+        stderr = self._process.stderr.read().decode(errors='replace').strip()
+        if self._process.wait() != 0:
+            raise ArchiveException(f'failed to decompress {self.path}: {stderr}')
+
+
+class ArchiveExtractor:
+    def __init__(self, archive_path: str, target_path: str, strip_components: int = 1):
+        """
+        解压插件压缩包，解压前检查每个成员，拒绝路径穿越、指向目标路径之外的链接以及设备文件。
+
+        :param archive_path: 压缩包路径
+        :param target_path: 解压路径
+        :param strip_components: 去除成员路径开头的层数，与 tar --strip-components 相同
+        """
+        self.archive_path = archive_path
+        self.target_path = os.path.realpath(target_path)
+        self.strip_components = strip_components
+        self.log = LoggerGenerator().get_logger('archive_extractor')
+
+    def extract(self) -> dict:
+        """
+        解压插件压缩包，解压期间定时输出进度与速度。
+
+        :return: {'files': 成员数量, 'size': 文件总大小, 'seconds': 耗时}
+        :raises ArchiveException: 压缩包损坏或包含不安全的成员
+        """
+        files, size = 0, 0
+        directories = []
+        start = time.monotonic()
+        stop = threading.Event()
+        with ArchiveStream(self.archive_path) as stream:
+            reporter = threading.Thread(target=self._report_progress, args=(stream, start, stop), daemon=True)
+            reporter.start()
+            try:
+                for member in stream.tar:
+                    if not self._prepare_member(member):
+                        continue
+                    # 目录的权限最后设置，避免只读目录导致其中的文件无法写入
+                    if member.isdir():
+                        directories.append(member)
+                    stream.tar.extract(member, self.target_path, set_attrs=not member.isdir(),
+                                       **self._get_extract_options())
+                    files += 1
+                    size += member.size if member.isfile() else 0
+                stream.finish()
+                for member in sorted(directories, key=lambda item: item.name, reverse=True):
+                    dir_path = os.path.join(self.target_path, member.name)
+                    stream.tar.chown(member, dir_path, False)
+                    stream.tar.utime(member, dir_path)
+                    stream.tar.chmod(member, dir_path)
+            except (OSError, tarfile.TarError, EOFError) as e:
+                raise ArchiveException(f'failed to extract {self.archive_path}: {e}')
+            finally:
+                stop.set()
+                reporter.join()
+        seconds = time.monotonic() - start
+        self.log.info(f'extracted {files} entries ({format_size(size)}) in {seconds:.1f}s, '
+                      f'{format_size(size / max(seconds, 0.001))}/s')
+        return {'files': files, 'size': size, 'seconds': seconds}
+
+    def _prepare_member(self, member: tarfile.TarInfo) -> bool:
+        """
+        去除成员路径开头的层数并检查成员是否安全。
+
+        :param member: 压缩包成员
+        :return: 是否需要解压，路径层数不足的成员（如顶层目录）无需解压
+        :raises ArchiveException: 成员不安全
+        """
+        name = self._strip(member.name)
+        if name is None:
+            return False
+        if member.isdev():
+            raise ArchiveException(f'refusing to extract device file {member.name}')
+        dest = self._check_inside(name, member.name)
+        if member.issym():
+            if os.path.isabs(member.linkname):
+                raise ArchiveException(f'refusing to extract absolute symlink {member.name} -> {member.linkname}')
+            self._check_inside(os.path.join(os.path.dirname(dest), member.linkname), member.name)
+        elif member.islnk():
+            linkname = self._strip(member.linkname)
+            if linkname is None:
+                raise ArchiveException(f'refusing to extract hard link {member.name} -> {member.linkname}')
+            self._check_inside(linkname, member.name)
+            member.linkname = linkname
+        member.name = name
+        return True
+
+    def _strip(self, name: str) -> Optional[str]:
+        parts = [part for part in name.split('/') if part not in ('', '.')]
+        if len(parts) <= self.strip_components:
+            return None
+        return '/'.join(parts[self.strip_components:])
+
+    def _check_inside(self, path: str, member_name: str) -> str:
+        """
+        检查路径解析已有的符号链接后仍在解压路径中。
+
+        :return: 解析后的路径
+        :raises ArchiveException: 路径在解压路径之外
+        """
+        dest = os.path.realpath(os.path.join(self.target_path, path))
+        if os.path.commonpath([self.target_path, dest]) != self.target_path:
+            raise ArchiveException(f'refusing to extract {member_name} outside of {self.target_path}')
+        return dest
+
+    @staticmethod
+    def _get_extract_options() -> dict:
+        # 成员已经检查过，保持与 tar 命令相同的权限处理
+        if hasattr(tarfile, 'fully_trusted_filter'):
+            return {'filter': 'fully_trusted'}
+        return {}
+
+    def _report_progress(self, stream: ArchiveStream, start: float, stop: threading.Event):
+        name = os.path.basename(self.archive_path)
+        while not stop.wait(EXTRACT_PROGRESS_INTERVAL):
+            position = stream.position()
+            seconds = time.monotonic() - start
+            percent = position * 100 / stream.size if stream.size else 100
+            self.log.info(f'extracting {name}: {percent:.0f}% ({format_size(position)}/{format_size(stream.size)}), '
+                          f'{format_size(position / seconds)}/s')
@@ -15,6 +15,12 @@ import os
 import signal
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+
+# 实时输出模式下，每个管道最多保留的输出行数
+MAX_OUTPUT_LINES = 10000
 
 
 class CommandExecutor:
@@ -100,15 +106,32 @@ class CommandExecutor:
 
     @staticmethod
     def _get_stdout_stderr(pipe, timeout, print_on_console):
-        if print_on_console:
-            stdout, stderr = '', ''
-            for stdout_line in iter(pipe.stdout.readline, ''):
-                stdout += stdout_line
-                print(stdout_line, end='')
-            for stderr_line in iter(pipe.stderr.readline, ''):
-                stderr += stderr_line
-                print(stderr_line, end='')
-            pipe.wait(timeout=timeout)
-        else:
-            stdout, stderr = pipe.communicate(timeout=timeout)
-        return stdout, stderr
+        if not print_on_console:
+            return pipe.communicate(timeout=timeout)
+
+        # 同时读取 stdout 和 stderr，避免其中一个管道写满导致子进程阻塞；仅保留最近的输出，内存占用有上限
+        stdout_lines = deque(maxlen=MAX_OUTPUT_LINES)
+        stderr_lines = deque(maxlen=MAX_OUTPUT_LINES)
+        print_lock = threading.Lock()
+        readers = [
+            threading.Thread(target=CommandExecutor._drain_stream, args=(stream, lines, print_lock), daemon=True)
+            for stream, lines in ((pipe.stdout, stdout_lines), (pipe.stderr, stderr_lines))
+        ]
+        for reader in readers:
+            reader.start()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for reader in readers:
+            reader.join(None if deadline is None else max(0, deadline - time.monotonic()))
+            if reader.is_alive():
+                raise subprocess.TimeoutExpired(pipe.args, timeout)
+        pipe.wait(timeout=None if deadline is None else max(0, deadline - time.monotonic()))
+        return ''.join(stdout_lines), ''.join(stderr_lines)
+
+    @staticmethod
+    def _drain_stream(stream, lines, print_lock):
+        for line in iter(stream.readline, ''):
+            lines.append(line)
+            with print_lock:
+                print(line, end='', flush=True)
+        stream.close()
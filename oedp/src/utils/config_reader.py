@@ -11,12 +11,16 @@
 # Create: 2024-12-23
 # ======================================================================================================================
 
+import hashlib
 import json
 import os
+import stat
 
 import yaml
 
+from src.constants.paths import INVENTORY_CACHE_DIR, PROJECT_CONFIG
 from src.exceptions.config_exception import ConfigException
+from src.utils.tools import get_project_id
 
 
 def _get_key_word_map():
@@ -32,29 +36,168 @@ _key_word_map = _get_key_word_map()
 
 
 class ConfigReader:
-    def __init__(self, project):
+    def __init__(self, project, cache_dir: str = INVENTORY_CACHE_DIR):
         """
         读取指定项目目录下的配置文件。
 
+        配置文件解析后以 json 格式缓存，配置文件未修改时直接读取缓存，并可以作为 inventory 直接传给 ansible。
+        配置中可能包含密码，每个用户使用仅自己可以访问的缓存目录。
+
         :param project: 项目目录的路径
+        :param cache_dir: 配置文件解析结果的缓存目录
         """
         if not os.path.exists(project):
             raise ConfigException(f'Project {project} not found')
 
-        config_file = os.path.join(project, 'config.yaml')
+        config_file = os.path.join(project, PROJECT_CONFIG)
         if not os.path.exists(config_file):
             raise ConfigException(f'Config file {config_file} not found')
 
-        with open(config_file, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        self.config_file = os.path.abspath(config_file)
+        project_id = get_project_id(project)
+        self.cache_path = os.path.join(cache_dir, str(os.getuid()))
+        self.meta_file = os.path.join(self.cache_path, f'{project_id}.meta.json')
+        self.inventory_file = os.path.join(self.cache_path, f'{project_id}.inventory.json')
+        self._inventory = None
+        self._cached = False
+
+        self.config = self._load_cache()
+        if self.config is None:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                self.config = yaml.safe_load(f)
+            self._save_cache()
 
     def config2inventory(self):
+        if self._inventory is not None:
+            return self._inventory
         if 'all' not in self.config:
             raise ConfigException(f'Missing "all" in config file')
         inventory = {'all': {}}
         self._read_group(self.config['all'], inventory['all'])
+        self._inventory = inventory
         return inventory
 
+    def get_inventory_file(self) -> str:
+        """
+        获取传给 ansible 的 inventory 文件路径。
+
+        优先使用 json 格式的缓存，ansible 解析 json 比 yaml 更快；没有可用缓存，或者配置文件旁边存在
+        group_vars、host_vars 目录（ansible 根据 inventory 所在目录读取）时，使用原始配置文件。
+
+        :return: inventory 文件路径
+        """
+        if not self._cached:
+            return self.config_file
+        project = os.path.dirname(self.config_file)
+        for vars_dir in ('group_vars', 'host_vars'):
+            if os.path.exists(os.path.join(project, vars_dir)):
+                return self.config_file
+        return self.inventory_file
+
+    def _get_config_digest(self) -> str:
+        sha256_hash = hashlib.sha256()
+        with open(self.config_file, 'rb') as f:
+            for byte_block in iter(lambda: f.read(1024 * 1024), b''):
+                sha256_hash.update(byte_block)
+        return sha256_hash.hexdigest()
+
+    def _load_cache(self):
+        """
+        读取配置文件的解析缓存。修改时间与大小未变化时直接使用缓存；修改时间变化但内容未变化时更新缓存的修改时间。
+
+        :return: 配置内容，缓存不可用时返回None
+        """
+        try:
+            if not all(self._is_private(path) for path in (self.cache_path, self.meta_file, self.inventory_file)):
+                return None
+            with open(self.meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stat_result = os.stat(self.config_file)
+            if meta.get('config_file') != self.config_file or meta.get('size') != stat_result.st_size:
+                return None
+            if meta.get('mtime_ns') != stat_result.st_mtime_ns:
+                if meta.get('sha256') != self._get_config_digest():
+                    return None
+                meta['mtime_ns'] = stat_result.st_mtime_ns
+                self._write_json(self.meta_file, meta)
+            with open(self.inventory_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError, AttributeError):
+            return None
+        self._cached = True
+        return config
+
+    def _save_cache(self):
+        try:
+            # 仅缓存可以与 json 无损转换的配置，例如包含日期、非字符串键的配置仍直接使用原始文件
+            content = json.dumps(self.config)
+            if json.loads(content) != self.config:
+                return
+            stat_result = os.stat(self.config_file)
+            meta = {
+                'config_file': self.config_file,
+                'mtime_ns': stat_result.st_mtime_ns,
+                'size': stat_result.st_size,
+                'sha256': self._get_config_digest()
+            }
+            os.makedirs(self.cache_path, mode=stat.S_IRWXU, exist_ok=True)
+            if not self._is_private(self.cache_path):
+                return
+            self._write_text(self.inventory_file, content)
+            self._write_json(self.meta_file, meta)
+        except (OSError, TypeError, ValueError):
+            return
+        self._cached = True
+
+    @staticmethod
+    def _is_private(path: str) -> bool:
+        """
+        检查缓存文件或目录属于当前用户，且其他用户无法读写，避免读取被篡改的缓存。
+
+        :param path: 文件或目录路径
+        :return: 是否可以信任
+        """
+        stat_result = os.lstat(path)
+        if stat.S_ISLNK(stat_result.st_mode) or stat_result.st_uid != os.getuid():
+            return False
+        return stat_result.st_mode & (stat.S_IRWXG | stat.S_IRWXO) == 0
+
+    @staticmethod
+    def _write_json(path: str, data: dict):
+        ConfigReader._write_text(path, json.dumps(data))
+
+    @staticmethod
+    def _write_text(path: str, content: str):
+        temp_file = f'{path}.{os.getpid()}.tmp'
+        if os.path.lexists(temp_file):
+            os.remove(temp_file)
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, stat.S_IRUSR | stat.S_IWUSR)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_file, path)
+
+    def get_hosts(self) -> set:
+        """
+        获取配置文件中的所有主机。
+
+        :return: 主机名称集合
+        """
+        if 'all' not in self.config:
+            raise ConfigException(f'Missing "all" in config file')
+        hosts = set()
+        ConfigReader._collect_hosts(self.config['all'], hosts)
+        return hosts
+
+    @staticmethod
+    def _collect_hosts(source: dict, hosts: set):
+        if not isinstance(source, dict):
+            return
+        if isinstance(source.get('hosts'), dict):
+            hosts.update(source['hosts'].keys())
+        if isinstance(source.get('children'), dict):
+            for subgroup in source['children'].values():
+                ConfigReader._collect_hosts(subgroup, hosts)
+
     @staticmethod
     def _read_group(source: dict, result: dict):
         if 'children' in source:
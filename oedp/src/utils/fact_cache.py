@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-18
+# ======================================================================================================================
+
+import os
+import stat
+import time
+
+from src.constants.const import FACT_CACHE_TTL
+from src.constants.paths import FACT_CACHE_DIR
+from src.utils.tools import get_project_id
+
+
+class FactCache:
+    def __init__(self, project: str, ttl: int = FACT_CACHE_TTL, cache_dir: str = FACT_CACHE_DIR):
+        """
+        ansible facts 的 jsonfile 缓存，按主机保存，在同一项目的任务之间以及多次执行之间共享。
+
+        :param project: 项目目录路径
+        :param ttl: 缓存有效时间（秒）
+        :param cache_dir: 缓存的父目录
+        """
+        self.ttl = ttl
+        # facts 中包含主机的详细信息，每个用户使用独立的目录；
+        # 缓存以主机名称为键，不同项目可能使用相同的主机名称，每个项目再使用独立的目录
+        self.user_path = os.path.join(cache_dir, str(os.getuid()))
+        self.cache_path = os.path.join(self.user_path, get_project_id(project))
+
+    @staticmethod
+    def count_hosts(cache_dir: str = FACT_CACHE_DIR) -> int:
+        """
+        统计当前用户在所有项目中缓存的 facts 数量。
+
+        :param cache_dir: 缓存的父目录
+        :return: 数量
+        """
+        user_path = os.path.join(cache_dir, str(os.getuid()))
+        if not os.path.isdir(user_path):
+            return 0
+        count = 0
+        for project_id in os.listdir(user_path):
+            project_path = os.path.join(user_path, project_id)
+            if os.path.isdir(project_path):
+                count += len([host for host in os.listdir(project_path) if not host.startswith('.')])
+        return count
+
+    def get_settings(self) -> dict:
+        """
+        创建缓存目录，并返回 ansible.cfg 中 [defaults] 下的缓存配置项。
+
+        :return: 配置项
+        """
+        for path in (self.user_path, self.cache_path):
+            os.makedirs(path, mode=stat.S_IRWXU, exist_ok=True)
+        return {
+            'gathering': 'smart',
+            'fact_caching': 'jsonfile',
+            'fact_caching_connection': self.cache_path,
+            'fact_caching_timeout': str(self.ttl)
+        }
+
+    def list_hosts(self) -> list:
+        """
+        列举已缓存 facts 的主机。
+
+        :return: [(主机名称, 更新时间, 是否已过期)]
+        """
+        if not os.path.isdir(self.cache_path):
+            return []
+        now = time.time()
+        hosts = []
+        for host in sorted(os.listdir(self.cache_path)):
+            path = os.path.join(self.cache_path, host)
+            if host.startswith('.') or not os.path.isfile(path):
+                continue
+            mtime = os.path.getmtime(path)
+            hosts.append((host, mtime, now - mtime > self.ttl))
+        return hosts
+
+    def clear(self) -> int:
+        """
+        清除项目已缓存的 facts。
+
+        :return: 清除的主机数量
+        """
+        count = 0
+        for host, _, _ in self.list_hosts():
+            os.remove(os.path.join(self.cache_path, host))
+            count += 1
+        return count
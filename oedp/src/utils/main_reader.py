@@ -16,7 +16,9 @@ import os
 import tarfile
 import yaml
 
+from src.exceptions.archive_exception import ArchiveException
 from src.exceptions.config_exception import ConfigException
+from src.utils.archive_extractor import ArchiveStream
 
 
 class MainReader:
@@ -29,20 +31,21 @@ class MainReader:
 
         if project.endswith('.tar.gz'):
             base_name = os.path.basename(project)[:-7]
+            main_path = os.path.join(base_name, 'main.yaml')
             try:
-                with tarfile.open(project, 'r:gz') as tar:
-                    tar_names = tar.getnames()
-
-                    main_path = os.path.join(base_name, 'main.yaml')
-                    if main_path not in tar_names:
-                        raise ConfigException(f'Main info file not found in {project}')
-
-                    tar_file = tar.extractfile(main_path)
-                    if tar_file is not None:
+                # 顺序读取到 main.yaml 即停止，无需解压整个压缩包
+                with ArchiveStream(project) as stream:
+                    for member in stream.tar:
+                        if os.path.normpath(member.name) != main_path:
+                            continue
+                        tar_file = stream.tar.extractfile(member)
+                        if tar_file is None:
+                            raise ConfigException(f"Failed to extract {main_path} from {project}")
                         self.main = yaml.safe_load(tar_file.read())
+                        break
                     else:
-                        raise ConfigException(f"Failed to extract {main_path} from {project}")
-            except tarfile.TarError as e:
+                        raise ConfigException(f'Main info file not found in {project}')
+            except (tarfile.TarError, ArchiveException) as e:
                 raise ConfigException(f'Failed to extract {project}: {e}')
 
         else:
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-26
+# ======================================================================================================================
+
+import configparser
+import difflib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import yaml
+
+from src.constants.paths import PLUGIN_INDEX_PATH, REPO_CACHE_DIR, REPO_CONFIG_PATH
+from src.utils.log.logger_generator import LoggerGenerator
+
+# 索引结构变化时递增，旧版本的索引会被重新生成
+SCHEMA_VERSION = 2
+
+# 倒排索引中词所在的字段，以及匹配时的权重
+FIELD_NAME = 0
+FIELD_TAG = 1
+FIELD_DESCRIPTION = 2
+_FIELD_WEIGHTS = {FIELD_NAME: 3.0, FIELD_TAG: 2.0, FIELD_DESCRIPTION: 1.0}
+
+# 各匹配方式的得分：完全匹配、前缀匹配、子串匹配，模糊匹配按相似度折算
+_EXACT_SCORE = 1.0
+_PREFIX_SCORE = 0.8
+_SUBSTRING_SCORE = 0.6
+_FUZZY_SCORE = 0.5
+# 模糊匹配的最小词长度与最低相似度
+_FUZZY_MIN_LENGTH = 3
+_FUZZY_CUTOFF = 0.75
+# 插件名称与关键字完全相同时的额外得分
+_NAME_MATCH_BONUS = 10.0
+# sqlite 单条语句中参数数量的上限
+_QUERY_CHUNK_SIZE = 500
+
+# 插件源索引可能包含数千个插件版本，优先使用 libyaml 解析
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_UPDATED_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+-]\d{2}:?\d{2})?$')
+
+
+def parse_updated(value) -> float:
+    """
+    解析插件的更新时间，兼容纳秒精度以及不带时区的时间。
+
+    :param value: 索引中的 updated 字段
+    :return: 时间戳，无法解析时返回0
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    match = _UPDATED_PATTERN.match(str(value or '').strip())
+    if not match:
+        return 0.0
+    zone = match.group(3) or ''
+    zone = '+00:00' if zone == 'Z' else zone
+    fmt = '%Y-%m-%dT%H:%M:%S%z' if zone else '%Y-%m-%dT%H:%M:%S'
+    try:
+        timestamp = datetime.strptime(match.group(1) + zone, fmt).timestamp()
+    except ValueError:
+        return 0.0
+    return timestamp + float(match.group(2) or 0)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    将文本切分为小写的词，非 ascii 字符（如中文）连续的部分作为一个词。
+
+    :param text: 文本
+    :return: 词列表
+    """
+    return re.findall(r'[a-z0-9]+|[^\x00-\x7f]+', str(text or '').lower())
+
+
+def get_tags(entry: Dict) -> List[str]:
+    """
+    获取插件的标签，允许为列表或者逗号分隔的字符串。
+
+    :param entry: 插件版本信息
+    :return: 小写的标签列表
+    """
+    tags = entry.get('tags') or []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    if not isinstance(tags, list):
+        return []
+    return [str(tag).strip().lower() for tag in tags if str(tag).strip()]
+
+
+class PluginIndex:
+    def __init__(self, cache_dir: str = REPO_CACHE_DIR, index_path: str = PLUGIN_INDEX_PATH,
+                 repo_config: str = REPO_CONFIG_PATH):
+        """
+        由所有插件源索引缓存生成的插件查询索引。
+
+        索引使用 sqlite 保存并按插件名称建立索引，查询时无需解析 yaml；插件源索引缓存变化后自动重新生成。
+
+        :param cache_dir: 插件源索引缓存目录
+        :param index_path: 插件查询索引路径
+        :param repo_config: 插件源配置文件，用于确定插件源的优先级
+        """
+        self.cache_dir = cache_dir
+        self.index_path = index_path
+        self.repo_config = repo_config
+        self.log = LoggerGenerator().get_logger('plugin_index')
+
+    def build(self) -> bool:
+        """
+        根据插件源索引缓存生成插件查询索引。
+
+        :return: 是否生成成功
+        """
+        if not os.path.isdir(os.path.dirname(self.index_path)):
+            return False
+        temp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            conn = sqlite3.connect(temp_path)
+            try:
+                self._fill(conn, self._get_sources())
+            finally:
+                conn.close()
+            os.replace(temp_path, self.index_path)
+        except (OSError, sqlite3.Error) as e:
+            self.log.warning(f'Failed to build plugin index {self.index_path}: {e}')
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        return True
+
+    def find_latest(self, name: str) -> Optional[Dict]:
+        """
+        查找插件的最新版本。多个插件源中都存在时，使用插件源配置中靠前的插件源。
+
+        :param name: 插件名称
+        :return: 插件版本信息，不存在时返回None
+        """
+        rows = self._query('SELECT data, repo FROM plugins WHERE name = ? ORDER BY repo_order, rank DESC LIMIT 1',
+                           (name,))
+        return rows[0] if rows else None
+
+    def get_versions(self, name: str) -> List[Dict]:
+        """
+        查找插件的所有版本，按插件源优先级、版本从新到旧排列。
+
+        :param name: 插件名称
+        :return: 插件版本信息列表
+        """
+        return self._query('SELECT data, repo FROM plugins WHERE name = ? ORDER BY repo_order, rank DESC', (name,))
+
+    def search(self, keyword: str, all_versions: bool = False, tag: str = None) -> List[Dict]:
+        """
+        在插件名称、标签以及描述的倒排索引中查找插件，支持前缀、子串以及模糊匹配，按匹配程度排序。
+
+        关键字中的多个词需要全部匹配；关键字为空时列出所有插件。
+
+        :param keyword: 关键字
+        :param all_versions: 是否列出所有版本，默认只列出每个插件源中的最新版本
+        :param tag: 只列出带有该标签的插件
+        :return: 插件版本信息列表，score 为匹配得分
+        """
+        conn = self._connect()
+        try:
+            scores = self._match(conn, keyword)
+            if tag:
+                tagged = set(conn.execute('SELECT name, repo FROM terms WHERE field = ? AND term = ?',
+                                          (FIELD_TAG, tag.strip().lower())).fetchall())
+                scores = {key: score for key, score in scores.items() if key in tagged}
+            repo_order = dict(conn.execute('SELECT repo, repo_order FROM sources').fetchall())
+            latest = '' if all_versions else 'AND latest = 1'
+            result = []
+            for name, repo in sorted(scores, key=lambda key: (-scores[key], key[0], repo_order.get(key[1], 0))):
+                rows = conn.execute(f'SELECT data, repo FROM plugins WHERE name = ? AND repo = ? {latest} '
+                                    f'ORDER BY rank DESC', (name, repo)).fetchall()
+                for entry in self._to_entries(rows):
+                    entry['score'] = round(scores[(name, repo)], 2)
+                    result.append(entry)
+        finally:
+            conn.close()
+        return result
+
+    @staticmethod
+    def _match(conn: sqlite3.Connection, keyword: str) -> Dict[tuple, float]:
+        """
+        计算关键字与各插件的匹配得分。
+
+        :param conn: 数据库连接
+        :param keyword: 关键字
+        :return: {(插件名称, 插件源名称): 得分}
+        """
+        tokens = tokenize(keyword)
+        if not tokens:
+            if keyword.strip():
+                return {}
+            return {key: 0.0 for key in conn.execute('SELECT DISTINCT name, repo FROM plugins').fetchall()}
+
+        vocabulary = [row[0] for row in conn.execute('SELECT DISTINCT term FROM terms').fetchall()]
+        scores = None
+        for token in tokens:
+            qualities = {}
+            for term in vocabulary:
+                if term == token:
+                    qualities[term] = _EXACT_SCORE
+                elif term.startswith(token):
+                    qualities[term] = _PREFIX_SCORE
+                elif token in term:
+                    qualities[term] = _SUBSTRING_SCORE
+            if len(token) >= _FUZZY_MIN_LENGTH:
+                for term in difflib.get_close_matches(token, vocabulary, n=10, cutoff=_FUZZY_CUTOFF):
+                    ratio = difflib.SequenceMatcher(None, token, term).ratio()
+                    qualities.setdefault(term, _FUZZY_SCORE * ratio)
+
+            token_scores = {}
+            terms = list(qualities)
+            for i in range(0, len(terms), _QUERY_CHUNK_SIZE):
+                chunk = terms[i:i + _QUERY_CHUNK_SIZE]
+                rows = conn.execute(f'SELECT term, field, name, repo FROM terms WHERE term IN '
+                                    f'({", ".join("?" * len(chunk))})', chunk).fetchall()
+                for term, field, name, repo in rows:
+                    score = _FIELD_WEIGHTS[field] * qualities[term]
+                    token_scores[(name, repo)] = max(token_scores.get((name, repo), 0.0), score)
+
+            # 多个词需要全部匹配，得分累加
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {key: scores[key] + score for key, score in token_scores.items() if key in scores}
+
+        normalized = keyword.strip().lower()
+        for key in scores:
+            if key[0].lower() == normalized:
+                scores[key] += _NAME_MATCH_BONUS
+        return scores
+
+    def _query(self, sql: str, params: tuple) -> List[Dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return self._to_entries(rows)
+
+    @staticmethod
+    def _to_entries(rows: List[tuple]) -> List[Dict]:
+        result = []
+        for data, repo in rows:
+            entry = json.loads(data)
+            entry['repo'] = repo
+            result.append(entry)
+        return result
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开插件查询索引，索引过期时重新生成；没有写权限时在内存中生成。
+
+        :return: 数据库连接
+        """
+        sources = self._get_sources()
+        try:
+            conn = sqlite3.connect(f'file:{self.index_path}?mode=ro', uri=True)
+            if self._is_fresh(conn, sources):
+                return conn
+            conn.close()
+        except sqlite3.Error:
+            pass
+        if self.build():
+            return sqlite3.connect(f'file:{self.index_path}?mode=ro', uri=True)
+        conn = sqlite3.connect(':memory:')
+        self._fill(conn, sources)
+        return conn
+
+    @staticmethod
+    def _is_fresh(conn: sqlite3.Connection, sources: List[tuple]) -> bool:
+        try:
+            if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                return False
+            indexed = conn.execute('SELECT repo, mtime_ns, size FROM sources ORDER BY repo_order').fetchall()
+        except sqlite3.Error:
+            return False
+        return indexed == [(repo, mtime_ns, size) for repo, _, mtime_ns, size in sources]
+
+    def _get_sources(self) -> List[tuple]:
+        """
+        获取所有插件源索引缓存，按插件源配置中的顺序排列。
+
+        :return: [(插件源名称, 索引缓存路径, 修改时间, 大小)]
+        """
+        repo_order = []
+        config = configparser.ConfigParser()
+        try:
+            config.read(self.repo_config)
+            repo_order = config.sections()
+        except configparser.Error:
+            pass
+        sources = []
+        if not os.path.isdir(self.cache_dir):
+            return sources
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.yaml'):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            stat_result = os.stat(path)
+            sources.append((filename[:-len('.yaml')], path, stat_result.st_mtime_ns, stat_result.st_size))
+        sources.sort(key=lambda source: (repo_order.index(source[0]) if source[0] in repo_order else len(repo_order),
+                                         source[0]))
+        return sources
+
+    def _fill(self, conn: sqlite3.Connection, sources: List[tuple]):
+        conn.executescript('''
+            CREATE TABLE sources (repo TEXT, repo_order INTEGER, mtime_ns INTEGER, size INTEGER);
+            CREATE TABLE plugins (name TEXT, version TEXT, repo TEXT, repo_order INTEGER, rank INTEGER,
+                                  latest INTEGER, data TEXT);
+            CREATE TABLE terms (term TEXT, field INTEGER, name TEXT, repo TEXT);
+        ''')
+        for repo_order, (repo, path, mtime_ns, size) in enumerate(sources):
+            conn.execute('INSERT INTO sources VALUES (?, ?, ?, ?)', (repo, repo_order, mtime_ns, size))
+            for name, versions in self._read_repo_index(path).items():
+                # 与原有规则一致：先比较版本号，再比较更新时间
+                versions.sort(key=lambda v: (str(v['version']), parse_updated(v.get('updated'))))
+                conn.executemany('INSERT INTO plugins VALUES (?, ?, ?, ?, ?, ?, ?)', [
+                    (name, str(version['version']), repo, repo_order, rank, int(rank == len(versions) - 1),
+                     json.dumps(version, default=str))
+                    for rank, version in enumerate(versions)
+                ])
+                conn.executemany('INSERT INTO terms VALUES (?, ?, ?, ?)',
+                                 [(term, field, name, repo) for term, field in self._get_terms(name, versions[-1])])
+        conn.execute('CREATE INDEX plugins_name ON plugins (name, repo_order, rank)')
+        conn.execute('CREATE INDEX terms_term ON terms (term)')
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.commit()
+
+    @staticmethod
+    def _get_terms(name: str, entry: Dict) -> set:
+        """
+        获取插件最新版本在倒排索引中的词。标签除切分后的词外，完整的标签也作为一个词，用于按标签过滤。
+
+        :param name: 插件名称
+        :param entry: 插件最新版本信息
+        :return: {(词, 字段)}
+        """
+        terms = {(term, FIELD_NAME) for term in tokenize(name)}
+        for tag in get_tags(entry):
+            terms.add((tag, FIELD_TAG))
+            terms.update((term, FIELD_TAG) for term in tokenize(tag))
+        terms.update((term, FIELD_DESCRIPTION) for term in tokenize(entry.get('description')))
+        return terms
+
+    def _read_repo_index(self, path: str) -> Dict[str, List[Dict]]:
+        """
+        读取插件源索引缓存。
+
+        :param path: 索引缓存路径
+        :return: {插件名称: [插件版本信息]}
+        """
+        plugins = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=_YAML_LOADER)
+        except (OSError, yaml.YAMLError) as e:
+            self.log.warning(f'Failed to parse index file {path}: {e}')
+            return plugins
+        if not isinstance(data, dict) or not isinstance(data.get('plugins'), list):
+            return plugins
+        for plugin_entry in data['plugins']:
+            if not isinstance(plugin_entry, dict):
+                continue
+            for name, versions in plugin_entry.items():
+                if not isinstance(versions, list):
+                    continue
+                versions = [v for v in versions if isinstance(v, dict) and 'version' in v]
+                if versions:
+                    plugins.setdefault(str(name), []).extend(versions)
+        return plugins
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-03
+# ======================================================================================================================
+
+import json
+import os
+from typing import Optional
+
+from src.constants.const import DIR_MODE
+from src.constants.paths import PLUGIN_META_CACHE_PATH
+
+
+class PluginMetaCache:
+    def __init__(self, cache_file: str = PLUGIN_META_CACHE_PATH):
+        """
+        插件压缩包元数据的缓存，按压缩包路径保存 main.yaml 中的名称、版本与说明。
+
+        压缩包的大小与修改时间未变化时直接使用缓存，无需再次解压读取 main.yaml。
+
+        :param cache_file: 缓存文件路径
+        """
+        self.cache_file = cache_file
+        self._entries = self._load()
+        self._changed = False
+
+    def get(self, path: str) -> Optional[dict]:
+        """
+        获取插件压缩包的元数据缓存。
+
+        :param path: 插件压缩包路径
+        :return: {'name', 'version', 'description'}，缓存不存在或压缩包已变化时返回None
+        """
+        entry = self._entries.get(os.path.abspath(path))
+        if not isinstance(entry, dict):
+            return None
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        if entry.get('size') != stat_result.st_size or entry.get('mtime_ns') != stat_result.st_mtime_ns:
+            return None
+        return entry.get('meta')
+
+    def set(self, path: str, meta: dict):
+        """
+        记录插件压缩包的元数据。
+
+        :param path: 插件压缩包路径
+        :param meta: {'name', 'version', 'description'}
+        """
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return
+        self._entries[os.path.abspath(path)] = {
+            'size': stat_result.st_size,
+            'mtime_ns': stat_result.st_mtime_ns,
+            'meta': meta
+        }
+        self._changed = True
+
+    def save(self):
+        """
+        写回缓存文件，同时去除压缩包已不存在的记录。写入失败时不影响使用。
+        """
+        if not self._changed:
+            return
+        entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+        temp_file = f'{self.cache_file}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), mode=DIR_MODE, exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(temp_file, self.cache_file)
+        except (OSError, TypeError, ValueError):
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            return
+        self._changed = False
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-01
+# ======================================================================================================================
+
+import configparser
+import fcntl
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, List, Optional, Tuple
+
+from src.constants.const import PLUGIN_CACHE_QUOTA
+from src.constants.paths import CACHE_CONFIG_PATH, PLUGIN_DIR, PLUGIN_STORE_DIR
+from src.utils.log.logger_generator import LoggerGenerator
+
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+_SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+# 使目标文件与源文件共享数据块的 ioctl 请求号
+_FICLONE = 0x40049409
+
+
+def parse_size(value) -> int:
+    """
+    解析带单位的大小，如 500M、20G。
+
+    :param value: 大小，单位可以是 K、M、G、T，不带单位时为字节数
+    :return: 字节数
+    :raises ValueError: 格式错误
+    """
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$', str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f'invalid size: {value}')
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    """
+    将字节数转换为便于阅读的大小。
+
+    :param size: 字节数
+    :return: 带单位的大小
+    """
+    for unit in ('B', 'K', 'M', 'G'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}T'
+
+
+def get_plugin_cache_quota(config_path: str = CACHE_CONFIG_PATH) -> int:
+    """
+    读取插件缓存的空间配额。
+
+    :param config_path: 缓存配置文件
+    :return: 配额字节数，0表示不限制
+    """
+    config = configparser.ConfigParser()
+    try:
+        config.read(config_path)
+        return parse_size(config.get('plugin', 'quota', fallback=PLUGIN_CACHE_QUOTA))
+    except (configparser.Error, ValueError):
+        return parse_size(PLUGIN_CACHE_QUOTA)
+
+
+class PluginStore:
+    def __init__(self, store_dir: str = PLUGIN_STORE_DIR, plugin_dir: str = PLUGIN_DIR, quota: int = None):
+        """
+        按 sha256 保存插件文件的内容寻址缓存。
+
+        插件以 <sha256>.tar.gz 保存，不同插件源中同名但内容不同的插件互不覆盖；使用时通过硬链接（跨文件系统时通过
+        reflink 或复制）放到插件缓存目录中。缓存总大小超过配额时，按最近使用时间淘汰。
+
+        :param store_dir: 内容寻址缓存目录
+        :param plugin_dir: 插件缓存目录
+        :param quota: 空间配额字节数，0表示不限制，为None时读取缓存配置文件
+        """
+        self.store_dir = store_dir
+        self.plugin_dir = plugin_dir
+        self.quota = get_plugin_cache_quota() if quota is None else quota
+        self.usage_file = os.path.join(store_dir, 'usage.json')
+        self.log = LoggerGenerator().get_logger('plugin_store')
+
+    def get_path(self, sha256: str) -> str:
+        """
+        获取插件在缓存中的路径。
+
+        :param sha256: 插件的 sha256
+        :return: 缓存路径
+        """
+        sha256 = sha256.lower()
+        return os.path.join(self.store_dir, sha256[:2], f'{sha256}.tar.gz')
+
+    def get(self, sha256: str) -> Optional[str]:
+        """
+        查找插件缓存，并更新最近使用时间。
+
+        :param sha256: 插件的 sha256
+        :return: 缓存路径，不存在时返回None
+        """
+        if not sha256 or not _SHA256_PATTERN.match(sha256.lower()):
+            return None
+        path = self.get_path(sha256)
+        try:
+            if not stat.S_ISREG(os.lstat(path).st_mode):
+                return None
+            with self._usage() as usage:
+                usage[sha256.lower()]['last_used'] = time.time()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.log.warning(f'Failed to read plugin cache: {e}')
+            return None
+        return path
+
+    def add(self, path: str, sha256: str, name: str) -> Optional[str]:
+        """
+        将已校验的插件文件加入缓存，超出配额时淘汰最久未使用的插件。
+
+        :param path: 插件文件路径
+        :param sha256: 插件的 sha256
+        :param name: 插件文件名称
+        :return: 缓存路径，失败时返回None
+        """
+        sha256 = sha256.lower()
+        if not _SHA256_PATTERN.match(sha256):
+            return None
+        store_path = self.get_path(sha256)
+        try:
+            if not os.path.isfile(store_path):
+                self._makedirs(os.path.dirname(store_path))
+                if not self._link(path, store_path):
+                    return None
+            with self._usage() as usage:
+                usage[sha256] = {'name': name, 'size': os.path.getsize(store_path), 'last_used': time.time()}
+                self._evict(usage, self.quota, keep={sha256})
+        except OSError as e:
+            self.log.warning(f'Failed to add {path} to plugin cache: {e}')
+            return None
+        return store_path
+
+    def discard(self, sha256: str) -> bool:
+        """
+        删除缓存中的插件，用于内容与 sha256 不一致的插件。
+
+        :param sha256: 插件的 sha256
+        :return: 是否成功
+        """
+        sha256 = sha256.lower()
+        try:
+            with self._usage() as usage:
+                info = usage.pop(sha256, {})
+                self._remove_object(sha256, info.get('name', ''))
+        except OSError as e:
+            self.log.warning(f'Failed to remove {sha256} from plugin cache: {e}')
+            return False
+        return True
+
+    def materialize(self, sha256: str, dest: str) -> bool:
+        """
+        将缓存中的插件放到指定路径，已经指向同一文件时不做处理。
+
+        :param sha256: 插件的 sha256
+        :param dest: 目标路径
+        :return: 是否成功
+        """
+        store_path = self.get_path(sha256)
+        try:
+            if os.path.exists(dest) and os.path.samefile(store_path, dest):
+                return True
+        except OSError:
+            pass
+        return self._link(store_path, dest)
+
+    def list(self) -> List[dict]:
+        """
+        列举缓存的插件，按最近使用时间从新到旧排列。
+
+        :return: [{'sha256', 'name', 'size', 'last_used'}]
+        """
+        with self._usage() as usage:
+            entries = [dict(info, sha256=sha256) for sha256, info in usage.items()]
+        entries.sort(key=lambda entry: entry.get('last_used', 0), reverse=True)
+        return entries
+
+    def stats(self) -> dict:
+        """
+        统计缓存的插件数量与占用空间。
+
+        :return: {'count', 'size', 'quota'}
+        """
+        entries = self.list()
+        return {'count': len(entries), 'size': sum(entry.get('size', 0) for entry in entries), 'quota': self.quota}
+
+    def prune(self, max_size: int = None) -> Tuple[int, int]:
+        """
+        按最近使用时间淘汰插件，直到总大小不超过指定大小。
+
+        :param max_size: 保留的最大字节数，为None时使用配额，为0时清空缓存
+        :return: (淘汰的插件数量, 释放的字节数)
+        """
+        if max_size is None:
+            if self.quota <= 0:
+                return 0, 0
+            max_size = self.quota
+        with self._usage() as usage:
+            return self._evict(usage, max_size, keep=set(), force=True)
+
+    def _evict(self, usage: dict, max_size: int, keep: set, force: bool = False) -> Tuple[int, int]:
+        """
+        淘汰最久未使用的插件，同时删除插件缓存目录中指向同一文件的硬链接，否则空间不会被释放。
+
+        :return: (淘汰的插件数量, 释放的字节数)
+        """
+        if max_size <= 0 and not force:
+            return 0, 0
+        total = sum(info.get('size', 0) for info in usage.values())
+        count, freed = 0, 0
+        for sha256 in sorted(usage, key=lambda key: usage[key].get('last_used', 0)):
+            if total <= max_size:
+                break
+            if sha256 in keep:
+                continue
+            info = usage.pop(sha256)
+            size = info.get('size', 0)
+            self._remove_object(sha256, info.get('name', ''))
+            total -= size
+            freed += size
+            count += 1
+            self.log.info(f"evicted {info.get('name') or sha256} ({format_size(size)}) from plugin cache")
+        return count, freed
+
+    def _remove_object(self, sha256: str, name: str):
+        store_path = self.get_path(sha256)
+        if name:
+            linked = os.path.join(self.plugin_dir, name)
+            try:
+                if os.path.exists(linked) and os.path.samefile(store_path, linked):
+                    os.remove(linked)
+            except OSError as e:
+                self.log.warning(f'Failed to remove {linked}: {e}')
+        try:
+            os.remove(store_path)
+        except FileNotFoundError:
+            pass
+
+    def _link(self, src: str, dest: str) -> bool:
+        """
+        通过硬链接放置文件，无法硬链接时（跨文件系统或没有权限）复制文件内容，文件系统支持时共享数据块
+        （同 cp --reflink=auto）。先放到名称随机的临时文件再替换，避免覆盖其他硬链接指向的内容，
+        也不会写入其他用户在所有用户可写的目录中预先创建的符号链接。
+
+        :return: 是否成功
+        """
+        fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(dest), prefix=f'.{os.path.basename(dest)}.',
+                                         suffix='.tmp')
+        link_file = f'{temp_file}.link'
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                try:
+                    # 硬链接不会跟随已存在的目标，名称被抢先占用时失败，改为复制到已打开的临时文件
+                    os.link(src, link_file)
+                    os.replace(link_file, temp_file)
+                except OSError:
+                    self._copy(src, temp)
+            os.replace(temp_file, dest)
+        except OSError as e:
+            self.log.warning(f'Failed to link {src} to {dest}: {e}')
+            return False
+        finally:
+            for path in (temp_file, link_file):
+                if os.path.lexists(path):
+                    os.remove(path)
+        return True
+
+    @staticmethod
+    def _copy(src: str, temp: BinaryIO):
+        """
+        将文件内容复制到已打开的临时文件，优先共享数据块，权限同 cp：源文件权限去掉 umask。
+
+        :param src: 源文件路径
+        :param temp: 已打开的临时文件
+        """
+        umask = os.umask(0)
+        os.umask(umask)
+        with open(src, 'rb') as source:
+            try:
+                fcntl.ioctl(temp.fileno(), _FICLONE, source.fileno())
+            except OSError:
+                shutil.copyfileobj(source, temp)
+            os.fchmod(temp.fileno(), stat.S_IMODE(os.fstat(source.fileno()).st_mode) & ~umask)
+
+    @staticmethod
+    def _makedirs(path: str):
+        """
+        创建所有用户均可写入的缓存目录，不受当前用户 umask 的影响。
+        """
+        old_umask = os.umask(0)
+        try:
+            os.makedirs(path, mode=0o777, exist_ok=True)
+        finally:
+            os.umask(old_umask)
+
+    def _sync_usage(self, usage: dict) -> dict:
+        """
+        使插件使用记录与缓存文件一致：去除文件已不存在的记录，补充没有记录的文件。
+
+        :param usage: 插件使用记录
+        :return: 同步后的记录
+        """
+        objects = {}
+        for prefix in os.listdir(self.store_dir):
+            prefix_dir = os.path.join(self.store_dir, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for filename in os.listdir(prefix_dir):
+                sha256 = filename[:-len('.tar.gz')]
+                if filename.endswith('.tar.gz') and _SHA256_PATTERN.match(sha256):
+                    objects[sha256] = os.path.join(prefix_dir, filename)
+        synced = {}
+        for sha256, path in objects.items():
+            info = usage.get(sha256)
+            if not isinstance(info, dict):
+                stat_result = os.stat(path)
+                info = {'name': '', 'size': stat_result.st_size, 'last_used': stat_result.st_mtime}
+            synced[sha256] = info
+        return synced
+
+    @contextmanager
+    def _usage(self):
+        """
+        加锁读取插件使用记录，退出时写回，多个 oedp 进程之间互斥。
+        锁文件只需要读权限，创建时不受当前用户 umask 的影响，其他用户同样可以打开。
+        """
+        self._makedirs(self.store_dir)
+        old_umask = os.umask(0)
+        try:
+            lock_fd = os.open(os.path.join(self.store_dir, '.lock'), os.O_RDONLY | os.O_CREAT, 0o666)
+        finally:
+            os.umask(old_umask)
+        with os.fdopen(lock_fd, 'r') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.usage_file, 'r') as f:
+                        usage = json.load(f)
+                except (OSError, ValueError):
+                    usage = {}
+                usage = self._sync_usage(usage)
+                yield usage
+                temp_file = f'{self.usage_file}.{os.getpid()}.tmp'
+                with open(temp_file, 'w') as f:
+                    json.dump(usage, f)
+                os.replace(temp_file, self.usage_file)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-10
+# ======================================================================================================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from src.constants.paths import JOURNAL_DIR, PROJECT_CONFIG, PROJECT_WORKSPACE_DIR
+from src.utils.log.logger_generator import LoggerGenerator
+from src.utils.tools import get_private_dir, get_project_id, is_private, write_private_file
+
+TASK_SUCCEEDED = 'succeeded'
+TASK_FAILED = 'failed'
+
+
+class RunJournal:
+    def __init__(self, project: str, action: str, journal_dir: str = JOURNAL_DIR):
+        """
+        记录项目中某个方法每个任务的执行结果，用于从失败的任务处继续执行。
+
+        执行记录决定继续执行时跳过哪些任务，每个用户使用仅自己可以访问的目录，不读取其他用户可以修改的记录。
+
+        :param project: 项目目录路径
+        :param action: 方法名称
+        :param journal_dir: 执行记录所在目录
+        """
+        self.project = os.path.abspath(project)
+        self.action = action
+        self.journal_dir = journal_dir
+        self.journal_file = os.path.join(journal_dir, str(os.getuid()), f'{get_project_id(self.project)}-{action}.json')
+        self.log = LoggerGenerator().get_logger('run_journal')
+        self._lock = threading.Lock()
+        self._tasks = self._load()
+
+    @staticmethod
+    def task_key(index: int, task: dict) -> str:
+        """
+        生成任务在执行记录中的唯一标识。
+
+        :param index: 任务在方法中的下标
+        :param task: 任务详情
+        :return: 任务标识
+        """
+        return f'{index}:{task.get("name", "")}'
+
+    def task_digest(self, task: dict) -> str:
+        """
+        计算任务输入的摘要，包括 playbook、变量文件、config.yaml 的内容以及任务参数。
+
+        :param task: 任务详情
+        :return: 摘要
+        """
+        sha256_hash = hashlib.sha256()
+        sha256_hash.update(json.dumps(task, sort_keys=True, default=str).encode('utf-8'))
+        workspace = os.path.join(self.project, PROJECT_WORKSPACE_DIR)
+        files = [os.path.join(self.project, PROJECT_CONFIG)]
+        for key in ('playbook', 'vars'):
+            if key in task:
+                files.append(os.path.join(workspace, str(task[key])))
+        for file_path in files:
+            sha256_hash.update(file_path.encode('utf-8'))
+            if not os.path.isfile(file_path):
+                sha256_hash.update(b'\0missing')
+                continue
+            with open(file_path, 'rb') as f:
+                for byte_block in iter(lambda: f.read(1024 * 1024), b''):
+                    sha256_hash.update(byte_block)
+        return sha256_hash.hexdigest()
+
+    def is_succeeded(self, key: str, digest: str) -> bool:
+        """
+        判断任务是否已经执行成功且输入未发生变化。
+
+        :param key: 任务标识
+        :param digest: 任务输入的摘要
+        :return: 是否可以跳过该任务
+        """
+        record = self._tasks.get(key)
+        if not isinstance(record, dict):
+            return False
+        return record.get('status') == TASK_SUCCEEDED and record.get('digest') == digest
+
+    def record(self, key: str, digest: str, succeeded: bool):
+        """
+        记录任务的执行结果。
+
+        :param key: 任务标识
+        :param digest: 任务输入的摘要
+        :param succeeded: 是否执行成功
+        """
+        with self._lock:
+            self._tasks[key] = {
+                'status': TASK_SUCCEEDED if succeeded else TASK_FAILED,
+                'digest': digest,
+                'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+            }
+            self._save()
+
+    def reset(self):
+        """
+        清空执行记录，下次执行时所有任务都需要重新执行。
+        """
+        with self._lock:
+            self._tasks = {}
+            if os.path.lexists(self.journal_file):
+                try:
+                    os.remove(self.journal_file)
+                except OSError as e:
+                    self.log.warning(f'Failed to remove run journal {self.journal_file}: {e}')
+
+    def _load(self) -> dict:
+        if not os.path.lexists(self.journal_file):
+            return {}
+        try:
+            if not is_private(os.path.dirname(self.journal_file)) or not is_private(self.journal_file):
+                self.log.warning(f'Ignore run journal {self.journal_file} which can be modified by other users')
+                return {}
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log.warning(f'Failed to read run journal {self.journal_file}: {e}')
+            return {}
+        if not isinstance(journal, dict) or journal.get('project') != self.project:
+            return {}
+        tasks = journal.get('tasks', {})
+        return tasks if isinstance(tasks, dict) else {}
+
+    def _save(self):
+        journal = {
+            'project': self.project,
+            'action': self.action,
+            'tasks': self._tasks
+        }
+        try:
+            get_private_dir(self.journal_dir)
+            write_private_file(self.journal_file, json.dumps(journal, indent=2))
+        except OSError as e:
+            self.log.warning(f'Failed to write run journal {self.journal_file}: {e}')
@@ -14,9 +14,13 @@
 """
 工具函数集合
 """
+import errno
+import hashlib
 import importlib.util
 import os
+import stat
 import sys
+import tempfile
 
 
 def import_from_file(filepath: str, attr_name: str):
@@ -39,3 +43,62 @@ def import_from_file(filepath: str, attr_name: str):
     spec.loader.exec_module(module)
     attr = getattr(module, attr_name, None)
     return attr
+
+
+def get_project_id(project: str) -> str:
+    """
+    根据项目的绝对路径生成项目标识，用于区分不同项目在 oedp 家目录下的数据。
+
+    :param project: 项目目录路径
+    :return: 项目标识
+    """
+    return hashlib.sha256(os.path.abspath(project).encode('utf-8')).hexdigest()[:16]
+
+
+def is_private(path: str) -> bool:
+    """
+    检查文件或目录属于当前用户，不是符号链接，且其他用户无法读写。
+
+    :param path: 文件或目录路径
+    :return: 是否可以信任
+    """
+    stat_result = os.lstat(path)
+    if stat.S_ISLNK(stat_result.st_mode) or stat_result.st_uid != os.getuid():
+        return False
+    return stat_result.st_mode & (stat.S_IRWXG | stat.S_IRWXO) == 0
+
+
+def get_private_dir(parent: str) -> str:
+    """
+    获取当前用户在所有用户共享的目录下的私有子目录，不存在时创建，仅当前用户可以访问。
+
+    :param parent: 所有用户共享的目录
+    :return: 私有子目录路径
+    :raises OSError: 子目录不属于当前用户或者是符号链接
+    """
+    path = os.path.join(parent, str(os.getuid()))
+    os.makedirs(path, mode=stat.S_IRWXU, exist_ok=True)
+    stat_result = os.lstat(path)
+    if stat.S_ISLNK(stat_result.st_mode) or stat_result.st_uid != os.getuid():
+        raise PermissionError(errno.EACCES, 'directory is not owned by current user', path)
+    if stat_result.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        os.chmod(path, stat.S_IRWXU)
+    return path
+
+
+def write_private_file(path: str, content: str):
+    """
+    先写入仅当前用户可以读写的临时文件再替换目标文件，临时文件名称随机，不会跟随其他用户预先创建的符号链接。
+
+    :param path: 目标文件路径
+    :param content: 文件内容
+    """
+    fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_file, path)
+    except BaseException:
+        if os.path.lexists(temp_file):
+            os.remove(temp_file)
+        raise
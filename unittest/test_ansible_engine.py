@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.commands.run.ansible_engine import AnsibleEngine
+
+ANSIBLE_AVAILABLE = importlib.util.find_spec('ansible') is not None
+
+INVENTORY = """
+all:
+  children:
+    masters:
+      hosts:
+        master1:
+          ansible_host: 127.0.0.1
+    workers:
+      hosts:
+        worker1:
+          ansible_host: 127.0.0.2
+        worker2:
+          ansible_host: 127.0.0.3
+"""
+
+
+@unittest.skipUnless(ANSIBLE_AVAILABLE, 'ansible is not installed')
+class TestAnsibleEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.inventory = os.path.join(self.temp_dir, 'config.yaml')
+        with open(self.inventory, 'w') as f:
+            f.write(INVENTORY)
+        self.variables = os.path.join(self.temp_dir, 'vars.yml')
+        with open(self.variables, 'w') as f:
+            f.write('version: 1.0\n')
+        self.engine = AnsibleEngine(self.inventory)
+        self.executions = []
+        self.engine._playbook_executor = self._fake_executor
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _fake_executor(self, playbooks, inventory, variable_manager, loader, passwords):
+        """记录创建 PlaybookExecutor 时的命令行参数与主机范围，不实际执行 playbook"""
+        context = self.engine._context
+        self.executions.append({
+            'playbooks': playbooks,
+            'subset': context.CLIARGS['subset'],
+            'extra_vars': context.CLIARGS['extra_vars'],
+            'variables': dict(variable_manager.extra_vars),
+            'hosts': sorted(host.name for host in inventory.get_hosts()),
+        })
+        return type('FakeExecutor', (), {'run': lambda _: 0})()
+
+    def test_run_playbook_with_scope_and_vars(self):
+        """测试 --limit 与 -e @vars 参数传递给 ansible"""
+        result = self.engine.run_playbook('install.yml', self.variables, 'workers')
+
+        self.assertEqual(result, 0)
+        self.assertEqual(self.executions, [{
+            'playbooks': ['install.yml'],
+            'subset': 'workers',
+            'extra_vars': (f'@{self.variables}',),
+            'variables': {'version': 1.0},
+            'hosts': ['worker1', 'worker2'],
+        }])
+
+    def test_options_do_not_leak_between_tasks(self):
+        """测试上一个任务的主机范围与变量文件不影响下一个任务"""
+        self.engine.run_playbook('first.yml', self.variables, 'master1')
+        self.engine.run_playbook('second.yml')
+
+        second = self.executions[1]
+        self.assertIsNone(second['subset'])
+        self.assertEqual(second['extra_vars'], ())
+        self.assertEqual(second['variables'], {})
+        self.assertEqual(second['hosts'], ['master1', 'worker1', 'worker2'])
+
+    def test_list_hosts_ignores_previous_scope(self):
+        """测试获取主机列表时不受上一个任务主机范围的影响"""
+        self.engine.run_playbook('install.yml', scope='masters')
+
+        self.assertEqual(self.engine.list_hosts('all'), ['master1', 'worker1', 'worker2'])
+        self.assertEqual(self.engine.list_hosts('workers'), ['worker1', 'worker2'])
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-16
+# ======================================================================================================================
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.commands.run.ansible_profile import AnsibleProfile, find_ansible_config
+from src.utils.fact_cache import FactCache
+
+
+class TestAnsibleProfile(unittest.TestCase):
+    def setUp(self):
+        # 不受本机 ansible.cfg 的影响
+        patcher = patch('src.commands.run.ansible_profile.find_ansible_config', return_value=None)
+        self.mock_find_config = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.test_dir.cleanup)
+
+    def _use_ansible_config(self, content: str):
+        config_file = os.path.join(self.test_dir.name, 'ansible.cfg')
+        with open(config_file, 'w') as f:
+            f.write(content)
+        self.mock_find_config.return_value = config_file
+        return config_file
+
+    @patch('src.commands.run.ansible_profile.os.cpu_count')
+    def test_forks_limited_by_hosts_and_cpu(self, mock_cpu):
+        """测试并发数不超过节点数量与CPU数量对应的上限"""
+        mock_cpu.return_value = 2
+        self.assertEqual(AnsibleProfile("safe", 3).get_forks(), 3)
+        self.assertEqual(AnsibleProfile("safe", 100).get_forks(), 8)
+        self.assertEqual(AnsibleProfile("fast", 100).get_forks(), 20)
+        self.assertEqual(AnsibleProfile("fast", 0).get_forks(), 1)
+
+    @patch('src.commands.run.ansible_profile.os.cpu_count')
+    def test_safe_profile_only_sets_forks(self, mock_cpu):
+        """测试safe配置仅通过环境变量调整并发数，不指定ansible配置文件"""
+        mock_cpu.return_value = 2
+        self.assertEqual(AnsibleProfile("safe", 10).environment(), {"ANSIBLE_FORKS": "8"})
+
+    def test_fast_profile_enables_pipelining(self):
+        """测试fast配置开启pipelining与facts缓存"""
+        environment = AnsibleProfile("fast", 10).environment()
+        self.assertEqual(environment["ANSIBLE_PIPELINING"], "True")
+        self.assertEqual(environment["ANSIBLE_GATHERING"], "smart")
+        self.assertEqual(environment["ANSIBLE_CACHE_PLUGIN"], "memory")
+        self.assertNotIn("ANSIBLE_CONFIG", environment)
+
+    @patch('src.commands.run.ansible_profile.FactCache.get_settings')
+    def test_fact_cache_settings(self, mock_settings):
+        """测试持久化facts缓存的配置项转换为对应的环境变量"""
+        mock_settings.return_value = {
+            'gathering': 'smart',
+            'fact_caching': 'jsonfile',
+            'fact_caching_connection': '/fake/cache',
+            'fact_caching_timeout': '600'
+        }
+        environment = AnsibleProfile("fast", 10, fact_cache=FactCache("/fake/project")).environment()
+        self.assertEqual(environment["ANSIBLE_CACHE_PLUGIN"], "jsonfile")
+        self.assertEqual(environment["ANSIBLE_CACHE_PLUGIN_CONNECTION"], "/fake/cache")
+        self.assertEqual(environment["ANSIBLE_CACHE_PLUGIN_TIMEOUT"], "600")
+
+    @patch('src.commands.run.ansible_profile.os.cpu_count')
+    def test_configured_forks_not_overridden(self, mock_cpu):
+        """测试ansible.cfg中已经配置的并发数不被覆盖"""
+        mock_cpu.return_value = 2
+        self._use_ansible_config('[defaults]\nforks = 100 ; large inventory\n')
+        self.assertEqual(AnsibleProfile("safe", 200).environment(), {})
+
+    def test_configured_settings_not_overridden(self):
+        """测试ansible.cfg中已经配置的pipelining与facts缓存不被覆盖，facts缓存的配置项整体保留"""
+        self._use_ansible_config('[ssh_connection]\npipelining = False\n[defaults]\nfact_caching = redis\n')
+        environment = AnsibleProfile("fast", 10).environment()
+        self.assertEqual(sorted(environment), ["ANSIBLE_FORKS", "ANSIBLE_GATHERING"])
+
+    def test_invalid_ansible_config(self):
+        """测试ansible.cfg格式错误时仍然调整所有配置项"""
+        self._use_ansible_config('forks = 100\n')
+        self.assertIn("ANSIBLE_FORKS", AnsibleProfile("safe", 10).environment())
+
+    def test_find_ansible_config(self):
+        """测试按ansible的顺序查找配置文件，ANSIBLE_CONFIG可以是目录"""
+        config_file = self._use_ansible_config('[defaults]\n')
+        with patch.dict(os.environ, {'ANSIBLE_CONFIG': self.test_dir.name}):
+            self.assertEqual(find_ansible_config(), config_file)
+        with patch.dict(os.environ, {'ANSIBLE_CONFIG': os.path.join(self.test_dir.name, 'missing.cfg'),
+                                     'HOME': self.test_dir.name}), \
+                patch('src.commands.run.ansible_profile.os.getcwd', return_value=self.test_dir.name), \
+                patch('src.commands.run.ansible_profile.os.path.exists',
+                      side_effect=lambda path: path.startswith(self.test_dir.name) and os.path.isfile(path)):
+            self.assertEqual(find_ansible_config(), config_file)
+            os.chmod(self.test_dir.name, 0o777)
+            self.assertIsNone(find_ansible_config())
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-02
+# ======================================================================================================================
+
+import io
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import unittest
+
+from src.exceptions.archive_exception import ArchiveException
+from src.utils.archive_extractor import ArchiveExtractor, detect_compression
+from src.utils.main_reader import MainReader
+
+
+class TestArchiveExtractor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.target = os.path.join(self.test_dir, 'project')
+        os.makedirs(self.target)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _make_archive(self, name, members, mode='w:gz'):
+        path = os.path.join(self.test_dir, name)
+        with tarfile.open(path, mode) as tar:
+            for member_name, content in members:
+                info = tarfile.TarInfo(member_name)
+                if isinstance(content, tuple):
+                    info.type, info.linkname = content
+                    tar.addfile(info)
+                else:
+                    info.size = len(content)
+                    tar.addfile(info, io.BytesIO(content))
+        return path
+
+    def test_extract_strip_components(self):
+        """测试去除顶层目录后解压"""
+        path = self._make_archive('demo.tar.gz', [
+            ('demo/main.yaml', b'name: demo\nversion: 1.0.0\n'),
+            ('demo/workspace/install.yaml', b'- hosts: all\n'),
+            ('demo/workspace/link.yaml', (tarfile.SYMTYPE, 'install.yaml')),
+        ])
+        result = ArchiveExtractor(path, self.target).extract()
+        self.assertEqual(result['files'], 3)
+        self.assertTrue(os.path.isfile(os.path.join(self.target, 'main.yaml')))
+        with open(os.path.join(self.target, 'workspace', 'link.yaml'), 'rb') as f:
+            self.assertEqual(f.read(), b'- hosts: all\n')
+        self.assertEqual(MainReader(path).get_name(), 'demo')
+
+    def test_reject_unsafe_members(self):
+        """测试拒绝路径穿越、指向解压路径之外的链接以及设备文件"""
+        unsafe_members = [
+            ('demo/../../escape.txt', b'escape'),
+            ('demo/escape', (tarfile.SYMTYPE, '../../escape')),
+            ('demo/passwd', (tarfile.SYMTYPE, '/etc/passwd')),
+            ('demo/hardlink', (tarfile.LNKTYPE, 'escape')),
+            ('demo/tty', (tarfile.CHRTYPE, '')),
+        ]
+        for member in unsafe_members:
+            path = self._make_archive('unsafe.tar.gz', [member])
+            with self.assertRaises(ArchiveException, msg=member[0]):
+                ArchiveExtractor(path, self.target).extract()
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'escape.txt')))
+
+    @unittest.skipUnless(shutil.which('zstd'), 'zstd is not installed')
+    def test_extract_zstd(self):
+        """测试解压 zstd 压缩的插件"""
+        tar_path = self._make_archive('demo.tar', [('demo/main.yaml', b'name: demo\n')], mode='w')
+        subprocess.run(['zstd', '-q', '--rm', tar_path, '-o', f'{tar_path}.gz'], check=True)
+        path = f'{tar_path}.gz'
+        self.assertEqual(detect_compression(path), 'zst')
+        ArchiveExtractor(path, self.target).extract()
+        self.assertTrue(os.path.isfile(os.path.join(self.target, 'main.yaml')))
+        self.assertEqual(MainReader(path).get_name(), 'demo')
+
+    def test_extract_corrupted_archive(self):
+        """测试解压损坏的压缩包"""
+        path = self._make_archive('demo.tar.gz', [('demo/main.yaml', os.urandom(4096))])
+        with open(path, 'rb') as f:
+            content = f.read()
+        with open(path, 'wb') as f:
+            f.write(content[:len(content) // 2])
+        with self.assertRaises(ArchiveException):
+            ArchiveExtractor(path, self.target).extract()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-20
+# ======================================================================================================================
+
+import unittest
+from unittest.mock import patch
+
+from src.commands.run.batch import parse_batch_size, parse_failed_hosts, parse_max_fail_percentage, split_batches
+from src.commands.run.run_action import RunAction
+
+HOSTS = [f'node{i}' for i in range(10)]
+
+
+def play_recap(hosts: list, failed: set = ()) -> str:
+    lines = ['PLAY RECAP *********************************************************************']
+    for host in hosts:
+        lines.append(f'{host} : ok=3 changed=1 unreachable=0 failed={int(host in failed)} skipped=0 rescued=0 '
+                     f'ignored=0')
+    return '\n'.join(lines)
+
+
+class TestBatch(unittest.TestCase):
+    def test_parse_batch_size(self):
+        """测试解析主机数量与百分比形式的batch"""
+        self.assertEqual(parse_batch_size(20, 500), 20)
+        self.assertEqual(parse_batch_size("10%", 500), 50)
+        self.assertEqual(parse_batch_size("10%", 3), 1)
+        for invalid in ("0", "abc", "0%", "120%", -1):
+            with self.assertRaises(ValueError):
+                parse_batch_size(invalid, 10)
+
+    def test_parse_max_fail_percentage(self):
+        """测试解析允许失败的主机占比"""
+        self.assertEqual(parse_max_fail_percentage(20), 20)
+        self.assertEqual(parse_max_fail_percentage("5%"), 5)
+        with self.assertRaises(ValueError):
+            parse_max_fail_percentage(101)
+
+    def test_split_batches(self):
+        """测试按顺序切分主机"""
+        self.assertEqual(split_batches(["a", "b", "c", "d", "e"], 2), [["a", "b"], ["c", "d"], ["e"]])
+
+    def test_parse_failed_hosts(self):
+        """测试从PLAY RECAP中识别失败与不可达的主机"""
+        output = (
+            "PLAY RECAP *********************************************************************\n"
+            "h1                         : ok=1    changed=0    unreachable=0    failed=0    skipped=0\n"
+            "h2                         : ok=0    changed=0    unreachable=1    failed=0    skipped=0\n"
+            "h3                         : ok=0    changed=0    unreachable=0    failed=1    skipped=0\n"
+        )
+        self.assertEqual(parse_failed_hosts(output), {"h2", "h3"})
+
+
+class TestRunInBatches(unittest.TestCase):
+    def setUp(self):
+        self.runner = RunAction('upgrade', [], '/fake/project', False)
+        self.limits = []
+
+    def _run(self, task: dict, failed: set = (), hosts: list = None, output: bool = True) -> bool:
+        def execute(playbook, variables, limit):
+            batch = limit.split(',')
+            self.limits.append(batch)
+            failed_in_batch = set(batch) & set(failed)
+            return (2 if failed_in_batch else 0), (play_recap(batch, failed_in_batch) if output else '')
+
+        with patch.object(RunAction, '_list_hosts', return_value=HOSTS if hosts is None else hosts) as list_hosts, \
+                patch.object(RunAction, '_execute_playbook_once', side_effect=execute):
+            result = self.runner._run_playbook_in_batches(task, 'upgrade.yml', None, task.get('scope'))
+        self.list_hosts = list_hosts
+        return result
+
+    def test_all_batches_succeeded(self):
+        """测试按batch将范围内的主机分批执行"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': '30%', 'scope': 'workers'}
+
+        self.assertTrue(self._run(task))
+
+        self.list_hosts.assert_called_once_with('workers')
+        self.assertEqual(self.limits, [HOSTS[0:3], HOSTS[3:6], HOSTS[6:9], HOSTS[9:]])
+
+    def test_abort_when_first_batch_failed(self):
+        """测试默认不允许失败，第一批有主机失败后不再执行后续批次"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': 2}
+
+        with self.assertLogs(level='ERROR') as log:
+            self.assertFalse(self._run(task, failed={'node1'}))
+
+        self.assertEqual(self.limits, [HOSTS[0:2]])
+        self.assertIn('1 of 10 host(s) failed', log.output[-1])
+
+    def test_failed_hosts_accumulate_across_batches(self):
+        """测试失败主机在各批次之间累计，累计占比超过max_fail_percentage时终止"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': 2, 'max_fail_percentage': '20%'}
+
+        with self.assertLogs(level='ERROR') as log:
+            self.assertFalse(self._run(task, failed={'node0', 'node3', 'node8'}))
+
+        # 前两批各失败一台，累计 20% 未超过；第三、四批没有失败，最后一批累计 30% 超过后终止
+        self.assertEqual(self.limits, [HOSTS[0:2], HOSTS[2:4], HOSTS[4:6], HOSTS[6:8], HOSTS[8:10]])
+        self.assertIn('3 of 10 host(s) failed', log.output[-1])
+
+    def test_tolerated_failures(self):
+        """测试失败主机占比未超过max_fail_percentage时任务执行成功"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': 5, 'max_fail_percentage': 20}
+
+        with self.assertLogs(level='WARNING'):
+            self.assertTrue(self._run(task, failed={'node0', 'node9'}))
+
+        self.assertEqual(len(self.limits), 2)
+
+    def test_whole_batch_failed_without_play_recap(self):
+        """测试无法从输出中识别失败的主机时（例如使用python api执行），认为整批主机都失败"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': 5, 'max_fail_percentage': 40}
+
+        with self.assertLogs(level='WARNING') as log:
+            self.assertFalse(self._run(task, failed={'node0'}, output=False))
+
+        self.assertEqual(len(self.limits), 1)
+        self.assertIn('5 host(s) failed in batch 1', log.output[0])
+
+    def test_list_hosts_failed(self):
+        """测试无法获取主机列表时任务失败，不在所有主机上一次性执行"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': 2}
+
+        with patch.object(RunAction, '_list_hosts', return_value=None), \
+                patch.object(RunAction, '_execute_playbook_once') as execute:
+            self.assertFalse(self.runner._run_playbook_in_batches(task, 'upgrade.yml', None, None))
+
+        execute.assert_not_called()
+
+    def test_list_hosts_command_failed(self):
+        """测试 ansible --list-hosts 执行失败时返回None"""
+        with patch('src.commands.run.run_action.CommandExecutor.run_single_cmd',
+                   return_value=('', 'Could not match supplied host pattern', 1)), \
+                self.assertLogs(level='ERROR'):
+            self.assertIsNone(self.runner._list_hosts('missing'))
+        with patch('src.commands.run.run_action.CommandExecutor.run_single_cmd',
+                   return_value=('  hosts (2):\n    node0\n    node1\n', '', 0)):
+            self.assertEqual(self.runner._list_hosts('all'), ['node0', 'node1'])
+
+    def test_no_hosts_matched(self):
+        """测试范围内没有主机时跳过任务"""
+        task = {'name': 'upgrade', 'playbook': 'upgrade.yml', 'batch': 2}
+
+        with self.assertLogs(level='WARNING'):
+            self.assertTrue(self._run(task, hosts=[]))
+
+        self.assertEqual(self.limits, [])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import subprocess
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+from src.utils.command.command_executor import CommandExecutor
+
+# 向 stderr 写入远超管道缓冲区大小的内容后再向 stdout 输出
+STDERR_HEAVY_SCRIPT = """
+import sys
+for i in range(20000):
+    sys.stderr.write('error line %d %s\\n' % (i, 'x' * 64))
+sys.stdout.write('done\\n')
+"""
+
+
+class TestCommandExecutor(unittest.TestCase):
+    @patch('builtins.print')
+    def test_stderr_heavy_output_without_deadlock(self, mock_print):
+        """测试实时输出时 stderr 输出大量内容不会阻塞子进程"""
+        stdout, stderr, code = CommandExecutor.run_single_cmd(
+            [sys.executable, '-c', STDERR_HEAVY_SCRIPT], timeout=30, print_on_console=True)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(stdout, 'done\n')
+        self.assertIn('error line 19999', stderr)
+        self.assertEqual(mock_print.call_count, 20001)
+
+    @patch('builtins.print')
+    def test_output_lines_are_bounded(self, mock_print):
+        """测试实时输出模式下只保留最近的输出行"""
+        script = "for i in range(50):\n    print(i)"
+        with patch('src.utils.command.command_executor.MAX_OUTPUT_LINES', 10):
+            stdout, _, code = CommandExecutor.run_single_cmd(
+                [sys.executable, '-c', script], timeout=30, print_on_console=True)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(stdout.split(), [str(i) for i in range(40, 50)])
+        self.assertEqual(mock_print.call_count, 50)
+
+    @patch('builtins.print')
+    def test_timeout_while_streaming(self, mock_print):
+        """测试实时输出时超时抛出 TimeoutExpired 并结束进程"""
+        script = "import time\nprint('started', flush=True)\ntime.sleep(30)"
+        start = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            CommandExecutor.run_single_cmd([sys.executable, '-c', script], timeout=1, raise_exception=True,
+                                           print_on_console=True)
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_timeout_without_streaming(self):
+        """测试不实时输出时超时抛出 TimeoutExpired"""
+        with self.assertRaises(subprocess.TimeoutExpired):
+            CommandExecutor.run_single_cmd([sys.executable, '-c', 'import time; time.sleep(30)'], timeout=1,
+                                           raise_exception=True)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-24
+# ======================================================================================================================
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from src.utils.config_reader import ConfigReader
+
+CONFIG = """all:
+  hosts:
+    host1:
+      ansible_host: 127.0.0.1
+  vars:
+    port: 8080
+"""
+
+
+class TestConfigReader(unittest.TestCase):
+    def setUp(self):
+        self.project = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.project, 'config.yaml')
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        shutil.rmtree(self.project)
+        shutil.rmtree(self.cache_dir)
+
+    def test_cache_inventory(self):
+        """测试首次读取后缓存json格式的inventory"""
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(reader.get_inventory_file(), reader.inventory_file)
+        with open(reader.inventory_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), reader.config)
+        self.assertEqual(ConfigReader(self.project, self.cache_dir).get_hosts(), {'host1'})
+
+    def test_cache_invalidated(self):
+        """测试配置文件修改后重新解析"""
+        ConfigReader(self.project, self.cache_dir)
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write(CONFIG.replace('host1', 'host2'))
+        self.assertEqual(ConfigReader(self.project, self.cache_dir).get_hosts(), {'host2'})
+
+    def test_touch_without_change(self):
+        """测试仅修改时间变化时继续使用缓存"""
+        ConfigReader(self.project, self.cache_dir)
+        stat_result = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10 ** 9))
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertTrue(reader._cached)
+        self.assertEqual(reader.get_hosts(), {'host1'})
+
+    def test_vars_dir_uses_config_file(self):
+        """测试存在group_vars目录时使用原始配置文件"""
+        os.mkdir(os.path.join(self.project, 'group_vars'))
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(reader.get_inventory_file(), reader.config_file)
+
+    def test_non_json_config_not_cached(self):
+        """测试无法转换为json的配置不缓存"""
+        with open(self.config_file, 'a', encoding='utf-8') as f:
+            f.write('    date: 2025-01-01\n')
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(reader.get_inventory_file(), reader.config_file)
+        self.assertFalse(os.path.exists(reader.inventory_file))
+
+    def test_cache_is_private(self):
+        """测试缓存目录与文件仅当前用户可以访问"""
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(os.path.dirname(reader.inventory_file), os.path.join(self.cache_dir, str(os.getuid())))
+        self.assertEqual(stat.S_IMODE(os.stat(reader.cache_path).st_mode), 0o700)
+        for path in (reader.meta_file, reader.inventory_file):
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+    def _tamper_inventory(self, reader: ConfigReader):
+        with open(reader.inventory_file, 'w', encoding='utf-8') as f:
+            json.dump({'all': {'hosts': {'evil': {}}}}, f)
+
+    def test_accessible_cache_not_trusted(self):
+        """测试其他用户可以修改的缓存不再使用，重新解析配置文件并覆盖缓存"""
+        reader = ConfigReader(self.project, self.cache_dir)
+        self._tamper_inventory(reader)
+        os.chmod(reader.inventory_file, 0o666)
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(reader.get_hosts(), {'host1'})
+        self.assertEqual(stat.S_IMODE(os.stat(reader.inventory_file).st_mode), 0o600)
+
+    def test_symlink_cache_dir_not_trusted(self):
+        """测试缓存目录为符号链接时不读取也不写入缓存"""
+        target = os.path.join(self.cache_dir, 'target')
+        os.mkdir(target, 0o700)
+        os.symlink(target, os.path.join(self.cache_dir, str(os.getuid())))
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(reader.get_inventory_file(), reader.config_file)
+        self.assertEqual(os.listdir(target), [])
+
+    @unittest.skipUnless(os.getuid() == 0, 'changing file owner requires root')
+    def test_cache_of_other_user_not_trusted(self):
+        """测试属于其他用户的缓存不再使用"""
+        reader = ConfigReader(self.project, self.cache_dir)
+        self._tamper_inventory(reader)
+        os.chown(reader.inventory_file, 1, 1)
+        reader = ConfigReader(self.project, self.cache_dir)
+        self.assertEqual(reader.get_hosts(), {'host1'})
+        self.assertEqual(os.stat(reader.inventory_file).st_uid, os.getuid())
+
+
+if __name__ == '__main__':
+    unittest.main()
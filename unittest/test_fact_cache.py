@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import os
+import stat
+import tempfile
+import time
+import unittest
+
+from src.utils.fact_cache import FactCache
+
+
+class TestFactCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.test_dir.name
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    @staticmethod
+    def _write_facts(fact_cache: FactCache, host: str, age: int = 0):
+        path = os.path.join(fact_cache.cache_path, host)
+        with open(path, 'w') as f:
+            f.write('{}')
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def test_get_settings(self):
+        """测试生成 jsonfile 缓存配置并创建仅当前用户可以访问的缓存目录"""
+        fact_cache = FactCache('/fake/project', 300, self.cache_dir)
+        settings = fact_cache.get_settings()
+
+        self.assertEqual(settings, {
+            'gathering': 'smart',
+            'fact_caching': 'jsonfile',
+            'fact_caching_connection': fact_cache.cache_path,
+            'fact_caching_timeout': '300'
+        })
+        for path in (fact_cache.user_path, fact_cache.cache_path):
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o700)
+
+    def test_projects_do_not_share_facts(self):
+        """测试不同项目中相同名称的主机使用各自的缓存"""
+        first = FactCache('/fake/project1', 300, self.cache_dir)
+        second = FactCache('/fake/project2', 300, self.cache_dir)
+        first.get_settings()
+        second.get_settings()
+        self._write_facts(first, 'node1')
+
+        self.assertNotEqual(first.cache_path, second.cache_path)
+        self.assertEqual([host for host, _, _ in first.list_hosts()], ['node1'])
+        self.assertEqual(second.list_hosts(), [])
+        self.assertEqual(FactCache.count_hosts(self.cache_dir), 1)
+
+    def test_list_hosts(self):
+        """测试列举已缓存的主机及是否过期，忽略隐藏文件"""
+        fact_cache = FactCache('/fake/project', 300, self.cache_dir)
+        self.assertEqual(fact_cache.list_hosts(), [])
+
+        fact_cache.get_settings()
+        self._write_facts(fact_cache, 'node2', age=600)
+        self._write_facts(fact_cache, 'node1')
+        self._write_facts(fact_cache, '.tmp')
+
+        self.assertEqual([(host, expired) for host, _, expired in fact_cache.list_hosts()],
+                         [('node1', False), ('node2', True)])
+
+    def test_clear(self):
+        """测试清除项目已缓存的 facts"""
+        fact_cache = FactCache('/fake/project', 300, self.cache_dir)
+        other = FactCache('/fake/other', 300, self.cache_dir)
+        for cache in (fact_cache, other):
+            cache.get_settings()
+            self._write_facts(cache, 'node1')
+        self._write_facts(fact_cache, 'node2')
+
+        self.assertEqual(fact_cache.clear(), 2)
+        self.assertEqual(fact_cache.list_hosts(), [])
+        self.assertEqual(len(other.list_hosts()), 1)
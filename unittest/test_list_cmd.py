@@ -3,11 +3,14 @@
 # oeDeploy is licensed under the Mulan PSL v2.
 
 import unittest
+import io
 import os
+import tarfile
 import tempfile
 from unittest.mock import patch
 from src.commands.list.list_cmd import ListCmd
 from src.exceptions.config_exception import ConfigException
+from src.utils.plugin_meta_cache import PluginMetaCache
 
 class TestListCmd(unittest.TestCase):
     def setUp(self):
@@ -47,3 +50,28 @@ class TestListCmd(unittest.TestCase):
         
         lc = ListCmd(self.test_dir.name)
         self.assertTrue(lc.run())
+
+    def test_run_with_meta_cache(self):
+        """测试插件未变化时使用元数据缓存，变化后重新读取"""
+        os.remove(self.valid_plugin)
+        plugin = os.path.join(self.test_dir.name, "demo.tar.gz")
+        content = b'name: demo\nversion: 1.0.0\n'
+        with tarfile.open(plugin, 'w:gz') as tar:
+            info = tarfile.TarInfo('demo/main.yaml')
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+        cache_file = os.path.join(self.test_dir.name, 'cache', 'plugins.json')
+
+        lc = ListCmd(self.test_dir.name)
+        lc.meta_cache = PluginMetaCache(cache_file)
+        self.assertTrue(lc.run())
+        self.assertEqual(PluginMetaCache(cache_file).get(plugin)['name'], 'demo')
+
+        lc = ListCmd(self.test_dir.name)
+        lc.meta_cache = PluginMetaCache(cache_file)
+        with patch.object(ListCmd, '_read_meta') as mock_read:
+            self.assertTrue(lc.run())
+        mock_read.assert_not_called()
+
+        os.utime(plugin, ns=(0, 0))
+        self.assertIsNone(PluginMetaCache(cache_file).get(plugin))
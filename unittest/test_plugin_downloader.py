@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-28
+# ======================================================================================================================
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.commands.init.plugin_downloader import PluginDownloader, _load_digest_record, get_digest_record_file, \
+    get_file_digest, get_part_file, get_part_record_file
+
+
+class TestPluginDownloader(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.work_dir, 'plugin.tar.gz')
+        self.content = os.urandom(100000)
+        with open(self.source, 'wb') as f:
+            f.write(self.content)
+        self.url = f'file://{self.source}'
+        self.sha256sum = hashlib.sha256(self.content).hexdigest()
+        self.output = os.path.join(self.work_dir, 'cache.tar.gz')
+        self.digest_dir = tempfile.mkdtemp()
+        digest_patcher = patch('src.commands.init.plugin_downloader.DIGEST_CACHE_DIR', self.digest_dir)
+        digest_patcher.start()
+        self.addCleanup(digest_patcher.stop)
+        self.partial_dir = tempfile.mkdtemp()
+        partial_patcher = patch('src.commands.init.plugin_downloader.PLUGIN_PARTIAL_DIR', self.partial_dir)
+        partial_patcher.start()
+        self.addCleanup(partial_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+        shutil.rmtree(self.digest_dir)
+        shutil.rmtree(self.partial_dir)
+
+    def test_download_and_verify(self):
+        """测试跳过不可达的地址，下载时同时校验sha256"""
+        urls = [f'file://{self.work_dir}/missing.tar.gz', self.url]
+        self.assertTrue(PluginDownloader(urls, self.sha256sum, max_retries=1).download(self.output))
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_checksum_mismatch(self):
+        """测试校验失败时不保留文件"""
+        self.assertFalse(PluginDownloader([self.url], '0' * 64, max_retries=1).download(self.output))
+        self.assertFalse(os.path.exists(self.output))
+
+    def _write_partial(self, content: bytes, record: dict = None):
+        part_file = get_part_file(self.output)
+        with open(os.open(part_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+            f.write(content)
+        if record is not None:
+            with open(os.open(get_part_record_file(part_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+                json.dump(record, f)
+
+    def _download(self, downloader: PluginDownloader) -> list:
+        """下载并返回执行的 curl 命令"""
+        with patch('src.commands.init.plugin_downloader.subprocess.Popen', wraps=subprocess.Popen) as popen:
+            self.assertTrue(downloader.download(self.output))
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertFalse(os.path.exists(get_part_file(self.output)))
+        self.assertFalse(os.path.exists(get_part_record_file(get_part_file(self.output))))
+        return [call.args[0] for call in popen.call_args_list]
+
+    def test_resume_partial(self):
+        """测试sha256与记录一致时从保留的.part文件继续下载，校验通过后替换为输出文件"""
+        self._write_partial(self.content[:60000], {'sha256': self.sha256sum, 'size': len(self.content)})
+        downloader = PluginDownloader([self.url], self.sha256sum, len(self.content), max_retries=1)
+        commands = self._download(downloader)
+        self.assertIn(['-C', '60000'], [cmd[-3:-1] for cmd in commands])
+
+    def test_discard_partial_without_record(self):
+        """测试没有记录或记录与本次下载不一致的.part文件不续传"""
+        for record in (None, {'sha256': '0' * 64, 'size': len(self.content)}):
+            self._write_partial(self.content[:60000], record)
+            downloader = PluginDownloader([self.url], self.sha256sum, len(self.content), max_retries=1)
+            commands = self._download(downloader)
+            self.assertFalse(any('-C' in cmd for cmd in commands))
+
+    def test_discard_partial_without_sha256(self):
+        """测试未知sha256时无法校验续传的内容，从头下载"""
+        self._write_partial(b'other version', {'sha256': '', 'size': 0})
+        commands = self._download(PluginDownloader([self.url], max_retries=1))
+        self.assertFalse(any('-C' in cmd for cmd in commands))
+
+    def test_discard_stale_partial(self):
+        """测试续传后校验失败时从头下载"""
+        self._write_partial(b'stale', {'sha256': self.sha256sum, 'size': 0})
+        self.assertTrue(PluginDownloader([self.url], self.sha256sum, max_retries=1).download(self.output))
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_output_mode(self):
+        """测试下载完成的插件按 umask 设置权限，而不是保留.part文件仅当前用户可以读写的权限"""
+        old_umask = os.umask(0o022)
+        try:
+            self.assertTrue(PluginDownloader([self.url], self.sha256sum, max_retries=1).download(self.output))
+        finally:
+            os.umask(old_umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.output).st_mode), 0o644)
+
+    def test_partial_in_private_dir(self):
+        """测试.part文件与记录保存在仅当前用户可以访问的目录中"""
+        with patch.object(PluginDownloader, '_commit', return_value=True):
+            self.assertTrue(PluginDownloader([self.url], self.sha256sum, max_retries=1).download(self.output))
+        part_file = get_part_file(self.output)
+        self.assertEqual(os.path.dirname(part_file), os.path.join(self.partial_dir, str(os.getuid())))
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(part_file)).st_mode), 0o700)
+        for path in (part_file, get_part_record_file(part_file)):
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+    def test_discard_shared_partial(self):
+        """测试其他用户可以访问的.part文件或记录不续传"""
+        for path in (get_part_file(self.output), get_part_record_file(get_part_file(self.output))):
+            self._write_partial(self.content[:60000], {'sha256': self.sha256sum, 'size': len(self.content)})
+            os.chmod(path, 0o666)
+            downloader = PluginDownloader([self.url], self.sha256sum, len(self.content), max_retries=1)
+            commands = self._download(downloader)
+            self.assertFalse(any('-C' in cmd for cmd in commands))
+
+    def test_not_follow_symlinked_partial(self):
+        """测试.part文件是符号链接时不读取也不写入链接指向的文件"""
+        target = os.path.join(self.work_dir, 'target')
+        with open(target, 'wb') as f:
+            f.write(self.content[:60000])
+        self._write_partial(b'', {'sha256': self.sha256sum, 'size': len(self.content)})
+        os.remove(get_part_file(self.output))
+        os.symlink(target, get_part_file(self.output))
+        downloader = PluginDownloader([self.url], self.sha256sum, len(self.content), max_retries=1)
+        commands = self._download(downloader)
+        self.assertFalse(any('-C' in cmd for cmd in commands))
+        with open(target, 'rb') as f:
+            self.assertEqual(f.read(), self.content[:60000])
+
+    @patch('src.commands.init.plugin_downloader.DOWNLOAD_SEGMENT_MIN_SIZE', 10000)
+    def test_segmented_download(self):
+        """测试分段下载后合并"""
+        downloader = PluginDownloader([self.url, self.url], self.sha256sum, len(self.content), segments=3)
+        self.assertTrue(downloader.download(self.output))
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(sorted(os.listdir(self.work_dir)),
+                         ['cache.tar.gz', 'plugin.tar.gz'])
+
+    def test_digest_record(self):
+        """测试下载时记录sha256，文件未变化时直接使用记录"""
+        self.assertTrue(PluginDownloader([self.url], self.sha256sum).download(self.output))
+        record_file = get_digest_record_file(self.output)
+        self.assertEqual(os.path.dirname(record_file), os.path.join(self.digest_dir, str(os.getuid())))
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(record_file)).st_mode), 0o700)
+        self.assertEqual(self._get_file_digest_without_hashing(), self.sha256sum)
+        with open(self.output, 'ab') as f:
+            f.write(b'changed')
+        self.assertEqual(get_file_digest(self.output), hashlib.sha256(self.content + b'changed').hexdigest())
+
+    def _get_file_digest_without_hashing(self):
+        """使用记录时返回sha256，需要重新计算时返回None"""
+        return _load_digest_record(self.output, os.stat(self.output))
+
+    def test_digest_record_of_replaced_file(self):
+        """测试文件被替换为大小与修改时间都相同的其他文件时重新计算"""
+        shutil.copyfile(self.source, self.output)
+        get_file_digest(self.output)
+        stat_result = os.stat(self.output)
+        with open(f'{self.output}.new', 'wb') as f:
+            f.write(b'x' * len(self.content))
+        os.utime(f'{self.output}.new', ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+        os.replace(f'{self.output}.new', self.output)
+
+        self.assertIsNone(self._get_file_digest_without_hashing())
+        self.assertEqual(get_file_digest(self.output), hashlib.sha256(b'x' * len(self.content)).hexdigest())
+
+    def test_digest_record_of_writable_file(self):
+        """测试其他用户可以修改的文件不使用记录"""
+        shutil.copyfile(self.source, self.output)
+        get_file_digest(self.output)
+        self.assertEqual(self._get_file_digest_without_hashing(), self.sha256sum)
+        os.chmod(self.output, 0o666)
+        self.assertIsNone(self._get_file_digest_without_hashing())
+
+    def test_digest_record_in_shared_dir(self):
+        """测试记录所在目录其他用户可以访问时不使用记录"""
+        shutil.copyfile(self.source, self.output)
+        get_file_digest(self.output)
+        os.chmod(os.path.dirname(get_digest_record_file(self.output)), 0o777)
+        self.assertIsNone(self._get_file_digest_without_hashing())
+
+    @unittest.skipUnless(os.getuid() == 0, 'changing file owner requires root')
+    def test_digest_record_of_other_user(self):
+        """测试属于其他用户的文件不使用记录，也不保存记录"""
+        shutil.copyfile(self.source, self.output)
+        os.chown(self.output, 1, 1)
+        self.assertEqual(get_file_digest(self.output), self.sha256sum)
+        self.assertFalse(os.path.exists(get_digest_record_file(self.output)))
+
+
+class TestRankMirrors(unittest.TestCase):
+    URLS = ['http://mirror-a/plugin.tar.gz', 'http://mirror-b/plugin.tar.gz']
+
+    def _rank(self, results: dict) -> list:
+        """按下载地址模拟 curl 探测结果 (stdout, stderr, 返回码)，返回排序后的下载地址"""
+        def run_single_cmd(cmd, **_):
+            return results[cmd[-1]]
+        with patch('src.commands.init.plugin_downloader.CommandExecutor.run_single_cmd',
+                   side_effect=run_single_cmd):
+            return PluginDownloader(self.URLS, segments=2).rank_mirrors()
+
+    def test_rank_by_latency(self):
+        """测试按首字节响应时间排序，返回206的地址支持分段下载"""
+        mirrors = self._rank({self.URLS[0]: ('0.300 206', '', 0), self.URLS[1]: ('0.050 200', '', 0)})
+        self.assertEqual(mirrors, [(self.URLS[1], False), (self.URLS[0], True)])
+
+    def test_mirror_without_range(self):
+        """测试不支持按范围下载的地址收到响应后因文件过大或超时中止时仍然可用"""
+        for return_code in (63, 28):
+            mirrors = self._rank({self.URLS[0]: ('0.050 200', '', return_code),
+                                  self.URLS[1]: ('0.000 000', '', 7)})
+            self.assertEqual(mirrors, [(self.URLS[0], False)])
+
+    def test_exclude_unreachable(self):
+        """测试连接超时或 HTTP 错误的地址被排除"""
+        mirrors = self._rank({self.URLS[0]: ('0.000 000', '', 28), self.URLS[1]: ('0.010 404', '', 22)})
+        self.assertEqual(mirrors, [(url, False) for url in self.URLS])
+        mirrors = self._rank({self.URLS[0]: ('0.000 000', '', 28), self.URLS[1]: ('0.010 206', '', 0)})
+        self.assertEqual(mirrors, [(self.URLS[1], True)])
+
+    def test_fallback_when_all_probes_fail(self):
+        """测试所有地址探测失败时按原顺序尝试下载"""
+        mirrors = self._rank({url: ('', '', 6) for url in self.URLS})
+        self.assertEqual(mirrors, [(url, False) for url in self.URLS])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-26
+# ======================================================================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from src.utils.plugin_index import PluginIndex, parse_updated
+
+
+def _entry(name, version, updated='', description='', tags=None):
+    return {'name': name, 'version': version, 'updated': updated, 'description': description, 'tags': tags or [],
+            'sha256sum': '', 'urls': [f'{name}.tar.gz']}
+
+
+class TestPluginIndex(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.repo_config = os.path.join(self.cache_dir, 'repo.conf')
+        with open(self.repo_config, 'w') as f:
+            f.write('[main]\nurl = file:///main\nenabled = true\n[extra]\nurl = file:///extra\nenabled = true\n')
+        self._write_index('extra', [
+            {'k8s': [_entry('k8s', '2.0.0')]},
+            {'pytorch': [_entry('pytorch', '1.0.0', description='deep learning framework', tags=['ai', 'gpu'])]},
+            {'pytorch-npu': [_entry('pytorch-npu', '1.0.0', tags='ai, npu')]}
+        ])
+        self._write_index('main', [{'k8s': [
+            _entry('k8s', '1.0.0-1', '2025-03-05T10:31:02.608017752+08:00'),
+            _entry('k8s', '1.0.0-1', '2025-03-06T10:31:02+08:00'),
+            _entry('k8s', '0.9.0')
+        ]}])
+        self.index = PluginIndex(self.cache_dir, os.path.join(self.cache_dir, 'plugins.db'), self.repo_config)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _write_index(self, repo, plugins):
+        with open(os.path.join(self.cache_dir, f'{repo}.yaml'), 'w') as f:
+            yaml.safe_dump({'apiversion': 'v1', 'plugins': plugins}, f)
+
+    def test_parse_updated(self):
+        """测试解析纳秒精度、带时区以及无效的更新时间"""
+        self.assertAlmostEqual(parse_updated('2025-03-05T10:31:02.5+08:00'), 1741141862.5)
+        self.assertEqual(parse_updated('2025-03-05T02:31:02Z'), 1741141862.0)
+        self.assertEqual(parse_updated(''), 0.0)
+        self.assertEqual(parse_updated('yesterday'), 0.0)
+
+    def test_find_latest(self):
+        """测试按插件源配置顺序以及版本、更新时间查找最新版本"""
+        self.assertTrue(self.index.build())
+        latest = self.index.find_latest('k8s')
+        self.assertEqual(latest['repo'], 'main')
+        self.assertEqual(latest['updated'], '2025-03-06T10:31:02+08:00')
+        self.assertEqual(self.index.find_latest('pytorch')['repo'], 'extra')
+        self.assertIsNone(self.index.find_latest('missing'))
+
+    def test_search(self):
+        """测试按关键字查找插件"""
+        self.assertEqual([p['name'] for p in self.index.search('k8')], ['k8s', 'k8s'])
+        self.assertEqual(len(self.index.search('k8', all_versions=True)), 4)
+        self.assertEqual(self.index.search('%'), [])
+
+    def test_search_ranking(self):
+        """测试前缀、模糊、描述匹配以及排序"""
+        self.assertEqual([p['name'] for p in self.index.search('pytorch')], ['pytorch', 'pytorch-npu'])
+        self.assertEqual([p['name'] for p in self.index.search('pytorh')], ['pytorch', 'pytorch-npu'])
+        self.assertEqual([p['name'] for p in self.index.search('learning')], ['pytorch'])
+        self.assertEqual([p['name'] for p in self.index.search('pytorch npu')], ['pytorch-npu'])
+
+    def test_search_tag(self):
+        """测试按标签过滤"""
+        self.assertEqual([p['name'] for p in self.index.search('', tag='AI')], ['pytorch', 'pytorch-npu'])
+        self.assertEqual([p['name'] for p in self.index.search('', tag='gpu')], ['pytorch'])
+        self.assertEqual(self.index.search('k8s', tag='gpu'), [])
+
+    def test_rebuild_when_cache_changed(self):
+        """测试插件源索引缓存变化后重新生成索引"""
+        self.assertTrue(self.index.build())
+        self._write_index('extra', [{'mindspore': [_entry('mindspore', '1.0.0')]}])
+        self.assertEqual(self.index.find_latest('mindspore')['repo'], 'extra')
+        self.assertIsNone(self.index.find_latest('pytorch'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-01
+# ======================================================================================================================
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.commands.init.init_cmd import InitCmd
+from src.utils.plugin_store import PluginStore, parse_size
+
+
+class TestPluginStore(unittest.TestCase):
+    def setUp(self):
+        self.plugin_dir = tempfile.mkdtemp()
+        self.store = PluginStore(os.path.join(self.plugin_dir, 'store'), self.plugin_dir, quota=250)
+
+    def tearDown(self):
+        shutil.rmtree(self.plugin_dir)
+
+    def _add(self, name, content):
+        # 与下载时一致，通过替换写入，不修改硬链接指向的内容
+        path = os.path.join(self.plugin_dir, name)
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(content)
+        os.replace(f'{path}.tmp', path)
+        sha256 = hashlib.sha256(content).hexdigest()
+        self.assertIsNotNone(self.store.add(path, sha256, name))
+        return path, sha256
+
+    def test_parse_size(self):
+        """测试解析带单位的大小"""
+        self.assertEqual(parse_size('20G'), 20 * 1024 ** 3)
+        self.assertEqual(parse_size('1.5k'), 1536)
+        self.assertEqual(parse_size(100), 100)
+        with self.assertRaises(ValueError):
+            parse_size('ten')
+
+    def test_same_name_different_content(self):
+        """测试同名但内容不同的插件分别缓存"""
+        _, first = self._add('foo-1.0.tar.gz', b'a' * 100)
+        path, second = self._add('foo-1.0.tar.gz', b'b' * 100)
+        self.assertIsNotNone(self.store.get(first))
+        self.assertTrue(self.store.materialize(first, path))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 100)
+        with open(self.store.get_path(second), 'rb') as f:
+            self.assertEqual(f.read(), b'b' * 100)
+
+    def test_lru_eviction(self):
+        """测试超出配额时淘汰最久未使用的插件，并删除其硬链接"""
+        first_path, first = self._add('first.tar.gz', b'1' * 100)
+        _, second = self._add('second.tar.gz', b'2' * 100)
+        self.store.get(first)
+        _, third = self._add('third.tar.gz', b'3' * 100)
+        self.assertIsNone(self.store.get(second))
+        self.assertFalse(os.path.exists(os.path.join(self.plugin_dir, 'second.tar.gz')))
+        self.assertIsNotNone(self.store.get(first))
+        self.assertEqual(self.store.stats()['count'], 2)
+        self.assertEqual(self.store.prune(0), (2, 200))
+        self.assertFalse(os.path.exists(first_path))
+        self.assertEqual(self.store.list(), [])
+
+    def test_shared_with_other_users(self):
+        """测试缓存目录与锁文件不受当前用户 umask 的影响，其他用户同样可以使用"""
+        old_umask = os.umask(0o077)
+        try:
+            _, sha256 = self._add('foo-1.0.tar.gz', b'a' * 100)
+        finally:
+            os.umask(old_umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.store.store_dir).st_mode), 0o777)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(self.store.get_path(sha256))).st_mode), 0o777)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(self.store.store_dir, '.lock')).st_mode), 0o666)
+
+    def test_get_without_permission(self):
+        """测试无法访问缓存时视为未命中"""
+        _, sha256 = self._add('foo-1.0.tar.gz', b'a' * 100)
+        with patch.object(PluginStore, '_usage', side_effect=PermissionError('permission denied')), \
+                self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.store.get(sha256))
+
+    def test_copy_when_link_fails(self):
+        """测试无法硬链接时复制文件内容，权限同 cp"""
+        path = os.path.join(self.plugin_dir, 'foo-1.0.tar.gz')
+        with open(path, 'wb') as f:
+            f.write(b'a' * 100)
+        os.chmod(path, 0o664)
+        old_umask = os.umask(0o022)
+        try:
+            with patch('src.utils.plugin_store.os.link', side_effect=PermissionError('operation not permitted')):
+                store_path = self.store.add(path, hashlib.sha256(b'a' * 100).hexdigest(), 'foo-1.0.tar.gz')
+        finally:
+            os.umask(old_umask)
+        self.assertFalse(os.path.samefile(path, store_path))
+        with open(store_path, 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 100)
+        self.assertEqual(stat.S_IMODE(os.stat(store_path).st_mode), 0o644)
+
+    def test_not_follow_planted_symlink(self):
+        """测试不会写入其他用户在临时文件位置预先创建的符号链接"""
+        path, sha256 = self._add('foo-1.0.tar.gz', b'a' * 100)
+        victim = os.path.join(self.plugin_dir, 'victim')
+        with open(victim, 'wb') as f:
+            f.write(b'victim')
+        dest = os.path.join(self.plugin_dir, 'bar-1.0.tar.gz')
+        os.symlink(victim, f'{dest}.{os.getpid()}.tmp')
+        mkstemp = tempfile.mkstemp
+
+        def plant_link_file(*args, **kwargs):
+            fd, temp_file = mkstemp(*args, **kwargs)
+            os.symlink(victim, f'{temp_file}.link')
+            return fd, temp_file
+
+        with patch('src.utils.plugin_store.tempfile.mkstemp', side_effect=plant_link_file):
+            self.assertTrue(self.store.materialize(sha256, dest))
+        with open(victim, 'rb') as f:
+            self.assertEqual(f.read(), b'victim')
+        self.assertFalse(os.path.islink(dest))
+        with open(dest, 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 100)
+
+    def test_discard(self):
+        """测试删除缓存中的插件及其使用记录"""
+        path, sha256 = self._add('foo-1.0.tar.gz', b'a' * 100)
+        self.assertTrue(self.store.discard(sha256))
+        self.assertIsNone(self.store.get(sha256))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.store.list(), [])
+
+
+class TestInitFromPluginStore(unittest.TestCase):
+    def setUp(self):
+        self.plugin_dir = tempfile.mkdtemp()
+        self.store = PluginStore(os.path.join(self.plugin_dir, 'store'), self.plugin_dir, quota=0)
+        self.content = b'plugin'
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+        self.plugin_info = {'urls': ['http://repo/foo-1.0.tar.gz'], 'sha256sum': self.sha256}
+        digest_patcher = patch('src.commands.init.plugin_downloader.DIGEST_CACHE_DIR',
+                               os.path.join(self.plugin_dir, 'digest'))
+        digest_patcher.start()
+        self.addCleanup(digest_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.plugin_dir)
+
+    def _init(self):
+        init_cmd = InitCmd('foo', os.path.join(self.plugin_dir, 'project'))
+        with patch.object(InitCmd, '_find_plugin_in_repos', return_value=self.plugin_info), \
+                patch.object(InitCmd, '_extract_archive', return_value=True) as extract, \
+                patch('src.commands.init.init_cmd.PLUGIN_DIR', self.plugin_dir), \
+                patch('src.commands.init.init_cmd.PluginStore', return_value=self.store), \
+                patch('src.commands.init.init_cmd.PluginDownloader') as downloader:
+            downloader.return_value.download.return_value = False
+            result = init_cmd._handle_plugin_name(init_cmd.project)
+        return result, extract, downloader
+
+    def _plant(self, content: bytes):
+        store_path = self.store.get_path(self.sha256)
+        os.makedirs(os.path.dirname(store_path))
+        with open(store_path, 'wb') as f:
+            f.write(content)
+
+    def test_use_verified_cache(self):
+        """测试缓存中的插件校验通过时直接解压，不再下载"""
+        self._plant(self.content)
+
+        result, extract, downloader = self._init()
+
+        self.assertTrue(result)
+        extract.assert_called_once()
+        self.assertEqual(extract.call_args.args[0], os.path.join(self.plugin_dir, 'foo-1.0.tar.gz'))
+        downloader.assert_not_called()
+
+    def test_planted_cache_not_extracted(self):
+        """测试缓存中的插件与 sha256 不一致时不解压，删除后重新下载"""
+        self._plant(b'malicious')
+
+        with self.assertLogs(level='WARNING') as log:
+            result, extract, downloader = self._init()
+
+        self.assertFalse(result)
+        extract.assert_not_called()
+        downloader.return_value.download.assert_called_once()
+        self.assertTrue(any('does not match sha256' in line for line in log.output))
+        self.assertFalse(os.path.exists(self.store.get_path(self.sha256)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import argparse
+import configparser
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.commands.repo.repo_cmd import RepoCmd
+
+
+class FakeClock:
+    """每次执行 curl 时前进指定秒数的时钟"""
+
+    def __init__(self, step: float):
+        self.now = 0.0
+        self.step = step
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def run_cmd(self, cmd):
+        self.now += self.step
+        return '', 'curl: (28) Operation timed out', 28
+
+
+class FakeServer:
+    """模拟 curl 下载：保存响应头与响应内容，并输出状态码"""
+
+    def __init__(self, status: int, body: str = '', headers: dict = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.requests = []
+
+    def run_cmd(self, cmd):
+        request_headers = [cmd[index + 1] for index, arg in enumerate(cmd) if arg == '-H']
+        self.requests.append(request_headers)
+        with open(cmd[cmd.index('-D') + 1], 'w') as f:
+            f.write('HTTP/1.1 302 Found\r\nETag: "redirect"\r\n\r\n')
+            f.write(f'HTTP/1.1 {self.status} OK\r\n')
+            for key, value in self.headers.items():
+                f.write(f'{key}: {value}\r\n')
+        if self.status == 200:
+            with open(cmd[cmd.index('-o') + 1], 'w') as f:
+                f.write(self.body)
+        return str(self.status), '', 0
+
+
+class TestRepoCmd(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.test_dir.name, 'main.yaml')
+        self.repo_cmd = RepoCmd(argparse.Namespace(subcommand='update'))
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_deadline_limits_attempts(self):
+        """测试下载总时间不超过截止时间，且失败信息中的尝试次数与实际一致"""
+        clock = FakeClock(6)
+        with patch('src.commands.repo.repo_cmd.time.monotonic', clock.monotonic), \
+                patch('src.commands.repo.repo_cmd.CommandExecutor.run_single_cmd', side_effect=clock.run_cmd) as cmd, \
+                self.assertLogs(level='WARNING') as log:
+            result = self.repo_cmd._download_with_retry('http://repo/index.yaml', self.output_file, 'main',
+                                                        deadline=10)
+
+        self.assertFalse(result)
+        max_times = [call.args[0][call.args[0].index('--max-time') + 1] for call in cmd.call_args_list]
+        self.assertEqual(max_times, ['10', '4'])
+        self.assertTrue(any('exceeded the deadline of 10s' in line for line in log.output))
+        self.assertIn('after 2 attempts', log.output[-1])
+
+    def test_retry_without_deadline(self):
+        """测试不限制时间时按最大重试次数重试"""
+        clock = FakeClock(6)
+        with patch('src.commands.repo.repo_cmd.CommandExecutor.run_single_cmd', side_effect=clock.run_cmd) as cmd, \
+                self.assertLogs(level='ERROR') as log:
+            self.assertFalse(self.repo_cmd._download_with_retry('http://repo/index.yaml', self.output_file, 'main'))
+
+        self.assertEqual(cmd.call_count, 3)
+        self.assertIn('after 3 attempts', log.output[-1])
+
+    def test_process_repositories_summary(self):
+        """测试并发更新所有启用的插件源，并汇总每个插件源的结果"""
+        config = configparser.ConfigParser()
+        config.read_string(
+            '[main]\nurl = http://repo/main\nenabled = true\n'
+            '[backup]\nurl = http://repo/backup\nenabled = true\n'
+            '[disabled]\nurl = http://repo/disabled\nenabled = false\n'
+        )
+        results = {'main': (True, 0.5), 'backup': (False, 10.0)}
+        with patch.object(RepoCmd, '_timed_download', side_effect=lambda _, name: results[name]) as download, \
+                patch('src.commands.repo.repo_cmd.REPO_CACHE_DIR', self.test_dir.name), \
+                self.assertLogs(level='INFO') as log:
+            downloaded_files = self.repo_cmd._process_repositories(config)
+
+        self.assertEqual(downloaded_files, {os.path.join(self.test_dir.name, 'main.yaml')})
+        self.assertEqual(sorted(call.args[1] for call in download.call_args_list), ['backup', 'main'])
+        summary = log.output[-1]
+        self.assertRegex(summary, r'main\s*\|\s*updated\s*\|\s*0.50s')
+        self.assertRegex(summary, r'backup\s*\|\s*failed\s*\|\s*10.00s')
+        self.assertNotIn('disabled', summary)
+
+    def _download(self, server: FakeServer, url: str = 'http://repo/index.yaml') -> bool:
+        with patch('src.commands.repo.repo_cmd.CommandExecutor.run_single_cmd', side_effect=server.run_cmd):
+            return self.repo_cmd._download_with_retry(url, self.output_file, 'main')
+
+    def _read_meta(self) -> dict:
+        with open(RepoCmd._get_meta_file(self.output_file), 'r') as f:
+            return json.load(f)
+
+    def test_save_index_with_validators(self):
+        """测试下载成功后保存最终响应的ETag与Last-Modified"""
+        server = FakeServer(200, 'plugins: {}\n', {'ETag': '"v1"', 'Last-Modified': 'Tue, 01 Jul 2025 00:00:00 GMT'})
+
+        self.assertTrue(self._download(server))
+
+        self.assertEqual(server.requests, [[]])
+        with open(self.output_file, 'r') as f:
+            self.assertEqual(f.read(), 'plugins: {}\n')
+        meta = self._read_meta()
+        self.assertEqual((meta['url'], meta['etag'], meta['last_modified']),
+                         ('http://repo/index.yaml', '"v1"', 'Tue, 01 Jul 2025 00:00:00 GMT'))
+        self.assertEqual(meta['sha256'], RepoCmd._calculate_sha256(self.output_file))
+        self.assertEqual(sorted(os.listdir(self.test_dir.name)), ['main.meta.json', 'main.yaml'])
+
+    def test_not_modified_keeps_cache(self):
+        """测试使用条件请求，服务端返回304时保留原有缓存"""
+        self._download(FakeServer(200, 'plugins: {}\n', {'ETag': '"v1"', 'Last-Modified': 'Tue, 01 Jul 2025'}))
+        server = FakeServer(304)
+
+        self.assertTrue(self._download(server))
+
+        self.assertEqual(server.requests, [['If-None-Match: "v1"', 'If-Modified-Since: Tue, 01 Jul 2025']])
+        with open(self.output_file, 'r') as f:
+            self.assertEqual(f.read(), 'plugins: {}\n')
+        self.assertEqual(self._read_meta()['etag'], '"v1"')
+
+    def test_unconditional_when_cache_changed(self):
+        """测试缓存被修改、url变化或元数据损坏时不使用条件请求"""
+        self._download(FakeServer(200, 'plugins: {}\n', {'ETag': '"v1"'}))
+        url = 'http://repo/index.yaml'
+        self.assertEqual(self.repo_cmd._get_conditional_headers(url, self.output_file), ['-H', 'If-None-Match: "v1"'])
+        self.assertEqual(self.repo_cmd._get_conditional_headers('http://mirror/index.yaml', self.output_file), [])
+
+        with open(self.output_file, 'a') as f:
+            f.write('# modified\n')
+        self.assertEqual(self.repo_cmd._get_conditional_headers(url, self.output_file), [])
+
+        with open(RepoCmd._get_meta_file(self.output_file), 'w') as f:
+            f.write('{')
+        self.assertEqual(self.repo_cmd._get_conditional_headers(url, self.output_file), [])
+
+    def _run_update(self, result: bool, change_cache: bool):
+        def update(_):
+            if change_cache:
+                with open(os.path.join(self.test_dir.name, 'main.yaml'), 'w') as f:
+                    f.write('plugins: {}\n')
+            return result
+
+        with patch('src.commands.repo.repo_cmd.REPO_CACHE_DIR', self.test_dir.name), \
+                patch('src.commands.repo.repo_cmd.REPO_CONFIG_PATH', os.path.join(self.test_dir.name, 'repo.conf')), \
+                patch.object(RepoCmd, 'run_update', update), \
+                patch('src.commands.repo.repo_cmd.PluginIndex') as plugin_index:
+            self.assertEqual(self.repo_cmd.run(), result)
+        return plugin_index.return_value.build
+
+    def test_rebuild_plugin_index_when_cache_changed(self):
+        """测试插件源索引缓存变化后重新生成插件查询索引"""
+        self._run_update(True, True).assert_called_once()
+
+    def test_skip_rebuild_when_cache_unchanged_or_failed(self):
+        """测试缓存未变化（如服务端返回304）或者命令执行失败时不重新生成插件查询索引"""
+        self._run_update(True, False).assert_not_called()
+        self._run_update(False, True).assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
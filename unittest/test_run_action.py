@@ -13,14 +13,32 @@
 
 #run as:PYTHONPATH=/home/xxx/openeuler_repos/oeDeploy/oedp coverage run -m pytest
 
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from src.commands.run.run_action import RunAction
+from src.commands.run.ssh_control import SshControlPool
+from src.constants.const import FACT_CACHE_TTL, SSH_CONTROL_PERSIST
 from src.utils.command.command_executor import CommandExecutor
+from src.utils.fact_cache import FactCache
+from src.utils.run_journal import RunJournal
 import os
 
 class TestRunAction(unittest.TestCase):
     def setUp(self):
+        # 执行记录、ssh socket 与 facts 缓存写入临时目录，执行方法时设置的 ansible 环境变量在用例结束后恢复
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        for patcher in (
+            patch.dict(os.environ),
+            patch.object(RunJournal.__init__, '__defaults__', (os.path.join(self.temp_dir, 'journal'),)),
+            patch.object(SshControlPool.__init__, '__defaults__',
+                         (SSH_CONTROL_PERSIST, os.path.join(self.temp_dir, 'ssh'))),
+            patch.object(FactCache.__init__, '__defaults__', (FACT_CACHE_TTL, os.path.join(self.temp_dir, 'facts'))),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
         self.project_path = "/fake/project"
         self.action_name = "deploy"
         self.valid_task = {
@@ -63,3 +81,89 @@ class TestRunAction(unittest.TestCase):
         self.assertTrue(result)
         self.assertIn('Skipping task', log.output[0])
 
+
+    @patch('src.commands.run.run_action.RunAction._run_playbook')
+    def test_tasks_run_in_order_without_depends_on(self, mock_run):
+        """测试未声明依赖的任务按顺序执行"""
+        mock_run.return_value = True
+        tasks = [{"name": name, "playbook": f"{name}.yml"} for name in ("a", "b", "c")]
+
+        runner = RunAction(self.action_name, tasks, self.project_path, False, jobs=4)
+        result = runner.run()
+
+        self.assertTrue(result)
+        self.assertEqual([call.args[0]["name"] for call in mock_run.call_args_list], ["a", "b", "c"])
+
+    @patch('src.commands.run.run_action.RunAction._run_playbook')
+    def test_dependent_task_runs_after_dependencies(self, mock_run):
+        """测试并发执行时依赖的任务先于当前任务完成"""
+        mock_run.return_value = True
+        tasks = [
+            {"name": "images", "playbook": "images.yml", "depends_on": []},
+            {"name": "packages", "playbook": "packages.yml", "depends_on": []},
+            {"name": "install", "playbook": "install.yml", "depends_on": ["images", "packages"]},
+        ]
+
+        runner = RunAction(self.action_name, tasks, self.project_path, False, jobs=2)
+        result = runner.run()
+
+        self.assertTrue(result)
+        self.assertEqual(mock_run.call_args_list[-1].args[0]["name"], "install")
+
+    @patch('src.commands.run.run_action.RunAction._run_playbook')
+    def test_failed_task_stops_dependents(self, mock_run):
+        """测试任务失败后不再执行依赖它的任务"""
+        mock_run.side_effect = lambda task, project: task["name"] != "images"
+        tasks = [
+            {"name": "images", "playbook": "images.yml", "depends_on": []},
+            {"name": "install", "playbook": "install.yml", "depends_on": "images"},
+        ]
+
+        runner = RunAction(self.action_name, tasks, self.project_path, False, jobs=2)
+
+        self.assertFalse(runner.run())
+        self.assertEqual(mock_run.call_count, 1)
+
+    def test_circular_dependency(self):
+        """测试循环依赖"""
+        tasks = [
+            {"name": "a", "playbook": "a.yml", "depends_on": "b"},
+            {"name": "b", "playbook": "b.yml", "depends_on": "a"},
+        ]
+        runner = RunAction(self.action_name, tasks, self.project_path, False)
+        self.assertFalse(runner.run())
+
+    def test_unknown_dependency(self):
+        """测试依赖不存在的任务"""
+        tasks = [{"name": "a", "playbook": "a.yml", "depends_on": "missing"}]
+        runner = RunAction(self.action_name, tasks, self.project_path, False)
+        self.assertFalse(runner.run())
+
+    @patch('src.commands.run.run_action.RunAction._run_playbook')
+    def test_invalid_dependency_type(self, mock_run):
+        """测试 depends_on 既不是任务名也不是任务名列表"""
+        for depends_on in ({"name": "a"}, 1, ["a", 1]):
+            tasks = [
+                {"name": "a", "playbook": "a.yml"},
+                {"name": "b", "playbook": "b.yml", "depends_on": depends_on},
+            ]
+            runner = RunAction(self.action_name, tasks, self.project_path, False)
+            with self.assertLogs(level='ERROR') as log:
+                self.assertFalse(runner.run())
+            self.assertIn('Invalid depends_on', log.output[0])
+        mock_run.assert_not_called()
+
+    @patch('src.commands.run.run_action.RunJournal.record')
+    @patch('src.commands.run.run_action.RunAction._run_playbook')
+    def test_debug_skipped_task_not_recorded(self, mock_run, mock_record):
+        """测试调试模式跳过的任务不写入执行记录"""
+        mock_run.return_value = True
+        tasks = [
+            {"name": "a", "playbook": "a.yml", "disabled_in_debug": True},
+            {"name": "b", "playbook": "b.yml"},
+        ]
+        runner = RunAction(self.action_name, tasks, self.project_path, True)
+
+        self.assertTrue(runner.run())
+        self.assertEqual([call.args[0]["name"] for call in mock_run.call_args_list], ["b"])
+        self.assertEqual([call.args[0] for call in mock_record.call_args_list], ["1:b"])
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-06-10
+# ======================================================================================================================
+
+import os
+import stat
+import tempfile
+import unittest
+
+from src.utils.run_journal import RunJournal
+
+
+class TestRunJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.project = os.path.join(self.test_dir.name, "project")
+        self.journal_dir = os.path.join(self.test_dir.name, "journal")
+        os.makedirs(os.path.join(self.project, "workspace"))
+        with open(os.path.join(self.project, "config.yaml"), "w") as f:
+            f.write("all: {}\n")
+        self.playbook = os.path.join(self.project, "workspace", "install.yml")
+        with open(self.playbook, "w") as f:
+            f.write("- hosts: all\n")
+        self.task = {"name": "install", "playbook": "install.yml"}
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_succeeded_task_is_persisted(self):
+        """测试执行成功的任务在下次读取时可以跳过"""
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        key = RunJournal.task_key(0, self.task)
+        journal.record(key, journal.task_digest(self.task), True)
+
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        self.assertTrue(journal.is_succeeded(key, journal.task_digest(self.task)))
+
+    def test_changed_playbook_is_not_skipped(self):
+        """测试playbook内容变化后任务需要重新执行"""
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        key = RunJournal.task_key(0, self.task)
+        journal.record(key, journal.task_digest(self.task), True)
+        with open(self.playbook, "a") as f:
+            f.write("  tasks: []\n")
+
+        self.assertFalse(journal.is_succeeded(key, journal.task_digest(self.task)))
+
+    def test_failed_task_is_not_skipped(self):
+        """测试执行失败的任务需要重新执行"""
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        key = RunJournal.task_key(0, self.task)
+        digest = journal.task_digest(self.task)
+        journal.record(key, digest, False)
+
+        self.assertFalse(journal.is_succeeded(key, digest))
+
+    def test_reset(self):
+        """测试清空执行记录"""
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        key = RunJournal.task_key(0, self.task)
+        digest = journal.task_digest(self.task)
+        journal.record(key, digest, True)
+        journal.reset()
+
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        self.assertFalse(journal.is_succeeded(key, digest))
+
+    def _record_succeeded(self):
+        journal = RunJournal(self.project, "install", self.journal_dir)
+        key = RunJournal.task_key(0, self.task)
+        digest = journal.task_digest(self.task)
+        journal.record(key, digest, True)
+        return journal.journal_file, key, digest
+
+    def test_journal_is_private(self):
+        """测试执行记录保存在仅当前用户可以访问的目录中"""
+        journal_file, _, _ = self._record_succeeded()
+
+        user_dir = os.path.join(self.journal_dir, str(os.getuid()))
+        self.assertEqual(os.path.dirname(journal_file), user_dir)
+        self.assertEqual(stat.S_IMODE(os.stat(user_dir).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(journal_file).st_mode), 0o600)
+        self.assertEqual(os.listdir(user_dir), [os.path.basename(journal_file)])
+
+    def test_journal_writable_by_others_is_ignored(self):
+        """测试其他用户可以修改的执行记录不会被用于跳过任务"""
+        journal_file, key, digest = self._record_succeeded()
+        os.chmod(journal_file, 0o666)
+
+        with self.assertLogs(level="WARNING"):
+            journal = RunJournal(self.project, "install", self.journal_dir)
+        self.assertFalse(journal.is_succeeded(key, digest))
+
+    def test_symlinked_journal_is_ignored(self):
+        """测试指向其他文件的执行记录不会被读取，写入时替换符号链接而不是写入其指向的文件"""
+        journal_file, key, digest = self._record_succeeded()
+        target = os.path.join(self.test_dir.name, "target.json")
+        os.replace(journal_file, target)
+        os.symlink(target, journal_file)
+
+        with self.assertLogs(level="WARNING"):
+            journal = RunJournal(self.project, "install", self.journal_dir)
+        self.assertFalse(journal.is_succeeded(key, digest))
+        with open(target, "r") as f:
+            content = f.read()
+        journal.record(key, digest, False)
+        with open(target, "r") as f:
+            self.assertEqual(f.read(), content)
+        self.assertFalse(os.path.islink(journal_file))
+
+    @unittest.skipUnless(os.getuid() == 0, "changing file owner requires root")
+    def test_journal_of_other_user_is_ignored(self):
+        """测试其他用户所属的执行记录不会被读取"""
+        journal_file, key, digest = self._record_succeeded()
+        os.chown(journal_file, 65534, 65534)
+
+        with self.assertLogs(level="WARNING"):
+            journal = RunJournal(self.project, "install", self.journal_dir)
+        self.assertFalse(journal.is_succeeded(key, digest))
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import importlib.util
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.commands.report.report_cmd import ReportCmd
+from src.commands.run.run_profiler import CALLBACK_PLUGIN_DIR, RunProfiler, get_report_file
+
+SAMPLE_REPORT = {
+    'project': '/fake/project',
+    'action': 'deploy',
+    'start': 1750000000,
+    'elapsed': 3725.5,
+    'succeeded': True,
+    'tasks': [
+        {'name': 'prepare', 'playbook': 'prepare.yml', 'elapsed': 65.0, 'succeeded': True},
+        {'name': 'install', 'playbook': 'install.yml', 'elapsed': 3600.0, 'succeeded': True},
+    ],
+    'commands': [],
+    'events': [
+        {'host': 'node1', 'module': 'yum', 'status': 'ok', 'duration': 30.0},
+        {'host': 'node1', 'module': 'copy', 'status': 'ok', 'duration': 2.0},
+        {'host': 'node2', 'module': 'yum', 'status': 'failed', 'duration': 50.0},
+        {'host': 'node3', 'module': 'copy', 'status': 'unreachable', 'duration': 1.0},
+    ]
+}
+
+
+class TestRunProfiler(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.report_dir = self.test_dir.name
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_environment_keeps_user_callbacks(self):
+        """测试启用耗时回调插件时保留用户已配置的回调插件"""
+        profiler = RunProfiler('/fake/project', 'deploy', self.report_dir)
+        with patch.dict(os.environ, {'ANSIBLE_CALLBACK_PLUGINS': '/my/plugins',
+                                     'ANSIBLE_CALLBACKS_ENABLED': 'profile_tasks, oedp_timing'}):
+            environment = profiler.environment()
+
+        self.assertEqual(environment['ANSIBLE_CALLBACK_PLUGINS'], f'{CALLBACK_PLUGIN_DIR}{os.pathsep}/my/plugins')
+        self.assertEqual(environment['ANSIBLE_CALLBACKS_ENABLED'], 'oedp_timing,profile_tasks')
+        self.assertEqual(environment['OEDP_TIMING_FILE'], profiler.events_file)
+
+    def test_save_collects_events(self):
+        """测试保存报告时汇总任务耗时与回调插件记录的事件，忽略不完整的行"""
+        profiler = RunProfiler('/fake/project', 'deploy', self.report_dir)
+        profiler.environment()
+        profiler.record_task({'name': 'install', 'playbook': 'install.yml'}, time.time(), True)
+        with open(profiler.events_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(SAMPLE_REPORT['events'][0]) + '\n')
+            f.write('{"host": "node2", "mod')
+
+        report_file = profiler.save(False)
+
+        self.assertEqual(report_file, get_report_file('/fake/project', 'deploy', self.report_dir))
+        self.assertFalse(os.path.exists(profiler.events_file))
+        with open(report_file, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertFalse(report['succeeded'])
+        self.assertEqual([task['name'] for task in report['tasks']], ['install'])
+        self.assertEqual(report['events'], SAMPLE_REPORT['events'][:1])
+
+    def test_files_are_private(self):
+        """测试报告与事件文件保存在仅当前用户可以访问的目录中，事件文件名称随机"""
+        profiler = RunProfiler('/fake/project', 'deploy', self.report_dir)
+        events_file = profiler.environment()['OEDP_TIMING_FILE']
+        user_dir = os.path.join(self.report_dir, str(os.getuid()))
+
+        self.assertEqual(os.path.dirname(events_file), user_dir)
+        self.assertNotEqual(events_file, RunProfiler('/fake/project', 'deploy', self.report_dir).environment()[
+            'OEDP_TIMING_FILE'])
+        self.assertEqual(stat.S_IMODE(os.stat(user_dir).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(events_file).st_mode), 0o600)
+        report_file = profiler.save(True)
+        self.assertEqual(os.path.dirname(report_file), user_dir)
+        self.assertEqual(stat.S_IMODE(os.stat(report_file).st_mode), 0o600)
+
+    def test_save_replaces_symlink(self):
+        """测试保存报告时替换已存在的符号链接，不写入其指向的文件"""
+        profiler = RunProfiler('/fake/project', 'deploy', self.report_dir)
+        target = os.path.join(self.report_dir, 'target')
+        with open(target, 'w') as f:
+            f.write('target')
+        os.makedirs(os.path.dirname(profiler.report_file), mode=0o700)
+        os.symlink(target, profiler.report_file)
+
+        profiler.save(True)
+
+        self.assertFalse(os.path.islink(profiler.report_file))
+        with open(target, 'r') as f:
+            self.assertEqual(f.read(), 'target')
+
+    @unittest.skipUnless(importlib.util.find_spec('ansible'), 'ansible is not installed')
+    def test_callback_plugin_records_events(self):
+        """测试回调插件按主机与任务记录耗时"""
+        spec = importlib.util.spec_from_file_location('oedp_timing', os.path.join(CALLBACK_PLUGIN_DIR,
+                                                                                  'oedp_timing.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        events_file = os.path.join(self.report_dir, 'events')
+        with patch.dict(os.environ, {'OEDP_TIMING_FILE': events_file}):
+            callback = module.CallbackModule()
+
+        host = MagicMock()
+        host.get_name.return_value = 'node1'
+        task = MagicMock(_uuid='uuid', action='yum')
+        task.get_name.return_value = 'install packages'
+        result = MagicMock(_host=host, _task=task)
+        callback.v2_runner_on_start(host, task)
+        callback.v2_runner_on_failed(result, ignore_errors=True)
+        # 没有开始时间的结果不记录
+        callback.v2_runner_on_ok(result)
+
+        with open(events_file, 'r', encoding='utf-8') as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual(len(events), 1)
+        self.assertEqual((events[0]['host'], events[0]['task'], events[0]['module'], events[0]['status']),
+                         ('node1', 'install packages', 'yum', 'ignored'))
+
+
+class TestReportCmd(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.report_file = os.path.join(self.test_dir.name, 'report.json')
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def _run_report(self, top: int = 10) -> str:
+        with patch('src.commands.report.report_cmd.get_report_file', return_value=self.report_file):
+            with self.assertLogs(level='INFO') as log:
+                self.assertTrue(ReportCmd('deploy', '/fake/project', top).run())
+        return log.output[-1]
+
+    def test_render_report(self):
+        """测试根据耗时报告汇总任务、主机与模块的耗时"""
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump(SAMPLE_REPORT, f)
+
+        output = self._run_report()
+
+        self.assertIn('elapsed: 01:02:05.5', output)
+        self.assertIn('succeeded: true', output)
+        tasks, hosts, modules = (output.split('slowest tasks:')[1].split('slowest hosts:')[0],
+                                 output.split('slowest hosts:')[1].split('slowest modules:')[0],
+                                 output.split('slowest modules:')[1])
+        self.assertLess(tasks.index('install'), tasks.index('prepare'))
+        self.assertIn('01:00:00.0', tasks)
+        # node2 累计50秒，node1 累计32秒
+        self.assertLess(hosts.index('node2'), hosts.index('node1'))
+        self.assertRegex(hosts, r'node2\s*\|\s*00:00:50.0\s*\|\s*1\s*\|\s*1')
+        self.assertRegex(hosts, r'node1\s*\|\s*00:00:32.0\s*\|\s*2\s*\|\s*0')
+        self.assertRegex(modules, r'yum\s*\|\s*00:01:20.0\s*\|\s*2\s*\|\s*00:00:40.0\s*\|\s*00:00:50.0')
+
+    def test_top_limits_rows(self):
+        """测试每张表只展示耗时最长的若干条"""
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump(SAMPLE_REPORT, f)
+
+        output = self._run_report(top=1)
+
+        hosts = output.split('slowest hosts:')[1].split('slowest modules:')[0]
+        self.assertIn('node2', hosts)
+        self.assertNotIn('node1', hosts)
+
+    def test_missing_report(self):
+        """测试报告不存在时提示先执行 oedp run --timing"""
+        with patch('src.commands.report.report_cmd.get_report_file', return_value=self.report_file):
+            with self.assertLogs(level='ERROR') as log:
+                self.assertFalse(ReportCmd('deploy', '/fake/project', 10).run())
+        self.assertIn('--timing', log.output[0])
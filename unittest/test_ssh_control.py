@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Huawei Technologies Co., Ltd.
+# oeDeploy is licensed under the Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#     http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND, EITHER EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR
+# PURPOSE.
+# See the Mulan PSL v2 for more details.
+# Create: 2025-07-08
+# ======================================================================================================================
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.commands.run.run_action import RunAction
+from src.commands.run.ssh_control import SshControlPool
+
+
+class TestSshControlPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_environment(self):
+        """测试生成 ansible ssh 复用连接所需的环境变量"""
+        pool = SshControlPool(120, self.temp_dir)
+        control_path_dir = os.path.join(self.temp_dir, str(os.getuid()))
+
+        self.assertEqual(pool.environment(), {
+            'ANSIBLE_SSH_COMMON_ARGS': '-o ControlMaster=auto -o ControlPersist=120s',
+            'ANSIBLE_SSH_CONTROL_PATH_DIR': control_path_dir
+        })
+
+    def test_control_path_dir_is_private(self):
+        """测试 socket 目录仅当前用户可以访问，已存在的目录也会收紧权限"""
+        control_path_dir = os.path.join(self.temp_dir, str(os.getuid()))
+        os.makedirs(control_path_dir, mode=0o777)
+        os.chmod(control_path_dir, 0o777)
+
+        SshControlPool(60, self.temp_dir).environment()
+
+        self.assertEqual(stat.S_IMODE(os.stat(control_path_dir).st_mode), 0o700)
+
+    @patch('src.commands.run.run_action.SshControlPool.environment')
+    def test_user_environment_takes_precedence(self, mock_environment):
+        """测试用户已经设置的 ssh 参数不会被覆盖"""
+        mock_environment.return_value = {
+            'ANSIBLE_SSH_COMMON_ARGS': '-o ControlMaster=auto -o ControlPersist=60s',
+            'ANSIBLE_SSH_CONTROL_PATH_DIR': self.temp_dir
+        }
+        with patch.dict(os.environ, {'ANSIBLE_SSH_COMMON_ARGS': '-o ForwardAgent=yes'}):
+            os.environ.pop('ANSIBLE_SSH_CONTROL_PATH_DIR', None)
+            os.environ.pop('ANSIBLE_SSH_ARGS', None)
+            runner = RunAction('deploy', [], self.temp_dir, False, ssh_persist=60)
+            runner._init_ansible_environment()
+
+            self.assertEqual(os.environ['ANSIBLE_SSH_COMMON_ARGS'], '-o ForwardAgent=yes')
+            self.assertNotIn('ANSIBLE_SSH_ARGS', os.environ)
+            self.assertEqual(os.environ['ANSIBLE_SSH_CONTROL_PATH_DIR'], self.temp_dir)
+
+    @patch('src.commands.run.run_action.SshControlPool.environment')
+    def test_disabled_when_persist_is_zero(self, mock_environment):
+        """测试保持时间为 0 时不复用连接"""
+        runner = RunAction('deploy', [], self.temp_dir, False, ssh_persist=0)
+        runner._init_ansible_environment()
+
+        mock_environment.assert_not_called()